@@ -0,0 +1,407 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from bots import GreedyBot, RandomBot
+from card_encoding import NUMBER_OF_CARDS, is_valid_play, mask_from_ids, stack_from_mask
+from game_engine import GameEngine, Move, PICK_DECK, NUMBER_OF_CARDS_PER_HAND, score_round
+from legal_plays import legal_plays, playable_cards
+from player_class import Player
+from score_ledger import ScoreLedger
+from vector_env import VectorGameEnv, random_legal_actions
+
+
+BENCHMARK_FORMAT_VERSION = 1
+DEFAULT_OUTPUT_PATH = "benchmark_results.json"
+DEFAULT_SEED = 0
+# Each measure is repeated, the best run is kept (the other runs were slowed down by the rest of the system)
+DEFAULT_REPEAT = 5
+# A result worse than the baseline by more than this fraction is a regression
+DEFAULT_TOLERANCE = 0.2
+ENGINE_GAMES = 50
+NUMBER_OF_PLAYERS = 4
+NUMBER_OF_HANDS = 2000
+SCORE_TABLE_ROUND_COUNTS = (10, 100, 1000, 5000)
+SCORE_TABLE_CALLS = 20
+VECTOR_ENV_GAMES = 1024
+VECTOR_ENV_STEPS = 100
+RENDER_PLAYER_COUNTS = (2, 3, 4, 5, 6)
+RENDER_TURNS = 20
+VIRTUAL_DISPLAY = ":99"
+VIRTUAL_DISPLAY_STARTUP_SECONDS = 1.0
+
+
+def best_time(function, repeat):
+    """
+    Run a function several times and return its fastest run.
+
+    Parameters:
+    - function: Function without arguments to measure.
+    - repeat (int): Number of runs.
+
+    Returns:
+    - float: The number of seconds of the fastest run.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def result(value, unit, higher_is_better):
+    """
+    Returns:
+    - dict: A benchmark result, as written in the JSON file.
+    """
+    return {'value': value, 'unit': unit, 'higher_is_better': higher_is_better}
+
+
+def random_players(rng, number_of_players=NUMBER_OF_PLAYERS):
+    """
+    Create players with random hands of 1 to 5 cards, no card in two hands.
+
+    Parameters:
+    - rng (random.Random): The random generator.
+    - number_of_players (int): Number of players.
+
+    Returns:
+    - list: The Player objects, with hand_mask and hand (pydealer stack) set.
+    """
+    card_ids = rng.sample(range(NUMBER_OF_CARDS), number_of_players * NUMBER_OF_CARDS_PER_HAND)
+    players_list = []
+    for index in range(number_of_players):
+        player = Player(f'Player{index + 1}')
+        hand_size = rng.randint(1, NUMBER_OF_CARDS_PER_HAND)
+        player.hand_mask = mask_from_ids(card_ids[index * NUMBER_OF_CARDS_PER_HAND:][:hand_size])
+        player.hand = stack_from_mask(player.hand_mask)
+        players_list.append(player)
+    return players_list
+
+
+def benchmark_engine(seed, repeat, games=ENGINE_GAMES):
+    """
+    Measure the number of turns per second through the engine, in complete games between greedy and random bots.
+    The time of the bots is included, as in simulate.py.
+
+    Returns:
+    - dict: The results by name.
+    """
+    number_of_turns = 0
+
+    def play_games():
+        nonlocal number_of_turns
+        rng = random.Random(seed)
+        number_of_turns = 0
+        for _ in range(games):
+            players_list = [Player(f'Player{index + 1}') for index in range(NUMBER_OF_PLAYERS)]
+            providers = {player.name: (GreedyBot if index % 2 else RandomBot)(seed=rng.getrandbits(64))
+                         for index, player in enumerate(players_list)}
+            engine = GameEngine(players_list, seed=rng.getrandbits(64))
+            while not engine.is_game_over():
+                engine.start_round()
+                while not engine.round_over:
+                    player = engine.current_player()
+                    engine.apply_move(providers[player.name].choose_move(engine, player))
+                    number_of_turns += 1
+
+    elapsed = best_time(play_games, repeat)
+    return {'engine_turns_per_second': result(number_of_turns / elapsed, 'turns/s', True)}
+
+
+def benchmark_scoring(seed, repeat, number_of_hands=NUMBER_OF_HANDS):
+    """
+    Measure the scoring of the original Player.count_hand and Player.end_round, and of the bitmask version
+    used by the engine (game_engine.score_round).
+
+    Returns:
+    - dict: The results by name.
+    """
+    rng = random.Random(seed)
+    rounds = [random_players(rng) for _ in range(number_of_hands // NUMBER_OF_PLAYERS)]
+    hands = [player for players_list in rounds for player in players_list]
+
+    def count_hands():
+        for player in hands:
+            player.count_hand()
+
+    def finish_rounds():
+        for players_list in rounds:
+            players_list[0].end_round(players_list)
+
+    def score_rounds():
+        for players_list in rounds:
+            score_round(players_list, players_list[0])
+
+    return {
+        'count_hand_per_second': result(len(hands) / best_time(count_hands, repeat), 'hands/s', True),
+        'finish_round_per_second': result(len(rounds) / best_time(finish_rounds, repeat), 'rounds/s', True),
+        'score_round_per_second': result(len(rounds) / best_time(score_rounds, repeat), 'rounds/s', True),
+    }
+
+
+def benchmark_score_table(seed, repeat, round_counts=SCORE_TABLE_ROUND_COUNTS, calls=SCORE_TABLE_CALLS):
+    """
+    Measure main.calculate_players_score (record a round and render the score table) once the game already has
+    many rounds: a call renders one row and the totals line whatever the number of rounds, only the copy of the
+    returned table grows with it.
+
+    Returns:
+    - dict: The results by name, one per number of rounds.
+    """
+    from main import calculate_players_score
+
+    rng = random.Random(seed)
+    players_list = [Player(f'Player{index + 1}') for index in range(NUMBER_OF_PLAYERS)]
+    results = {}
+    for round_count in round_counts:
+        times = []
+        for _ in range(repeat):
+            score_ledger = ScoreLedger()
+            for round_number in range(2, round_count + 2):
+                for player in players_list:
+                    player.score_round = rng.randint(-2, 50)
+                calculate_players_score(score_ledger, players_list, round_number)
+
+            # Only the last calls are measured
+            start = time.perf_counter()
+            for round_number in range(round_count + 2, round_count + 2 + calls):
+                calculate_players_score(score_ledger, players_list, round_number)
+            times.append((time.perf_counter() - start) / calls)
+        results[f'calculate_players_score_{round_count}_rounds'] = result(min(times) * 1e6, 'us/call', False)
+    return results
+
+
+def benchmark_legal_plays(seed, repeat, number_of_hands=NUMBER_OF_HANDS):
+    """
+    Measure the validation of the cards played (card_encoding.is_valid_play on every subset of a hand), the
+    enumeration of the legal plays of a hand and the cards highlighted on the board, without their caches.
+
+    Returns:
+    - dict: The results by name.
+    """
+    rng = random.Random(seed)
+    hand_masks = [mask_from_ids(rng.sample(range(NUMBER_OF_CARDS), NUMBER_OF_CARDS_PER_HAND))
+                  for _ in range(number_of_hands)]
+    subsets = []
+    for hand_mask in hand_masks:
+        subset = hand_mask
+        while subset:
+            subsets.append(subset)
+            subset = (subset - 1) & hand_mask
+
+    def validate_plays():
+        for subset in subsets:
+            is_valid_play(subset)
+
+    def enumerate_plays():
+        for hand_mask in hand_masks:
+            legal_plays.__wrapped__(hand_mask)
+
+    def highlight_cards():
+        playable_cards.cache_clear()
+        for hand_mask in hand_masks:
+            playable_cards(hand_mask, hand_mask & -hand_mask)
+
+    return {
+        'is_valid_play_per_second': result(len(subsets) / best_time(validate_plays, repeat), 'plays/s', True),
+        'legal_plays_per_second': result(len(hand_masks) / best_time(enumerate_plays, repeat), 'hands/s', True),
+        'playable_cards_per_second': result(len(hand_masks) / best_time(highlight_cards, repeat), 'hands/s', True),
+    }
+
+
+def benchmark_vector_env(seed, repeat, games=VECTOR_ENV_GAMES, steps=VECTOR_ENV_STEPS):
+    """
+    Measure the number of moves per second of the vectorized environment (vector_env.py), random legal actions in
+    a batch of games. The observations and the legal action masks of every step are included.
+
+    Returns:
+    - dict: The results by name.
+    """
+    env = VectorGameEnv(games, NUMBER_OF_PLAYERS)
+
+    def play_steps():
+        rng = np.random.default_rng(seed)
+        _, info = env.reset(seed)
+        for _ in range(steps):
+            _, _, _, _, info = env.step(random_legal_actions(info['action_mask'], rng))
+
+    elapsed = best_time(play_steps, repeat)
+    return {'vector_env_moves_per_second': result(games * steps / elapsed, 'moves/s', True)}
+
+
+def start_virtual_display():
+    """
+    Start an Xvfb virtual display if there is no display, so that the board can be rendered on a server.
+
+    Returns:
+    - tuple: The Xvfb process (None if a display already exists) and the reason why the board cannot be rendered
+      (None if it can).
+    """
+    if os.environ.get('DISPLAY'):
+        return None, None
+    if shutil.which('Xvfb') is None:
+        return None, "no display and Xvfb is not installed"
+    process = subprocess.Popen(['Xvfb', VIRTUAL_DISPLAY, '-screen', '0', '1920x1080x24'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    time.sleep(VIRTUAL_DISPLAY_STARTUP_SECONDS)
+    if process.poll() is not None:
+        return None, f"Xvfb exited with code {process.returncode}"
+    os.environ['DISPLAY'] = VIRTUAL_DISPLAY
+    return process, None
+
+
+def benchmark_render(seed, repeat, player_counts=RENDER_PLAYER_COUNTS, turns=RENDER_TURNS):
+    """
+    Measure the board: the first render of a round (window, cards of every player) and the update after a turn,
+    for each number of players. Needs a display, an Xvfb virtual display is started if there is none.
+
+    Returns:
+    - dict: The results by name, empty if the board cannot be rendered.
+    """
+    process, reason = start_virtual_display()
+    if reason is not None:
+        print(f"Board render skipped: {reason}", file=sys.stderr)
+        return {}
+
+    from board_controller import BoardController
+    from card_images import card_image_cache
+    from end_round_oracle import load_end_round_table
+
+    # Load what the board loads once per game, outside of the measures
+    card_image_cache.load()
+    load_end_round_table()
+    results = {}
+    try:
+        for number_of_players in player_counts:
+            full_render_times = []
+            turn_times = []
+            for run in range(repeat):
+                players_list = [Player(f'Player{index + 1}') for index in range(number_of_players)]
+                controller = BoardController(GameEngine(players_list, seed=seed + run))
+
+                start = time.perf_counter()
+                controller._build_window()
+                controller._start_round()
+                controller.root.update()
+                full_render_times.append(time.perf_counter() - start)
+
+                start = time.perf_counter()
+                for _ in range(turns):
+                    # Play the first legal play of the current player, the round never ends
+                    hand_mask = controller.engine.current_player().hand_mask
+                    controller.selected_cards = [(legal_plays(hand_mask)[0]).bit_length() - 1]
+                    controller._apply_move(Move(controller.selected_cards, pick=PICK_DECK))
+                    controller._start_turn()
+                    controller.root.update()
+                turn_times.append((time.perf_counter() - start) / turns)
+                controller.root.destroy()
+
+            results[f'board_full_render_{number_of_players}_players'] = result(min(full_render_times) * 1e3, 'ms',
+                                                                               False)
+            results[f'board_turn_render_{number_of_players}_players'] = result(min(turn_times) * 1e3, 'ms', False)
+    finally:
+        if process is not None:
+            process.terminate()
+    return results
+
+
+BENCHMARKS = {
+    'engine': benchmark_engine,
+    'scoring': benchmark_scoring,
+    'score_table': benchmark_score_table,
+    'legal_plays': benchmark_legal_plays,
+    'vector_env': benchmark_vector_env,
+    'render': benchmark_render,
+}
+
+
+def run_benchmarks(names, seed=DEFAULT_SEED, repeat=DEFAULT_REPEAT):
+    """
+    Run benchmarks.
+
+    Parameters:
+    - names (list): Names of the benchmarks to run (keys of BENCHMARKS).
+    - seed (int): Seed of the hands and games measured, the same seed measures the same work.
+    - repeat (int): Number of runs of each measure.
+
+    Returns:
+    - dict: The report written in the JSON file: the environment and the results by name.
+    """
+    results = {}
+    for name in names:
+        results.update(BENCHMARKS[name](seed, repeat))
+    return {
+        'version': BENCHMARK_FORMAT_VERSION,
+        'seed': seed,
+        'repeat': repeat,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'results': results,
+    }
+
+
+def compare_reports(report, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compare benchmark results with the results of a previous run.
+
+    Parameters:
+    - report (dict): The new report.
+    - baseline (dict): The previous report.
+    - tolerance (float): Fraction of change allowed before a result is a regression.
+
+    Returns:
+    - list: A description of each regression.
+    """
+    regressions = []
+    for name, new_result in report['results'].items():
+        old_result = baseline['results'].get(name)
+        if old_result is None or not old_result['value']:
+            continue
+        change = new_result['value'] / old_result['value'] - 1
+        if (change < -tolerance) if new_result['higher_is_better'] else (change > tolerance):
+            regressions.append(f"{name}: {new_result['value']:.4g} {new_result['unit']} instead of "
+                               f"{old_result['value']:.4g} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the performance of Nine-Game and write it as JSON.")
+    parser.add_argument('--benchmarks', nargs='+', default=list(BENCHMARKS), choices=list(BENCHMARKS),
+                        help="benchmarks to run")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="seed of the measured hands and games")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="runs of each measure, the best is kept")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT_PATH, help="JSON file of the results")
+    parser.add_argument('--compare', default=None, help="JSON file of a previous run, exit with 1 on regressions")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="fraction of slowdown allowed when comparing")
+    arguments = parser.parse_args()
+
+    report = run_benchmarks(arguments.benchmarks, arguments.seed, arguments.repeat)
+    for name, each_result in report['results'].items():
+        print(f"{name}: {each_result['value']:.4g} {each_result['unit']}")
+    with open(arguments.output, 'w') as output_file:
+        json.dump(report, output_file, indent=2)
+
+    if arguments.compare is not None:
+        with open(arguments.compare) as baseline_file:
+            regressions = compare_reports(report, json.load(baseline_file), arguments.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
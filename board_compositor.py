@@ -0,0 +1,283 @@
+import argparse
+import io
+import os
+import time
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageFont
+
+from board_layout import (CARD_BORDER, CARD_BORDER_COLOR, CARD_SPACING, PICKED_CARD_COLOR, PLAYABLE_CARD_COLOR,
+                          deck_and_pile_positions, hand_card_positions, seat_positions)
+from card_encoding import card_name, mask_from_ids, sorted_hand_ids
+from card_images import BACK_NAME, GAME_BOARD_NAME, card_image_cache
+
+
+# Number of static layers kept, each one is a full board image (about 2.7 MB)
+STATIC_LAYER_CACHE_SIZE = 64
+TEXT_COLOR = "black"
+CURRENT_PLAYER_COLOR = "red"
+DEFAULT_THUMBNAIL_WIDTH = 300
+DEFAULT_FRAME_FORMAT = 'JPEG'
+DEFAULT_FRAME_QUALITY = 80
+
+
+class BoardCompositor:
+    def __init__(self, image_cache=card_image_cache, static_layer_cache_size=STATIC_LAYER_CACHE_SIZE):
+        """
+        Initialize a BoardCompositor object, which draws the board in a PIL image without Tkinter nor display, with
+        the images and the layout of the Tkinter board.
+
+        A frame is made of a static layer, the game board with the deck and the face-down hands, and of the dynamic
+        layers drawn on a copy of it: the hand shown face up, the pile and the texts. The static layers are cached
+        by the size and the position of the face-down hands, which only change when a player plays, and each hand
+        size has its own pre-blended stack of face-down cards.
+
+        Parameters:
+        - image_cache (CardImageCache): The decoded card images.
+        - static_layer_cache_size (int): Maximum number of static layers kept.
+        """
+        self.image_cache = image_cache
+        self.background = image_cache.image(GAME_BOARD_NAME).convert('RGB')
+        self.width, self.height = self.background.size
+        self.deck_position, self.pile_position, self.deck_text_position = deck_and_pile_positions(self.width,
+                                                                                                   self.height)
+        self.font = ImageFont.load_default()
+        self.static_layer_cache_size = static_layer_cache_size
+        self.static_layers = OrderedDict()
+        self.card_sprites = {}
+        self.face_down_stacks = {}
+        self.text_masks = {}
+
+    def card_sprite(self, name, border_color=None):
+        """
+        Return the image of a card with its border, blended once.
+
+        Parameters:
+        - name (str): Name of the card image ('10 of Hearts', 'Joker1', 'Back'...).
+        - border_color (str): Color of the border, CARD_BORDER_COLOR if None.
+
+        Returns:
+        - PIL.Image.Image: RGBA image, CARD_BORDER larger than the card on each side.
+        """
+        key = (name, border_color)
+        if key not in self.card_sprites:
+            card_image = self.image_cache.image(name).convert('RGBA')
+            sprite = Image.new('RGBA', (card_image.width + 2 * CARD_BORDER, card_image.height + 2 * CARD_BORDER),
+                               border_color or CARD_BORDER_COLOR)
+            sprite.alpha_composite(card_image, (CARD_BORDER, CARD_BORDER))
+            self.card_sprites[key] = sprite
+        return self.card_sprites[key]
+
+    def face_down_stack(self, number_of_cards):
+        """
+        Return the image of a face-down hand, blended once for each hand size.
+
+        Parameters:
+        - number_of_cards (int): Number of cards of the hand.
+
+        Returns:
+        - PIL.Image.Image: RGBA image of the overlapping backs of the cards, with their borders.
+        """
+        if number_of_cards not in self.face_down_stacks:
+            back = self.card_sprite(BACK_NAME)
+            stack = Image.new('RGBA', (CARD_SPACING * (number_of_cards - 1) + back.width, back.height), (0, 0, 0, 0))
+            for index in range(number_of_cards):
+                stack.alpha_composite(back, (CARD_SPACING * index, 0))
+            self.face_down_stacks[number_of_cards] = stack
+        return self.face_down_stacks[number_of_cards]
+
+    def draw_text(self, frame, position, text, color=TEXT_COLOR):
+        """
+        Draw a text on a frame, its top left corner at the position. Each text is rendered once in a mask.
+
+        Parameters:
+        - frame (PIL.Image.Image): The frame.
+        - position (tuple): Position (x, y) of the text.
+        - text (str): The text, a player name or a number of cards.
+        - color (str): Color of the text.
+        """
+        mask = self.text_masks.get(text)
+        if mask is None:
+            _, _, width, height = self.font.getbbox(text)
+            mask = Image.new('L', (width, height))
+            ImageDraw.Draw(mask).text((0, 0), text, fill=255, font=self.font)
+            self.text_masks[text] = mask
+        x, y = position
+        frame.paste(color, (x, y, x + mask.width, y + mask.height), mask)
+
+    def seat_positions(self, engine):
+        """
+        Return the position of each player still in game, in the order of the seats (players_list).
+
+        Returns:
+        - dict: Position (x, y) of the seat by player name.
+        """
+        return seat_positions(engine.players_list, self.width, self.height)
+
+    def static_layer(self, face_down_hands):
+        """
+        Return the game board with the deck and the face-down hands.
+
+        Parameters:
+        - face_down_hands (tuple): (seat position, number of cards) of each face-down hand.
+
+        Returns:
+        - PIL.Image.Image: The RGB layer, shared: copy it before drawing on it.
+        """
+        layer = self.static_layers.get(face_down_hands)
+        if layer is not None:
+            self.static_layers.move_to_end(face_down_hands)
+            return layer
+
+        layer = self.background.copy()
+        back = self.card_sprite(BACK_NAME)
+        layer.paste(back, (self.deck_position[0] - CARD_BORDER, self.deck_position[1] - CARD_BORDER), back)
+        for position, number_of_cards in face_down_hands:
+            if number_of_cards:
+                card_positions, _ = hand_card_positions(position, number_of_cards)
+                x, y = card_positions[0]
+                stack = self.face_down_stack(number_of_cards)
+                layer.paste(stack, (x - CARD_BORDER, y - CARD_BORDER), stack)
+
+        self.static_layers[face_down_hands] = layer
+        if len(self.static_layers) > self.static_layer_cache_size:
+            self.static_layers.popitem(last=False)
+        return layer
+
+    def render(self, engine, revealed_player=None, selected_cards=(), picked_card=None, playable_mask=0):
+        """
+        Draw the board of a game, as the Tkinter board shows it.
+
+        Parameters:
+        - engine (GameEngine): The game.
+        - revealed_player (Player): The player whose hand is face up, None to show all the hands face down (for the
+          spectators).
+        - selected_cards: Ids of the cards of the revealed hand selected to be played.
+        - picked_card (int): Id of the card the revealed player has just picked, with a black border.
+        - playable_mask (int): Bitmask of the cards of the revealed hand with a gold border.
+
+        Returns:
+        - PIL.Image.Image: A new RGB image of the board.
+        """
+        seat_positions = self.seat_positions(engine)
+        players = [player for player in engine.players_list if player.name in seat_positions]
+        face_down_hands = tuple((seat_positions[player.name], player.hand_mask.bit_count())
+                                for player in players if player is not revealed_player)
+        frame = self.static_layer(face_down_hands).copy()
+
+        if revealed_player is not None and revealed_player.name in seat_positions:
+            card_ids = sorted_hand_ids(revealed_player.hand_mask)
+            selected_mask = mask_from_ids(selected_cards)
+            selected_indexes = [index for index, card_id in enumerate(card_ids) if selected_mask >> card_id & 1]
+            card_positions, _ = hand_card_positions(seat_positions[revealed_player.name], len(card_ids),
+                                                    selected_indexes)
+            for card_id, (x, y) in zip(card_ids, card_positions):
+                if card_id == picked_card:
+                    border_color = PICKED_CARD_COLOR
+                elif playable_mask >> card_id & 1:
+                    border_color = PLAYABLE_CARD_COLOR
+                else:
+                    border_color = None
+                sprite = self.card_sprite(card_name(card_id), border_color)
+                frame.paste(sprite, (x - CARD_BORDER, y - CARD_BORDER), sprite)
+
+        if engine.pile:
+            sprite = self.card_sprite(card_name(engine.pile[-1]))
+            frame.paste(sprite, (self.pile_position[0] - CARD_BORDER, self.pile_position[1] - CARD_BORDER), sprite)
+
+        self.draw_text(frame, self.deck_text_position, f"{len(engine.deck or ())} cards")
+        current_player = None if engine.round_over else engine.current_player()
+        for player in players:
+            _, name_position = hand_card_positions(seat_positions[player.name], player.hand_mask.bit_count())
+            self.draw_text(frame, name_position, player.name,
+                           CURRENT_PLAYER_COLOR if player is current_player else TEXT_COLOR)
+        return frame
+
+
+def encode_frame(image, image_format=DEFAULT_FRAME_FORMAT, quality=DEFAULT_FRAME_QUALITY):
+    """
+    Encode a frame to send it to the spectators or write it to a file.
+
+    Parameters:
+    - image (PIL.Image.Image): The frame.
+    - image_format (str): PIL format, 'JPEG', 'PNG' or 'WEBP'.
+    - quality (int): Quality of the lossy formats.
+
+    Returns:
+    - bytes: The encoded image.
+    """
+    buffer = io.BytesIO()
+    image.save(buffer, format=image_format, quality=quality)
+    return buffer.getvalue()
+
+
+def thumbnail(image, width=DEFAULT_THUMBNAIL_WIDTH):
+    """
+    Returns:
+    - PIL.Image.Image: A smaller copy of a frame, with the same proportions.
+    """
+    # Integer reduction first (a box filter, much faster than resize), then resize for the remaining factor
+    factor = image.width // width
+    if factor > 1:
+        image = image.reduce(factor)
+    if image.width != width:
+        image = image.resize((width, round(image.height * width / image.width)), Image.Resampling.BILINEAR)
+    return image
+
+
+def iter_replay_frames(replay, compositor, every=1):
+    """
+    Play a recorded game again and draw the board after each move, as a spectator sees it (hands face down).
+
+    Parameters:
+    - replay (Replay): The recorded game.
+    - compositor (BoardCompositor): The compositor drawing the frames.
+    - every (int): Draw the board after one move out of this number.
+
+    Yields:
+    - tuple: The index of the move and the frame after it.
+    """
+    from game_engine import GameEngine
+    from player_class import Player
+    from replay import move_from_record
+
+    players_list = [Player(name) for name in replay.player_names]
+    engine = GameEngine(players_list, replay.elimination_score_threshold, replay.number_to_end_round,
+                        seed=replay.seed)
+    for move_index, record in enumerate(replay.moves):
+        if engine.round_over:
+            engine.start_round()
+        engine.apply_move(move_from_record(record))
+        if move_index % every == 0:
+            yield move_index, compositor.render(engine)
+
+
+def main():
+    from replay import load_replay
+
+    parser = argparse.ArgumentParser(description="Draw the board of a recorded game after each move, without display.")
+    parser.add_argument('replay', help="replay file, see main.py --replay-log and simulate.py --replay-directory")
+    parser.add_argument('--output-directory', default=None, help="directory of the thumbnails, not written if None")
+    parser.add_argument('--width', type=int, default=DEFAULT_THUMBNAIL_WIDTH, help="width of the thumbnails")
+    parser.add_argument('--every', type=int, default=1, help="draw one move out of this number")
+    parser.add_argument('--format', default=DEFAULT_FRAME_FORMAT, help="image format of the thumbnails")
+    arguments = parser.parse_args()
+    if arguments.output_directory is not None:
+        os.makedirs(arguments.output_directory, exist_ok=True)
+
+    replay = load_replay(arguments.replay)
+    compositor = BoardCompositor()
+    start = time.perf_counter()
+    number_of_frames = 0
+    for move_index, frame in iter_replay_frames(replay, compositor, arguments.every):
+        number_of_frames += 1
+        if arguments.output_directory is not None:
+            path = os.path.join(arguments.output_directory, f"{move_index:05d}.{arguments.format.lower()}")
+            with open(path, 'wb') as frame_file:
+                frame_file.write(encode_frame(thumbnail(frame, arguments.width), arguments.format))
+    elapsed = time.perf_counter() - start
+    print(f"{number_of_frames} frames in {elapsed:.2f}s ({number_of_frames / elapsed:.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,440 @@
+import tkinter as tk
+from tkinter import ttk
+
+from card_encoding import card_name, is_valid_play, is_valid_selection, mask_from_ids, sorted_hand_ids
+from legal_plays import playable_cards
+from game_engine import Move, IllegalMoveError, PICK_DECK, PICK_PILE, distinct_providers, provider_for
+from card_images import card_image_cache, get_card_image, BACK_NAME, GAME_BOARD_NAME
+from change_tracker import versions_of
+from score_ledger import ScoreLedger
+from game_state import save_game_state, snapshot_game
+from end_round_oracle import win_probability
+from notifications import toast_layer
+from canvas_board import CanvasBoard
+from board_layout import (PICKED_CARD_COLOR, PLAYABLE_CARD_COLOR, deck_and_pile_positions, hand_card_positions,
+                          seat_positions)
+from interface_function import (NO_CARD_PLAYED_MESSAGE, WRONG_CARDS_MESSAGE, click_quit_button, click_score_button,
+                                display_end_of_round_frame, display_end_of_game_frame,
+                                table_players_score_end_of_round_and_game)
+
+
+BOT_MOVE_DELAY_MS = 600
+DECK_GROUP = 'deck'
+PILE_GROUP = 'pile'
+
+
+class BoardController:
+    def __init__(self, engine, providers=None, save_path=None):
+        """
+        Initialize a BoardController object: one Tkinter window kept open for the whole game.
+
+        The controller drives the game engine from the Tkinter callbacks: a click on the deck or the pile applies
+        the move and only the widgets whose content changed are updated, no window is created per turn. The cards
+        are drawn on a single canvas (see canvas_board). The versions of the players (see change_tracker) tell
+        which seats and which score table have to be drawn again.
+
+        Parameters:
+        - engine (GameEngine): The game to display.
+        - providers (dict): DecisionProvider by player name for the players who are not at the computer (bots).
+        - save_path (str): File where the game is saved after every move (see game_state), not saved if None.
+        """
+        self.engine = engine
+        self.providers = providers or {}
+        self.save_path = save_path
+        self.score_ledger = ScoreLedger()
+        self.message_for_score_button = ''
+
+        self.root = None
+        self.selected_cards = []
+        self.revealed_player = None
+        self.picked_card = None
+        self.waiting_for_continue = False
+        self.continue_pressed = False
+
+        # Position of each seat, and what it displays to update only the ones which changed
+        self.seat_positions = {}
+        self.rendered_seats = {}
+        self.rendered_panel = {}
+
+    def run(self):
+        """
+        Create the board window, start the first round and run the Tkinter main loop until the window is closed.
+        A restored game continues where it was saved.
+        """
+        self._build_window()
+        if self.engine.round_number == 0:
+            self._start_round()
+        elif self.engine.is_game_over():
+            self._finish_game()
+        elif self.engine.round_over:
+            self._start_round()
+        else:
+            self.message_for_score_button = self.score_ledger.message()
+            self._layout_seats()
+            self._start_turn()
+        self.root.mainloop()
+
+    def save_game(self):
+        """
+        Save the game and its score history, if a save file was given.
+        """
+        if self.save_path is not None:
+            save_game_state(snapshot_game(self.engine, self.score_ledger), self.save_path)
+
+    def card_image(self, card_name):
+        """
+        Return the shared PhotoImage of a card.
+
+        Parameters:
+        - card_name: Name of the card image ('10 of Hearts', 'Joker1', 'Back'...).
+
+        Returns:
+        - ImageTk.PhotoImage: The image of the card.
+        """
+        return get_card_image(card_name, self.root)
+
+    def _build_window(self):
+        """
+        Create the root window, the left panel, the game board image, the pile and the deck.
+        """
+        self.root = tk.Tk()
+        self.root.title("Game Board")
+
+        style = ttk.Style()
+        style.configure("TButton", padding=10, relief="flat", background="white", foreground="black",
+                        font=('Arial', 12))
+
+        self.left_panel = tk.Frame(self.root, width=200, height=500, bg="lightgray")
+        self.left_panel.pack(side="left", fill="y")
+
+        self.round_label = tk.Label(self.left_panel, font=("Arial", 20))
+        self.round_label.pack(pady=10)
+        self.actions_frame = tk.Frame(self.left_panel, bg="lightgray")
+        self.actions_frame.pack()
+        self.button_finish = ttk.Button(self.actions_frame, text="END ROUND", style='TButton',
+                                        command=self._click_to_finish)
+        self.button_pass = ttk.Button(self.actions_frame, text="PASS", style='TButton', command=self._click_to_pass)
+        self.button_score = ttk.Button(self.left_panel, text="SCORE", style='TButton',
+                                       command=lambda: click_score_button(self.root, self.message_for_score_button))
+        self.button_quit = ttk.Button(self.left_panel, text="QUIT GAME", style='TButton',
+                                      command=lambda: click_quit_button(self.root))
+        self.button_quit.pack(side='bottom', pady=10)
+        self.score_label = ttk.Label(self.left_panel, justify='left', font=('Arial', 13))
+        self.score_label.pack(side='bottom', pady=100)
+
+        # The game board image, with the cards drawn on it
+        self.image_width, self.image_height = card_image_cache.image(GAME_BOARD_NAME).size
+        self.board = CanvasBoard(self.root, self.card_image(GAME_BOARD_NAME), self.card_image, self._click_on_board)
+        self.board.canvas.pack()
+
+        self.deck_position, self.pile_position, self.deck_text_position = deck_and_pile_positions(self.image_width,
+                                                                                                   self.image_height)
+        self.board.draw_cards(DECK_GROUP, [(BACK_NAME, *self.deck_position, None, PICK_DECK)])
+
+        # The error messages are shown over the board and hide themselves
+        self.toast = toast_layer(self.root)
+
+        # Like the cards, a click continues when the mouse button is released, and only if it was pressed while
+        # waiting: the release of the click which picked the card does not continue
+        self.root.bind("<ButtonPress-1>", self._press_to_continue, add='+')
+        self.root.bind("<ButtonRelease-1>", self._click_to_continue, add='+')
+
+    def _layout_seats(self):
+        """
+        Give a position on the board to each player still in game, for the whole round. The compositor places the
+        players the same way (see board_layout.seat_positions).
+        """
+        for name in self.seat_positions:
+            self._hide_seat(name)
+        self.seat_positions = seat_positions(self.engine.players_list, self.image_width, self.image_height)
+        self.rendered_seats = {}
+
+    def _hide_seat(self, name):
+        """
+        Hide the cards and the name of a player.
+        """
+        self.board.hide_group(name)
+        self.board.hide_text(name)
+
+    def _start_round(self):
+        """
+        Deal a new round, create the score history message and start the first turn.
+        """
+        self.engine.start_round()
+        for provider in distinct_providers(self.providers):
+            provider.round_started(self.engine)
+
+        if self.engine.round_number > 1:
+            self.score_ledger.record_round(self.engine.players_list, self.engine.round_number - 1)
+            self.message_for_score_button = self.score_ledger.message()
+        self.save_game()
+        self._layout_seats()
+        self._start_turn()
+
+    def _start_turn(self):
+        """
+        Show the hand of the player whose turn it is, or let the bot play.
+        """
+        player = self.engine.current_player()
+        self.selected_cards = []
+        self.picked_card = None
+        self.waiting_for_continue = False
+        provider = provider_for(self.providers, player)
+        self.revealed_player = None if provider is not None else player
+        self.refresh()
+
+        if provider is not None:
+            self.root.after(BOT_MOVE_DELAY_MS, lambda: self._apply_move(provider.choose_move(self.engine, player)))
+
+    def _apply_move(self, move):
+        """
+        Apply a move of the current player to the engine and update the board.
+
+        Parameters:
+        - move (Move): The move of the current player.
+        """
+        player = self.engine.current_player()
+        try:
+            self.engine.apply_move(move)
+        except IllegalMoveError as error:
+            self.toast.show(str(error))
+            return
+        for provider in distinct_providers(self.providers):
+            provider.move_applied(self.engine, player, move)
+        self.save_game()
+
+        if self.engine.round_over:
+            self._finish_round(player)
+        elif move.pick is not None and provider_for(self.providers, player) is None:
+            # Show the card the player has picked, a click anywhere switches to the next player
+            self.selected_cards = []
+            self.picked_card = self.engine.last_picked_card
+            self.waiting_for_continue = True
+            self.refresh()
+        else:
+            self._start_turn()
+
+    def _finish_round(self, player):
+        """
+        Display the end of round scores in a window on top of the board, then start the next round.
+
+        Parameters:
+        - player (Player): The player who ended the round.
+        """
+        for provider in distinct_providers(self.providers):
+            provider.round_finished(self.engine, player)
+        self.engine.sync_player_hands()
+        self.revealed_player = None
+        self.refresh()
+
+        window = tk.Toplevel(self.root)
+        window.title(f"END OF ROUND {self.engine.round_number}")
+        frame = ttk.Frame(window)
+        frame.pack()
+        display_end_of_round_frame(frame, self.engine.players_from(player), self.engine.round_number,
+                                   self.engine.eliminated_players)
+
+        def continue_game():
+            window.destroy()
+            if self.engine.is_game_over():
+                self._finish_game()
+            else:
+                self._start_round()
+
+        ttk.Button(frame, text="CONTINUE", style='TButton', command=continue_game).pack(pady=10)
+        window.protocol("WM_DELETE_WINDOW", continue_game)
+        window.transient(self.root)
+
+    def _finish_game(self):
+        """
+        Display the final score table on top of the board.
+        """
+        for provider in distinct_providers(self.providers):
+            provider.game_finished(self.engine)
+        self.refresh()
+
+        window = tk.Toplevel(self.root)
+        window.title("END OF GAME: Player Scores")
+        frame = ttk.Frame(window)
+        frame.pack()
+        display_end_of_game_frame(frame, self.engine.players_list)
+        ttk.Button(frame, text="QUIT GAME", style='TButton', command=self.root.destroy).pack(pady=10)
+        window.protocol("WM_DELETE_WINDOW", self.root.destroy)
+        window.transient(self.root)
+
+    def refresh(self):
+        """
+        Update the widgets of the board whose content has changed since the last refresh.
+        """
+        engine = self.engine
+        current_player = engine.current_player()
+        is_human_turn = (not engine.round_over and not self.waiting_for_continue
+                         and provider_for(self.providers, current_player) is None)
+
+        self._update_panel('round', f"ROUND {engine.round_number}",
+                           lambda text: self.round_label.configure(text=text))
+        self._update_panel('deck', f"{len(engine.deck)} cards",
+                           lambda text: self.board.draw_text(DECK_GROUP, text, *self.deck_text_position))
+        self._update_panel('pile', card_name(engine.pile[-1]),
+                           lambda name: self.board.draw_cards(PILE_GROUP, [(name, *self.pile_position, None,
+                                                                            PICK_PILE)]))
+
+        self._update_panel('scores', versions_of(engine.players_list, 'score'),
+                           lambda versions: self.score_label.configure(
+                               text=table_players_score_end_of_round_and_game(engine.players_list)))
+
+        can_finish = is_human_turn and not self.selected_cards and engine.can_end_round(current_player)
+        can_pass = is_human_turn and not self.selected_cards and engine.can_pass(current_player)
+        self._update_panel('finish', can_finish, lambda visible: self._show_button(self.button_finish, visible))
+        if can_finish:
+            # Hint: probability that no opponent has a lower or equal hand
+            self._update_panel('finish_hint', round(100 * win_probability(engine, current_player)),
+                               lambda percent: self.button_finish.configure(text=f"END ROUND ({percent}% win)"))
+        self._update_panel('pass', can_pass, lambda visible: self._show_button(self.button_pass, visible))
+        self._update_panel('score_button', bool(self.message_for_score_button),
+                           lambda visible: self._show_button(self.button_score, visible))
+
+        if not is_human_turn:
+            self.toast.hide()
+
+        for player in engine.players_list:
+            if player.name in self.seat_positions:
+                self._refresh_seat(player, player is current_player and not engine.round_over)
+        self.toast.lift()
+
+    def _update_panel(self, key, value, update):
+        """
+        Call update(value) only if the value displayed by the widget has changed.
+        """
+        if self.rendered_panel.get(key, object()) != value:
+            self.rendered_panel[key] = value
+            update(value)
+
+    @staticmethod
+    def _show_button(button, visible):
+        """
+        Show or hide an action button of the left panel.
+        """
+        if visible:
+            button.pack(pady=10)
+        else:
+            button.pack_forget()
+
+    def _refresh_seat(self, player, is_current):
+        """
+        Update the cards and the name of a player, if they have changed.
+
+        Parameters:
+        - player (Player): The player to display.
+        - is_current (bool): True if it is the turn of this player.
+        """
+        if player.is_eliminate:
+            if self.rendered_seats.get(player.name) is not None:
+                self._hide_seat(player.name)
+                self.rendered_seats[player.name] = None
+            return
+
+        face_up = player is self.revealed_player
+        selected_mask = mask_from_ids(self.selected_cards) if face_up else 0
+        # The hand is only drawn again if it has changed (its version) or the way it is shown has changed
+        state = (player.version_of('hand_mask', 'is_eliminate'), face_up, selected_mask,
+                 self.picked_card if face_up else None, is_current)
+        if self.rendered_seats.get(player.name) == state:
+            return
+        self.rendered_seats[player.name] = state
+
+        card_ids = sorted_hand_ids(player.hand_mask)
+        # Cards which can be added to the selection are highlighted, while the player is choosing its cards
+        playable_mask = playable_cards(player.hand_mask, selected_mask) if face_up and is_current else 0
+
+        selected_indexes = [index for index, card_id in enumerate(card_ids) if selected_mask >> card_id & 1]
+        card_positions, name_position = hand_card_positions(self.seat_positions[player.name], len(card_ids),
+                                                            selected_indexes)
+        cards = []
+        for card_id, (x, y) in zip(card_ids, card_positions):
+            if face_up:
+                if card_id == self.picked_card:
+                    border_color = PICKED_CARD_COLOR
+                elif playable_mask >> card_id & 1:
+                    border_color = PLAYABLE_CARD_COLOR
+                else:
+                    border_color = None
+                image_name, target = card_name(card_id), card_id
+            else:
+                border_color, image_name, target = None, BACK_NAME, None
+            cards.append((image_name, x, y, border_color, target))
+        self.board.draw_cards(player.name, cards)
+        self.board.draw_text(player.name, player.name, *name_position, "red" if is_current else "black")
+
+    def _click_on_board(self, target):
+        """
+        Handles a click on a card of the board: the id of a card of the hand shown, or the deck or the pile.
+
+        Parameters:
+        - target: The target of the card clicked, a card id, PICK_DECK or PICK_PILE.
+        """
+        if target in (PICK_DECK, PICK_PILE):
+            self._click_to_pick(target)
+        else:
+            self._click_to_play_card(target)
+
+    def _click_to_play_card(self, card_id):
+        """
+        Handles the logic when a player clicks on a card to select or unselect it.
+
+        Parameters:
+        - card_id: Id of the card clicked.
+        """
+        if self.waiting_for_continue or self.revealed_player is not self.engine.current_player():
+            return
+
+        if card_id in self.selected_cards:
+            self.selected_cards.remove(card_id)
+            self.toast.hide()
+        elif is_valid_selection(mask_from_ids(self.selected_cards + [card_id])):
+            self.selected_cards.append(card_id)
+            self.toast.hide()
+        else:
+            self.toast.show(WRONG_CARDS_MESSAGE)
+        self.refresh()
+
+    def _click_to_pick(self, pick):
+        """
+        Handles the logic when a player clicks on the deck or the pile: the move is played.
+
+        Parameters:
+        - pick: PICK_DECK or PICK_PILE.
+        """
+        if self.waiting_for_continue or self.revealed_player is not self.engine.current_player():
+            return
+
+        if not self.selected_cards:
+            self.toast.show(NO_CARD_PLAYED_MESSAGE)
+        elif not is_valid_play(mask_from_ids(self.selected_cards)):
+            self.toast.show(WRONG_CARDS_MESSAGE)
+        else:
+            self._apply_move(Move(self.selected_cards, pick=pick))
+
+    def _click_to_finish(self):
+        """
+        Handles the logic when a player clicks to end the round.
+        """
+        self._apply_move(Move(end_round=True))
+
+    def _click_to_pass(self):
+        """
+        Handles the logic when a player clicks to pass their turn.
+        """
+        self._apply_move(Move(is_pass=True))
+
+    def _press_to_continue(self, event):
+        self.continue_pressed = self.waiting_for_continue
+
+    def _click_to_continue(self, event):
+        """
+        Switch to the next player after the picked card has been shown.
+        """
+        if self.waiting_for_continue and self.continue_pressed:
+            self.waiting_for_continue = False
+            self.continue_pressed = False
+            self.root.after_idle(self._start_turn)
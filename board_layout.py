@@ -0,0 +1,116 @@
+# Layout of the board, shared by the Tkinter board and the offscreen compositor (see board_compositor)
+CARD_SPACING = 40
+SELECTED_CARD_OFFSET = 20
+# Position of the cards of a hand, and of the name of the player, from the position of the seat
+HAND_Y_OFFSET = -100
+NAME_X_OFFSET = 20
+NAME_Y_OFFSET = 40
+# Position of the deck and the pile from the center of the board, and of the number of cards of the deck
+DECK_OFFSET = (-40, -100)
+PILE_OFFSET = (80, -100)
+DECK_TEXT_Y_OFFSET = 130
+# Width of the colored border around a card, like the background of the card buttons of the original board
+CARD_BORDER = 3
+CARD_BORDER_COLOR = "white"
+PLAYABLE_CARD_COLOR = "gold"
+PICKED_CARD_COLOR = "black"
+
+
+def calculate_card_positions(num_players, img_width, img_height):
+    """
+    Calculate the initial positions for players' cards based on the number of players.
+
+    Parameters:
+    - num_players: Number of players in the game.
+    - img_width: Width of the board game image.
+    - img_height: Height of the board game image.
+
+    Returns:
+    A list of tuples representing the initial positions for players' cards.
+    """
+    decalage = 40  # Adjustment for spacing between positions
+
+    if num_players == 2:
+        return [(img_width // 2, img_height // 4), (img_width // 2, 3 * img_height // 4)]
+    elif num_players == 3:
+        return [(img_width // 2, img_height // 4), (img_width // 4, (img_height // 2) + 180),
+                (3 * img_width // 4, (img_height // 2) + 180)]
+    elif num_players == 4:
+        return [(img_width // 4, img_height // 4), (3 * img_width // 4, img_height // 4),
+                (img_width // 4, 3 * img_height // 4), (3 * img_width // 4, 3 * img_height // 4)]
+    elif num_players == 5:
+        return [(img_width // 2, img_height // 4 - decalage),
+                (3 * img_width // 4, img_height // 2 - decalage),
+                (img_width // 4, 3 * img_height // 4 - decalage),
+                (3 * img_width // 4, 3 * img_height // 4 - decalage),
+                (img_width // 4, (img_height // 2) - decalage)]
+    elif num_players == 6:
+        return [(img_width // 4, img_height // 4), (img_width // 2, img_height // 4),
+                (3 * img_width // 4, img_height // 4),
+                (img_width // 4, 3 * img_height // 4), (img_width // 2, 3 * img_height // 4),
+                (3 * img_width // 4, 3 * img_height // 4)]
+    else:
+        return []
+
+
+def hand_offset(number_of_cards):
+    """
+    Return the x offset of the first card of a hand, so that hands stay centered on their position.
+    Same offsets as display_button_card_adapt_to_number_of_cards.
+
+    Parameters:
+    - number_of_cards: Number of cards in the hand.
+
+    Returns:
+    - int: The x offset.
+    """
+    return 40 - 20 * min(number_of_cards, 5)
+
+
+def hand_card_positions(position, number_of_cards, selected=()):
+    """
+    Return the position of the top left corner of each card of a hand, and of the name of the player.
+
+    Parameters:
+    - position (tuple): Position (x, y) of the seat, from calculate_card_positions.
+    - number_of_cards (int): Number of cards in the hand.
+    - selected: Indexes of the cards selected to be played, raised by SELECTED_CARD_OFFSET.
+
+    Returns:
+    - tuple: The list of (x, y) of the cards and the (x, y) of the name.
+    """
+    x, y = position
+    offset = hand_offset(number_of_cards)
+    card_positions = [(x + CARD_SPACING * index + offset,
+                       y + HAND_Y_OFFSET - (SELECTED_CARD_OFFSET if index in selected else 0))
+                      for index in range(number_of_cards)]
+    return card_positions, (x + CARD_SPACING * number_of_cards + offset + NAME_X_OFFSET, y + NAME_Y_OFFSET)
+
+
+def deck_and_pile_positions(image_width, image_height):
+    """
+    Returns:
+    - tuple: The (x, y) of the deck, of the pile, and of the number of cards of the deck.
+    """
+    center_x = image_width // 2
+    center_y = image_height // 2
+    deck_position = (center_x + DECK_OFFSET[0], center_y + DECK_OFFSET[1])
+    pile_position = (center_x + PILE_OFFSET[0], center_y + PILE_OFFSET[1])
+    return deck_position, pile_position, (deck_position[0], deck_position[1] + DECK_TEXT_Y_OFFSET)
+
+
+def seat_positions(players_list, image_width, image_height):
+    """
+    Give a position on the board to each player still in game, in the order of the seats, so that the players
+    stay at the same place from a round to the next and on every board drawing the same game.
+
+    Parameters:
+    - players_list (list): The Player objects of the game, in the order of the seats (GameEngine.players_list).
+    - image_width, image_height (int): Size of the board game image.
+
+    Returns:
+    - dict: Position (x, y) of the seat by player name.
+    """
+    players = [player for player in players_list if not player.is_eliminate]
+    positions = calculate_card_positions(len(players), image_width, image_height)
+    return {player.name: position for player, position in zip(players, positions)}
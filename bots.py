@@ -0,0 +1,134 @@
+import random
+from functools import lru_cache
+
+from card_encoding import CARD_RANK_MASKS, JOKER1, NUMBER_OF_CARDS, NUMBER_OF_RANKS, hand_value, ids_from_mask
+from end_round_oracle import load_end_round_table, win_probability
+from game_engine import DecisionProvider, Move, PICK_DECK, PICK_PILE
+from ismcts_bot import ISMCTSBot
+from legal_plays import LEGAL_PLAYS_CACHE_SIZE, legal_plays
+
+
+# The greedy bot ends the round when it beats all the opponents with at least this probability
+END_ROUND_WIN_PROBABILITY = 0.5
+
+
+class RandomBot(DecisionProvider):
+    def __init__(self, seed=None, pass_probability=0.05):
+        """
+        Initialize a RandomBot object: a computer player which plays a random legal set of cards, picks randomly
+        from the deck or the pile and ends the round as soon as it is allowed to.
+
+        Parameters:
+        - seed: Seed of the random generator of the bot.
+        - pass_probability (float): Probability to pass its turn when it is still allowed to.
+        """
+        self.rng = random.Random(seed)
+        self.pass_probability = pass_probability
+
+    def choose_move(self, engine, player):
+        """
+        Return the Move played by the bot.
+
+        Parameters:
+        - engine (GameEngine): The game being played.
+        - player (Player): The player played by the bot.
+
+        Returns:
+        - Move: The decision of the bot.
+        """
+        if engine.can_end_round(player):
+            return Move(end_round=True)
+        if engine.can_pass(player) and self.rng.random() < self.pass_probability:
+            return Move(is_pass=True)
+        return Move(ids_from_mask(self.rng.choice(legal_plays(player.hand_mask))),
+                    pick=self.rng.choice((PICK_DECK, PICK_PILE)))
+
+
+# Pairs of cards of the same suit which make a run with a card: the 2 below, one on each side, the 2 above
+RUN_COMPLETING_MASKS = tuple(
+    tuple((1 << (card_id + first_offset)) | (1 << (card_id + second_offset))
+          for first_offset, second_offset in ((-2, -1), (-1, 1), (1, 2))
+          if 0 <= card_id % NUMBER_OF_RANKS + first_offset and card_id % NUMBER_OF_RANKS + second_offset < NUMBER_OF_RANKS)
+    if card_id < JOKER1 else ()
+    for card_id in range(NUMBER_OF_CARDS))
+
+END_ROUND_MOVE = Move(end_round=True)
+
+
+@lru_cache(maxsize=LEGAL_PLAYS_CACHE_SIZE)
+def best_play(hand_mask):
+    """
+    Return the legal play removing the most points from a hand, with the most cards in case of a tie.
+
+    Parameters:
+    - hand_mask (int): The hand bitmask.
+
+    Returns:
+    - int: Bitmask of the cards to play.
+    """
+    return max(legal_plays(hand_mask), key=lambda play: (hand_value(play), play.bit_count()))
+
+
+@lru_cache(maxsize=LEGAL_PLAYS_CACHE_SIZE)
+def play_move(play, pick):
+    """
+    Return the Move playing some cards, shared between the decisions (moves are never modified).
+    """
+    return Move(ids_from_mask(play), pick=pick)
+
+
+def completes_play(hand_mask, card_id):
+    """
+    Returns:
+    - bool: True if the card makes a group of the same value or a run of 3 cards with the cards of the hand.
+    """
+    if CARD_RANK_MASKS[card_id] & hand_mask:
+        return True
+    for run_mask in RUN_COMPLETING_MASKS[card_id]:
+        if hand_mask & run_mask == run_mask:
+            return True
+    return False
+
+
+class GreedyBot(DecisionProvider):
+    def __init__(self, seed=None, end_round_win_probability=END_ROUND_WIN_PROBABILITY):
+        """
+        Initialize a GreedyBot object: a fast computer player which plays the cards removing the most points, picks
+        the pile card when it makes a group or a run with its hand, and ends the round when it probably has the
+        lowest hand (see end_round_oracle). The decisions only use precomputed tables and memoized plays, for
+        simulations at scale.
+
+        Parameters:
+        - seed: Not used, the bot is deterministic (same signature as the other bots).
+        - end_round_win_probability (float): Minimum probability to beat all the opponents to end the round.
+        """
+        self.end_round_win_probability = end_round_win_probability
+        self.end_round_table = load_end_round_table()
+
+    def choose_move(self, engine, player):
+        """
+        Return the Move played by the bot.
+
+        Parameters:
+        - engine (GameEngine): The game being played.
+        - player (Player): The player played by the bot.
+
+        Returns:
+        - Move: The decision of the bot.
+        """
+        hand_mask = player.hand_mask
+        value = hand_value(hand_mask)
+        if value <= engine.number_to_end_round and \
+                win_probability(engine, player, self.end_round_table) >= self.end_round_win_probability:
+            return END_ROUND_MOVE
+        play = best_play(hand_mask)
+        pick = PICK_PILE if completes_play(hand_mask & ~play, engine.pile[-1]) else PICK_DECK
+        return play_move(play, pick)
+
+
+# Bots available for the simulations, by name
+BOTS = {
+    'random': RandomBot,
+    'greedy': GreedyBot,
+    'ismcts': ISMCTSBot,
+}
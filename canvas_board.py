@@ -0,0 +1,180 @@
+import tkinter as tk
+
+from board_layout import CARD_BORDER, CARD_BORDER_COLOR
+from card_images import CARD_WIDTH, CARD_HEIGHT
+
+
+TEXT_FONT = ("Arial", 12)
+
+
+class CardSprite:
+    def __init__(self, image_item, border_item):
+        """
+        Initialize a CardSprite object: the canvas items of one card slot of the board, reused for every card shown
+        in this slot.
+
+        Parameters:
+        - image_item (int): Canvas id of the image of the card.
+        - border_item (int): Canvas id of the rectangle drawn under the card.
+        """
+        self.image_item = image_item
+        self.border_item = border_item
+        # What the items display: (image name, x, y, border color), None when the slot is hidden
+        self.state = None
+        # What a click on the card means for the board, None if the card cannot be clicked
+        self.target = None
+
+
+class CanvasBoard:
+    def __init__(self, master, background_image, image_for_name, on_click):
+        """
+        Initialize a CanvasBoard object: the game board drawn on a single Tkinter Canvas.
+
+        The cards are canvas items instead of one button per card. The items of a card slot are created the first
+        time the slot is used and then reused, drawing a hand only changes the items of the cards that differ from
+        the previous drawing, and the clicks are matched to the cards by the board itself.
+
+        Parameters:
+        - master: The widget containing the canvas.
+        - background_image (ImageTk.PhotoImage): Image of the game board, its size is the size of the canvas.
+        - image_for_name: Function returning the PhotoImage of a card from its name.
+        - on_click: Function called with the target of the card clicked (see draw_cards).
+        """
+        self.image_for_name = image_for_name
+        self.on_click = on_click
+        self.canvas = tk.Canvas(master, width=background_image.width(), height=background_image.height(),
+                                highlightthickness=0)
+        self.canvas.create_image(0, 0, image=background_image, anchor='nw')
+        # Card slots by group (a hand, the deck, the pile), in the order they were created: the stacking order
+        self.groups = {}
+        self.texts = {}
+        # Number of canvas items changed, to check that a redraw only touches the cards which changed
+        self.item_updates = 0
+        # Like a button, the click is done when the mouse button is released over the card it was pressed on
+        self.pressed_target = None
+        self.canvas.bind("<ButtonPress-1>", self._press)
+        self.canvas.bind("<ButtonRelease-1>", self._click)
+
+    def draw_cards(self, group, cards):
+        """
+        Draw the cards of a group and hide the slots of the group which are not used any more.
+
+        Parameters:
+        - group: Key of the group of cards, the name of a player for a hand.
+        - cards (list): (image name, x, y, border color, target) of each card, from the bottom card to the top card.
+          The target is given to on_click when the card is clicked, None if the card cannot be clicked.
+        """
+        sprites = self.groups.setdefault(group, [])
+        for index, (image_name, x, y, border_color, target) in enumerate(cards):
+            if index == len(sprites):
+                sprites.append(self._new_sprite())
+            sprite = sprites[index]
+            sprite.target = target
+            state = (image_name, x, y, border_color)
+            if sprite.state != state:
+                self._update_sprite(sprite, state)
+        for sprite in sprites[len(cards):]:
+            self._hide_sprite(sprite)
+
+    def hide_group(self, group):
+        """
+        Hide all the cards of a group.
+        """
+        for sprite in self.groups.get(group, ()):
+            self._hide_sprite(sprite)
+
+    def draw_text(self, key, text, x, y, color="black"):
+        """
+        Draw a text on the board, its top left corner at (x, y).
+
+        Parameters:
+        - key: Key of the text, the same key reuses the same canvas item.
+        - text (str): The text.
+        - x, y (int): Position of the text.
+        - color (str): Color of the text.
+        """
+        item, state = self.texts.get(key, (None, None))
+        if item is None:
+            item = self.canvas.create_text(x, y, text=text, fill=color, font=TEXT_FONT, anchor='nw')
+            self.item_updates += 1
+        elif state != (text, x, y, color):
+            self.canvas.itemconfigure(item, text=text, fill=color, state='normal')
+            self.canvas.coords(item, x, y)
+            self.item_updates += 1
+        else:
+            return
+        self.canvas.tag_raise(item)
+        self.texts[key] = (item, (text, x, y, color))
+
+    def hide_text(self, key):
+        """
+        Hide a text drawn with draw_text.
+        """
+        item, state = self.texts.get(key, (None, None))
+        if state is not None:
+            self.canvas.itemconfigure(item, state='hidden')
+            self.item_updates += 1
+            self.texts[key] = (item, None)
+
+    def hit_test(self, x, y):
+        """
+        Return the target of the card at a position of the board.
+
+        Parameters:
+        - x, y (int): Position on the canvas.
+
+        Returns:
+        - The target of the top card at this position, None if there is no card or it cannot be clicked.
+        """
+        for sprites in reversed(self.groups.values()):
+            for sprite in reversed(sprites):
+                if sprite.state is not None:
+                    _, card_x, card_y, _ = sprite.state
+                    if card_x <= x < card_x + CARD_WIDTH and card_y <= y < card_y + CARD_HEIGHT:
+                        return sprite.target
+        return None
+
+    def _press(self, event):
+        self.pressed_target = self.hit_test(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+
+    def _click(self, event):
+        pressed_target, self.pressed_target = self.pressed_target, None
+        target = self.hit_test(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y))
+        if target is not None and target == pressed_target:
+            self.on_click(target)
+
+    def _new_sprite(self):
+        border_item = self.canvas.create_rectangle(0, 0, 0, 0, width=0, fill=CARD_BORDER_COLOR, state='hidden')
+        image_item = self.canvas.create_image(0, 0, anchor='nw', state='hidden')
+        return CardSprite(image_item, border_item)
+
+    def _update_sprite(self, sprite, state):
+        """
+        Change only the attributes of the items of a card slot which differ from what they display.
+        """
+        image_name, x, y, border_color = state
+        previous_name, previous_x, previous_y, previous_color = sprite.state or (None, None, None, None)
+        if image_name != previous_name:
+            self.canvas.itemconfigure(sprite.image_item, image=self.image_for_name(image_name))
+            self.item_updates += 1
+        if (x, y) != (previous_x, previous_y):
+            self.canvas.coords(sprite.image_item, x, y)
+            self.canvas.coords(sprite.border_item, x - CARD_BORDER, y - CARD_BORDER, x + CARD_WIDTH + CARD_BORDER,
+                               y + CARD_HEIGHT + CARD_BORDER)
+            self.item_updates += 2
+        if border_color != previous_color:
+            self.canvas.itemconfigure(sprite.border_item, fill=border_color or CARD_BORDER_COLOR)
+            self.item_updates += 1
+        if sprite.state is None:
+            self.canvas.itemconfigure(sprite.border_item, state='normal')
+            self.canvas.itemconfigure(sprite.image_item, state='normal')
+            self.item_updates += 2
+        sprite.state = state
+
+    def _hide_sprite(self, sprite):
+        if sprite.state is not None:
+            self.canvas.itemconfigure(sprite.border_item, state='hidden')
+            self.canvas.itemconfigure(sprite.image_item, state='hidden')
+            self.item_updates += 2
+            sprite.state = None
+            sprite.target = None
@@ -0,0 +1,229 @@
+import pydealer
+
+
+# A card is an integer id from 0 to 53: suit_index * 13 + rank_index for the 52 cards (rank_index 0 for Ace up to
+# 12 for King), 52 and 53 for the two jokers. A hand is a bitmask with the bit of each card id set, so removing a
+# card, checking if a card is in a hand and counting a hand are bit operations.
+
+CARD_VALUES = ["Ace", "2", "3", "4", "5", "6", "7", "8", "9", "10", "Jack", "Queen", "King"]
+CARD_SUITS = ["Clubs", "Diamonds", "Hearts", "Spades"]
+
+NUMBER_OF_RANKS = 13
+NUMBER_OF_CARDS = 54
+JOKER1 = 52
+JOKER2 = 53
+JOKERS_MASK = (1 << JOKER1) | (1 << JOKER2)
+FULL_DECK_MASK = (1 << NUMBER_OF_CARDS) - 1
+
+# Names of the cards, same names as str(card) for pydealer cards and as the image files
+CARD_NAMES = [f"{value} of {suit}" for suit in CARD_SUITS for value in CARD_VALUES] + ["Joker1", "Joker2"]
+CARD_IDS = {name: card_id for card_id, name in enumerate(CARD_NAMES)}
+
+# Value of each card when counting a hand: Ace 1, King, Queen, Jack and 10 count 10, Joker -1
+VALUE_FOR_COUNT_HAND = [min(rank_index + 1, 10) for _ in CARD_SUITS for rank_index in range(NUMBER_OF_RANKS)] + [-1, -1]
+
+# Rank of each card for the suits (Ace 1 up to King 13), 0 for the jokers
+RANK_FOR_SUIT = [rank_index + 1 for _ in CARD_SUITS for rank_index in range(NUMBER_OF_RANKS)] + [0, 0]
+
+SUIT_MASKS = [((1 << NUMBER_OF_RANKS) - 1) << (suit_index * NUMBER_OF_RANKS) for suit_index in range(len(CARD_SUITS))]
+RANK_MASKS = [sum(1 << (suit_index * NUMBER_OF_RANKS + rank_index) for suit_index in range(len(CARD_SUITS)))
+              for rank_index in range(NUMBER_OF_RANKS)]
+CARD_RANK_MASKS = [RANK_MASKS[card_id % NUMBER_OF_RANKS] for card_id in range(JOKER1)] + [JOKERS_MASK, JOKERS_MASK]
+
+# Order of the cards in a sorted pydealer hand: jokers first, then 2 up to Ace, Diamonds, Clubs, Hearts, Spades
+_SORT_RANKS = pydealer.const.DEFAULT_RANKS
+SORT_KEY = [_SORT_RANKS['values'][CARD_VALUES[card_id % NUMBER_OF_RANKS]] * 4
+            + _SORT_RANKS['suits'][CARD_SUITS[card_id // NUMBER_OF_RANKS]] for card_id in range(JOKER1)] + [-1, -2]
+
+
+def _build_suit_value_table():
+    """
+    Build the table of the value of every subset of the 13 cards of a suit, indexed by the 13 bits of the suit.
+    """
+    table = [0] * (1 << NUMBER_OF_RANKS)
+    for mask in range(1, 1 << NUMBER_OF_RANKS):
+        lowest_bit = mask & -mask
+        table[mask] = table[mask ^ lowest_bit] + min(lowest_bit.bit_length(), 10)
+    return table
+
+
+SUIT_VALUE_TABLE = _build_suit_value_table()
+_SUIT_BITS = (1 << NUMBER_OF_RANKS) - 1
+
+
+def hand_value(mask):
+    """
+    Calculate the total value of the cards of a hand, like Player.count_hand, with 4 table lookups.
+
+    Parameters:
+    - mask (int): The hand bitmask.
+
+    Returns:
+    - int: The total value of the cards in the hand.
+    """
+    return (SUIT_VALUE_TABLE[mask & _SUIT_BITS] + SUIT_VALUE_TABLE[(mask >> 13) & _SUIT_BITS]
+            + SUIT_VALUE_TABLE[(mask >> 26) & _SUIT_BITS] + SUIT_VALUE_TABLE[(mask >> 39) & _SUIT_BITS]
+            - ((mask >> JOKER1) & 1) - ((mask >> JOKER2) & 1))
+
+
+def is_valid_play(mask):
+    """
+    Check if a set of cards can be played together: one card, cards with the same value (the two jokers count as
+    the same value), or at least 3 cards of the same suit following each other.
+
+    Parameters:
+    - mask (int): Bitmask of the cards played.
+
+    Returns:
+    - bool: True if the cards can be played.
+    """
+    if mask == 0:
+        return False
+    lowest_card = (mask & -mask).bit_length() - 1
+    # One card, or cards with the same value
+    if mask & ~CARD_RANK_MASKS[lowest_card] == 0:
+        return True
+    if lowest_card >= JOKER1 or mask & ~SUIT_MASKS[lowest_card // NUMBER_OF_RANKS]:
+        return False
+    # Cards of the same suit following each other: the bits are contiguous
+    shifted_mask = mask >> lowest_card
+    return shifted_mask & (shifted_mask + 1) == 0 and shifted_mask >= 0b111
+
+
+def is_valid_selection(mask):
+    """
+    Check if a set of cards selected on the board is a valid play, or can become one: two cards of the same suit
+    following each other still need a third card.
+
+    Parameters:
+    - mask (int): Bitmask of the cards selected.
+
+    Returns:
+    - bool: True if the selection is allowed.
+    """
+    if is_valid_play(mask):
+        return True
+    lowest_card = (mask & -mask).bit_length() - 1
+    return lowest_card < JOKER1 and lowest_card % NUMBER_OF_RANKS < NUMBER_OF_RANKS - 1 and \
+        mask == 0b11 << lowest_card
+
+
+def mask_from_ids(card_ids):
+    """
+    Parameters:
+    - card_ids: Iterable of card ids.
+
+    Returns:
+    - int: The bitmask of the cards.
+    """
+    mask = 0
+    for card_id in card_ids:
+        mask |= 1 << card_id
+    return mask
+
+
+def ids_from_mask(mask):
+    """
+    Parameters:
+    - mask (int): A bitmask of cards.
+
+    Returns:
+    - list: The card ids of the bitmask, in increasing order.
+    """
+    card_ids = []
+    while mask:
+        lowest_bit = mask & -mask
+        card_ids.append(lowest_bit.bit_length() - 1)
+        mask ^= lowest_bit
+    return card_ids
+
+
+def sorted_hand_ids(mask):
+    """
+    Return the card ids of a hand in the order of a sorted pydealer hand, the order used to display hands.
+
+    Parameters:
+    - mask (int): The hand bitmask.
+
+    Returns:
+    - list: The sorted card ids.
+    """
+    return sorted(ids_from_mask(mask), key=SORT_KEY.__getitem__)
+
+
+def card_name(card_id):
+    """
+    Returns:
+    - str: The name of the card ('10 of Hearts', 'Joker1'...), same as str() of the pydealer card.
+    """
+    return CARD_NAMES[card_id]
+
+
+def card_to_id(card):
+    """
+    Convert a pydealer card to its card id.
+
+    Parameters:
+    - card (pydealer.Card): The card, jokers must have been named by init_jokers ('Joker1' and 'Joker2').
+
+    Returns:
+    - int: The card id.
+    """
+    return CARD_IDS[str(card)]
+
+
+def id_to_card(card_id):
+    """
+    Convert a card id to a pydealer card, for the user interface.
+
+    Parameters:
+    - card_id (int): The card id.
+
+    Returns:
+    - pydealer.Card: The card, jokers are named like init_jokers does.
+    """
+    if card_id >= JOKER1:
+        card = pydealer.Card('Joker', 'Hearts')
+        card.name = CARD_NAMES[card_id]
+        card.abbrev = f'J{card_id - JOKER1 + 1}'
+        return card
+    return pydealer.Card(CARD_VALUES[card_id % NUMBER_OF_RANKS], CARD_SUITS[card_id // NUMBER_OF_RANKS])
+
+
+def stack_from_ids(card_ids):
+    """
+    Convert a list of card ids (deck or pile, the top card last) to a pydealer Stack.
+
+    Parameters:
+    - card_ids (list): The card ids.
+
+    Returns:
+    - pydealer.Stack: The cards, in the same order.
+    """
+    return pydealer.Stack(cards=[id_to_card(card_id) for card_id in card_ids])
+
+
+def stack_from_mask(mask):
+    """
+    Convert a hand bitmask to a sorted pydealer Stack.
+
+    Parameters:
+    - mask (int): The hand bitmask.
+
+    Returns:
+    - pydealer.Stack: The sorted hand.
+    """
+    return stack_from_ids(sorted_hand_ids(mask))
+
+
+def mask_from_stack(stack):
+    """
+    Convert a pydealer Stack to a bitmask.
+
+    Parameters:
+    - stack (pydealer.Stack): The cards.
+
+    Returns:
+    - int: The bitmask of the cards.
+    """
+    return mask_from_ids(card_to_id(card) for card in stack)
@@ -0,0 +1,138 @@
+import os
+import sys
+from PIL import Image
+from card_encoding import CARD_NAMES
+
+
+CARD_WIDTH = 100
+CARD_HEIGHT = 125
+IMAGES_DIRECTORY = "./images"
+ATLAS_PATH = "./images/cards_atlas.png"
+ATLAS_COLUMNS = 11
+BACK_NAME = "Back"
+GAME_BOARD_NAME = "Game_Board_Image"
+
+# Names of the 54 cards faces (same names as the image files) and of the back of the cards
+ATLAS_NAMES = CARD_NAMES + [BACK_NAME]
+
+
+class CardImageCache:
+    def __init__(self, images_directory=IMAGES_DIRECTORY, atlas_path=ATLAS_PATH, size=(CARD_WIDTH, CARD_HEIGHT)):
+        """
+        Initialize a CardImageCache object, which decodes and resizes the card images only once.
+
+        The resized PIL images are shared by all the windows. The Tkinter PhotoImage objects are created once per
+        Tkinter root window (a PhotoImage cannot be used by another root).
+
+        Parameters:
+        - images_directory: Directory of the card images.
+        - atlas_path: Path of the sprite atlas with all the resized cards, used if it exists.
+        - size: Size (width, height) of the cards on the board.
+        """
+        self.images_directory = images_directory
+        self.atlas_path = atlas_path
+        self.size = size
+        self.images = {}
+        self.photo_images = {}
+        self.photo_images_master = None
+
+    def load(self):
+        """
+        Decode and resize the 54 card faces and the back of the cards, from the atlas if it exists.
+        """
+        if self.atlas_path and os.path.exists(self.atlas_path):
+            atlas = Image.open(self.atlas_path)
+            atlas.load()
+            width, height = self.size
+            for index, name in enumerate(ATLAS_NAMES):
+                row, column = divmod(index, ATLAS_COLUMNS)
+                self.images[name] = atlas.crop((column * width, row * height, (column + 1) * width,
+                                                (row + 1) * height))
+        else:
+            for name in ATLAS_NAMES:
+                self.image(name)
+
+    def image(self, name):
+        """
+        Return the resized PIL image of a card.
+
+        Parameters:
+        - name: Name of the card ('10 of Hearts', 'Joker1', 'Back'...).
+
+        Returns:
+        - PIL.Image.Image: The resized image.
+        """
+        if name not in self.images:
+            if name == GAME_BOARD_NAME:
+                card_image = Image.open(f"{self.images_directory}/{name}.png")
+                card_image.load()
+            else:
+                card_image = Image.open(f"{self.images_directory}/{name}.png").resize(self.size)
+            self.images[name] = card_image
+        return self.images[name]
+
+    def photo_image(self, name, master):
+        """
+        Return the Tkinter PhotoImage of a card, shared by all the widgets of the same root window.
+
+        Parameters:
+        - name: Name of the card ('10 of Hearts', 'Joker1', 'Back'...).
+        - master: A widget of the window where the image is displayed.
+
+        Returns:
+        - ImageTk.PhotoImage: The image of the card.
+        """
+        # Imported here, so that the images can be loaded without Tkinter (see board_compositor)
+        from PIL import ImageTk
+
+        root = master.nametowidget('.')
+        if root is not self.photo_images_master:
+            # The previous root window has been destroyed with its images
+            self.photo_images = {}
+            self.photo_images_master = root
+        if name not in self.photo_images:
+            self.photo_images[name] = ImageTk.PhotoImage(self.image(name), master=root)
+        return self.photo_images[name]
+
+
+card_image_cache = CardImageCache()
+
+
+def get_card_image(name, master):
+    """
+    Return the shared Tkinter PhotoImage of a card.
+
+    Parameters:
+    - name: Name of the card ('10 of Hearts', 'Joker1', 'Back'...).
+    - master: A widget of the window where the image is displayed.
+
+    Returns:
+    - ImageTk.PhotoImage: The image of the card.
+    """
+    return card_image_cache.photo_image(name, master)
+
+
+def build_card_atlas(images_directory=IMAGES_DIRECTORY, atlas_path=ATLAS_PATH, size=(CARD_WIDTH, CARD_HEIGHT)):
+    """
+    Pack all the resized card images in one PNG file, so that the game decodes one small image at startup
+    instead of 55 big ones.
+
+    Parameters:
+    - images_directory: Directory of the card images.
+    - atlas_path: Path of the atlas to write.
+    - size: Size (width, height) of each card in the atlas.
+    """
+    width, height = size
+    rows = (len(ATLAS_NAMES) + ATLAS_COLUMNS - 1) // ATLAS_COLUMNS
+    atlas = Image.new("RGBA", (ATLAS_COLUMNS * width, rows * height))
+    for index, name in enumerate(ATLAS_NAMES):
+        row, column = divmod(index, ATLAS_COLUMNS)
+        card_image = Image.open(f"{images_directory}/{name}.png").convert("RGBA").resize(size)
+        atlas.paste(card_image, (column * width, row * height))
+    atlas.save(atlas_path)
+
+
+if __name__ == "__main__":
+    if "--build-atlas" in sys.argv:
+        build_card_atlas()
+        print(f"Card atlas written to {ATLAS_PATH}")
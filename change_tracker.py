@@ -0,0 +1,71 @@
+class ChangeTracker:
+    def __init__(self):
+        """
+        Initialize a ChangeTracker object: the version counter of a game.
+
+        Every change of a tracked attribute of a player, and every change of the table (deck, pile, turn, round),
+        increments the version, and the changed object remembers the version of its last change. A renderer or a
+        broadcaster keeps the versions of what it has drawn or sent, and only draws or sends again the parts whose
+        version is newer.
+        """
+        self.version = 0
+        # Version of the last change of each attribute, all players included ('table' for the engine)
+        self.attribute_versions = {}
+        self.memos = {}
+
+    def changed(self, attribute):
+        """
+        Record a change.
+
+        Parameters:
+        - attribute (str): The attribute changed, 'table' for the state of the engine.
+
+        Returns:
+        - int: The new version of the game.
+        """
+        self.version += 1
+        self.attribute_versions[attribute] = self.version
+        return self.version
+
+    def attach(self, players_list):
+        """
+        Make the players of a game record their changes in this tracker. The version of the game starts after the
+        versions of the players, so that a version is never older than a change already recorded.
+
+        Parameters:
+        - players_list (list): List of Player objects.
+        """
+        for player in players_list:
+            player.tracker = self
+            self.version = max([self.version, *player.versions.values()])
+
+    def memoize(self, key, version, render):
+        """
+        Return the value rendered for a key, rendered again only when its version has changed.
+
+        Parameters:
+        - key: Key of the rendered value, one value is kept per key.
+        - version: Versions of what the value is made of, any hashable value.
+        - render: Function without parameter returning the value.
+
+        Returns:
+        - The rendered value.
+        """
+        memo = self.memos.get(key)
+        if memo is None or memo[0] != version:
+            memo = self.memos[key] = (version, render())
+        return memo[1]
+
+
+def versions_of(players_list, attribute):
+    """
+    Return the version of an attribute of each player, to detect that one of them has changed.
+
+    Parameters:
+    - players_list (list): List of Player objects.
+    - attribute (str): A tracked attribute (see player_class.TRACKED_ATTRIBUTES).
+
+    Returns:
+    - tuple: The version of the last change of the attribute of each player, 0 if it never changed.
+    """
+    return tuple(player.versions.get(attribute, 0) for player in players_list)
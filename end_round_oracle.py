@@ -0,0 +1,145 @@
+import os
+import sys
+from functools import lru_cache
+from math import comb
+
+import numpy as np
+
+from card_encoding import NUMBER_OF_CARDS, VALUE_FOR_COUNT_HAND, hand_value, mask_from_ids
+from game_engine import NUMBER_OF_CARDS_PER_HAND
+
+
+END_ROUND_TABLE_PATH = "./data/end_round_table.npy"
+
+# The table is conditioned on the number of visible cards of each of these values (jokers, Ace to 5): the cards
+# of a low hand. The higher cards are counted as not visible.
+CONDITIONED_VALUES = (-1, 1, 2, 3, 4, 5)
+CARDS_BY_VALUE = {value: VALUE_FOR_COUNT_HAND.count(value) for value in sorted(set(VALUE_FOR_COUNT_HAND))}
+VALUE_MASKS = [sum(1 << card_id for card_id, card_value in enumerate(VALUE_FOR_COUNT_HAND) if card_value == value)
+               for value in CONDITIONED_VALUES]
+
+MINIMUM_HAND_VALUE = 2 * min(VALUE_FOR_COUNT_HAND)
+MAXIMUM_HAND_VALUE = NUMBER_OF_CARDS_PER_HAND * max(VALUE_FOR_COUNT_HAND)
+
+
+def build_end_round_table():
+    """
+    Calculate the probability that a hand of unknown cards is higher than each value, for each hand size and each
+    number of visible cards of the CONDITIONED_VALUES. The hands are counted exactly, class of value by class of
+    value, for all the numbers of visible cards at once.
+
+    Returns:
+    - np.ndarray: float16 array of shape (3, 5, 5, 5, 5, 5, 6, 53): [visible jokers, visible Aces, ..., visible 5s,
+      hand size, value - MINIMUM_HAND_VALUE], for all the values from MINIMUM_HAND_VALUE to MAXIMUM_HAND_VALUE.
+    """
+    visible_shape = tuple(CARDS_BY_VALUE[value] + 1 for value in CONDITIONED_VALUES)
+    visible_counts = np.indices(visible_shape).reshape(len(CONDITIONED_VALUES), -1)
+    number_of_cases = visible_counts.shape[1]
+    number_of_sums = MAXIMUM_HAND_VALUE - MINIMUM_HAND_VALUE + 1
+
+    # ways[case, number of cards, sum - MINIMUM_HAND_VALUE]: number of hands of the unknown cards
+    ways = np.zeros((number_of_cases, NUMBER_OF_CARDS_PER_HAND + 1, number_of_sums))
+    ways[:, 0, -MINIMUM_HAND_VALUE] = 1
+    for value, number_of_cards in CARDS_BY_VALUE.items():
+        if value in CONDITIONED_VALUES:
+            unknown_cards = number_of_cards - visible_counts[CONDITIONED_VALUES.index(value)]
+        else:
+            unknown_cards = np.full(number_of_cases, number_of_cards)
+        new_ways = np.zeros_like(ways)
+        for taken in range(min(number_of_cards, NUMBER_OF_CARDS_PER_HAND) + 1):
+            coefficients = np.array([comb(int(unknown), taken) for unknown in unknown_cards], dtype=float)
+            # A hand of at most 5 cards never leaves the range of sums, so the roll never wraps a non zero value
+            shifted = np.roll(ways[:, :NUMBER_OF_CARDS_PER_HAND + 1 - taken], value * taken, axis=2)
+            new_ways[:, taken:] += coefficients[:, None, None] * shifted
+        ways = new_ways
+
+    unknown_deck_sizes = NUMBER_OF_CARDS - visible_counts.sum(axis=0)
+    number_of_hands = np.array([[comb(int(deck_size), hand_size) for hand_size in range(NUMBER_OF_CARDS_PER_HAND + 1)]
+                                for deck_size in unknown_deck_sizes], dtype=float)
+    # Number of hands higher than each value: the hands with a sum above it
+    higher_ways = ways[:, :, ::-1].cumsum(axis=2)[:, :, ::-1]
+    higher_ways = np.concatenate([higher_ways[:, :, 1:], np.zeros_like(higher_ways[:, :, :1])], axis=2)
+    probabilities = higher_ways / number_of_hands[:, :, None]
+    return probabilities.reshape(visible_shape + probabilities.shape[1:]).astype(np.float16)
+
+
+def save_end_round_table(path=END_ROUND_TABLE_PATH):
+    """
+    Build the table and save it as a .npy file, loaded with mmap by load_end_round_table.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    np.save(path, build_end_round_table())
+
+
+@lru_cache(maxsize=None)
+def load_end_round_table(path=END_ROUND_TABLE_PATH):
+    """
+    Load the table with mmap if the file exists, otherwise build it in memory (about a second).
+
+    Returns:
+    - np.ndarray: The table, see build_end_round_table.
+    """
+    if os.path.exists(path):
+        return np.load(path, mmap_mode='r')
+    return build_end_round_table()
+
+
+def visible_counts(visible_mask):
+    """
+    Returns:
+    - tuple: The number of visible cards of each of the CONDITIONED_VALUES.
+    """
+    return tuple((visible_mask & value_mask).bit_count() for value_mask in VALUE_MASKS)
+
+
+def higher_hand_probability(hand_size, value, visible_mask, table=None):
+    """
+    Return the probability that a hand of unknown cards is higher than a value.
+
+    Parameters:
+    - hand_size (int): Number of cards of the hand.
+    - value (int): The value to beat.
+    - visible_mask (int): Bitmask of the cards which cannot be in the hand (the pile, the hand of the caller).
+    - table (np.ndarray): The table, load_end_round_table() if None.
+
+    Returns:
+    - float: The probability.
+    """
+    if table is None:
+        table = load_end_round_table()
+    if value < MINIMUM_HAND_VALUE:
+        return 1.0
+    if value >= MAXIMUM_HAND_VALUE:
+        return 0.0
+    return float(table[visible_counts(visible_mask) + (hand_size, value - MINIMUM_HAND_VALUE)])
+
+
+def win_probability(engine, player, table=None):
+    """
+    Return the probability that the player does not lose any duel if it ends the round now: the hand of every
+    active opponent must be higher than its hand (Player.end_round gives 25 points for each opponent lower or
+    equal). The opponents' hands are taken as independent.
+
+    Parameters:
+    - engine (GameEngine): The game.
+    - player (Player): The player who could end the round.
+    - table (np.ndarray): The table, load_end_round_table() if None.
+
+    Returns:
+    - float: The probability to win the round.
+    """
+    value = hand_value(player.hand_mask)
+    visible_mask = player.hand_mask | mask_from_ids(engine.pile)
+    probability = 1.0
+    for opponent in engine.players_list:
+        if opponent is not player and not opponent.is_eliminate:
+            probability *= higher_hand_probability(opponent.hand_mask.bit_count(), value, visible_mask, table)
+    return probability
+
+
+if __name__ == "__main__":
+    if '--build' in sys.argv:
+        save_end_round_table()
+        print(f"END ROUND table saved in {END_ROUND_TABLE_PATH}")
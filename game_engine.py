@@ -0,0 +1,483 @@
+import random
+
+from card_encoding import NUMBER_OF_CARDS, card_name, hand_value, is_valid_play, mask_from_ids, stack_from_mask
+from change_tracker import ChangeTracker
+from turn_scheduler import TurnScheduler
+
+
+ELIMINATION_SCORE_THRESHOLD = 150
+NUMBER_TO_END_ROUND = 9
+NUMBER_OF_CARDS_PER_HAND = 5
+MAXIMUM_NUMBER_OF_PASS = 1
+
+PICK_DECK = 'deck'
+PICK_PILE = 'pile'
+
+
+class IllegalMoveError(Exception):
+    """
+    Raised when a decision provider returns a move that the rules do not allow.
+    """
+
+
+class Move:
+    def __init__(self, cards_played=None, pick=None, is_pass=False, end_round=False):
+        """
+        Initialize a Move object, the decision of one player for one turn.
+
+        Parameters:
+        - cards_played (list): Ids of the cards played (see card_encoding), the last one ends on top of the pile.
+        - pick (str): Where the player picks a card after playing, PICK_DECK or PICK_PILE.
+        - is_pass (bool): True if the player passes its turn.
+        - end_round (bool): True if the player decides to end the round.
+        """
+        self.cards_played = list(cards_played or [])
+        self.pick = pick
+        self.is_pass = is_pass
+        self.end_round = end_round
+
+    def __repr__(self):
+        if self.end_round:
+            return 'Move(END ROUND)'
+        if self.is_pass:
+            return 'Move(PASS)'
+        return f'Move({[card_name(card_id) for card_id in self.cards_played]}, pick={self.pick})'
+
+
+class DecisionProvider:
+    """
+    Base class of everything that can take decisions for a player: the Tkinter board, a bot, a remote client...
+
+    Only choose_move is mandatory, the other methods are hooks called by GameEngine.play_game.
+    """
+
+    def choose_move(self, engine, player):
+        """
+        Return the Move played by the player whose turn it is.
+
+        Parameters:
+        - engine (GameEngine): The game being played.
+        - player (Player): The player who has to play.
+
+        Returns:
+        - Move: The decision of the player.
+        """
+        raise NotImplementedError
+
+    def round_started(self, engine):
+        """
+        Called once the cards are dealt for a new round.
+        """
+
+    def move_applied(self, engine, player, move):
+        """
+        Called after a move has been applied (the turn has already moved to the next player).
+        """
+
+    def round_finished(self, engine, player):
+        """
+        Called after a player has ended the round and the scores have been updated.
+        """
+
+    def game_finished(self, engine):
+        """
+        Called once only one player is not eliminated.
+        """
+
+
+def new_shuffled_deck(rng=random):
+    """
+        Create a shuffled deck of the 54 card ids, jokers included.
+
+        Parameters:
+        - rng (random.Random): The random generator used to shuffle the deck.
+
+        Returns:
+        - list: The card ids, the top of the deck is the end of the list.
+        """
+    deck = list(range(NUMBER_OF_CARDS))
+    rng.shuffle(deck)
+    return deck
+
+
+def draw_cards_to_players(players_list, deck):
+    """
+        Draw cards from the deck and assign them to players still on game.
+
+        Parameters:
+        - players_list (list): List of Player objects.
+        - deck (list): The card ids from which cards are drawn.
+        """
+    for player in players_list:
+        if not player.is_eliminate:
+            player.hand_mask = mask_from_ids(deck.pop() for _ in range(NUMBER_OF_CARDS_PER_HAND))
+        else:
+            player.hand_mask = 0
+
+
+def draw_card_to_pile(deck):
+    """
+        Draw cards from the deck and form a pile.
+
+        Parameters:
+        - deck (list): The card ids from which cards are drawn.
+
+        Returns:
+        - list: The pile of card ids, the top of the pile is the end of the list.
+        """
+    return [deck.pop()]
+
+
+def recycle_pile(deck, pile, rng=random):
+    """
+        Move the cards of the pile under its top card to the empty deck and shuffle them, the top card stays on the
+        pile. Both lists are changed in place with one slice each, the deck is drawn from its end (deck.pop()).
+
+        Parameters:
+        - deck (list): The empty deck of card ids.
+        - pile (list): The pile of card ids, the top of the pile is the end of the list.
+        - rng (random.Random): The random generator used to shuffle the deck.
+        """
+    deck[:] = pile[-2::-1]
+    del pile[:-1]
+    rng.shuffle(deck)
+
+
+def reset_finish_round_for_each_player(players_list):
+    """
+        Reset finish_round for all players to False after each round
+
+        Parameters:
+        - players_list (list): List of Player objects.
+    """
+    for player in players_list:
+        player.finish_round = False
+
+
+def score_round(players_list, player_who_ends):
+    """
+    Update the scores when a player ends the round, with the rules of Player.end_round:
+    - if an opponent has a hand lower or equal to the player who ends the round, this player gets 25 points
+      for each of these opponents, and those opponents get their hand only if it is negative,
+    - otherwise the opponent gets the value of its hand,
+    - the player who ends the round gets the value of its hand if it is negative.
+    score_round is the number of points each player got in this round.
+
+    Parameters:
+    - players_list (list): List of Player objects, their hand_mask is counted.
+    - player_who_ends (Player): The player who ends the round.
+    """
+    player_who_ends.finish_round = True
+    value_of_player_who_ends = hand_value(player_who_ends.hand_mask)
+    player_who_ends.score_round = 0
+
+    for player in players_list:
+        if player is player_who_ends or player.is_eliminate:
+            continue
+        value = hand_value(player.hand_mask)
+        if value_of_player_who_ends >= value:
+            player_who_ends.score_round += 25
+            player.score_round = value if value < 0 else 0
+        else:
+            player.score_round = value
+        player.score += player.score_round
+
+    if value_of_player_who_ends < 0:
+        player_who_ends.score_round += value_of_player_who_ends
+    player_who_ends.score += player_who_ends.score_round
+
+
+def distinct_providers(providers):
+    """
+    Return the distinct decision providers of a game, to call their hooks only once.
+
+    Parameters:
+    - providers: A DecisionProvider for all players, or a dict of DecisionProvider by player name.
+
+    Returns:
+    - list: The distinct DecisionProvider objects.
+    """
+    if isinstance(providers, dict):
+        providers_list = []
+        for provider in providers.values():
+            if provider not in providers_list:
+                providers_list.append(provider)
+        return providers_list
+    return [providers]
+
+
+def provider_for(providers, player):
+    """
+    Return the decision provider taking the decisions of a player.
+
+    Parameters:
+    - providers: A DecisionProvider for all players, or a dict of DecisionProvider by player name.
+    - player (Player): The player.
+
+    Returns:
+    - DecisionProvider: The provider of the player, None if the dict has no provider for this player.
+    """
+    if isinstance(providers, dict):
+        return providers.get(player.name)
+    return providers
+
+
+def eliminate_players(players_list, elimination_score_threshold=ELIMINATION_SCORE_THRESHOLD):
+    """
+    Eliminate the players whose score reaches the elimination threshold and give them their ranking.
+
+    Parameters:
+    - players_list (list): List of Player objects.
+    - elimination_score_threshold (int): Score from which a player is eliminated.
+
+    Returns:
+    - list: The players eliminated by this call.
+    """
+    eliminated_players = []
+    for each_player in players_list:
+        if each_player.score >= elimination_score_threshold and not each_player.is_eliminate:
+            each_player.is_eliminate = True
+            eliminated_players.append(each_player)
+
+        # Update player rankings
+        eliminated_count = sum(1 for player in players_list if player.is_eliminate)
+        if each_player.ranking == 0 and each_player.is_eliminate:
+            each_player.ranking = (len(players_list) - eliminated_count) + 1
+
+    return eliminated_players
+
+
+class GameEngine:
+    def __init__(self, players_list, elimination_score_threshold=ELIMINATION_SCORE_THRESHOLD,
+                 number_to_end_round=NUMBER_TO_END_ROUND, seed=None):
+        """
+        Initialize a GameEngine object, which owns the deck, the pile, the hands and the turn order of a game.
+
+        The engine has no user interface: every decision is asked to a DecisionProvider, so a game can be played
+        with the Tkinter board, with bots, or both. All the shuffles use the random generator of the engine, so the
+        same seed and the same moves always give the same game (see replay).
+
+        The players keep their seat in players_list, the order of play is a TurnScheduler over their seats.
+        The players record their changes in the ChangeTracker of the game, and each move or new round is recorded
+        as a change of the 'table', so the board and the server only update what has changed (see change_tracker).
+
+        Parameters:
+        - players_list (list): List of Player objects, the first one starts the game.
+        - elimination_score_threshold (int): Score from which a player is eliminated (house rule).
+        - number_to_end_round (int): Maximum value of a hand to be allowed to end the round (house rule).
+        - seed (int): Seed of the shuffles, chosen randomly if None.
+        """
+        self.players_list = list(players_list)
+        self.seats = {player.name: seat for seat, player in enumerate(self.players_list)}
+        self.turn_scheduler = TurnScheduler([not player.is_eliminate for player in self.players_list])
+        self.change_tracker = ChangeTracker()
+        self.change_tracker.attach(self.players_list)
+        self.elimination_score_threshold = elimination_score_threshold
+        self.number_to_end_round = number_to_end_round
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        # Object with a record(move) method called for every move applied, see replay.ReplayRecorder
+        self.replay_log = None
+        self.deck = None
+        self.pile = None
+        self.round_number = 0
+        # Seat of the round in the rotation of the players, one seat further each round (eliminated seats included)
+        self.round_start_seat = 0
+        self.round_over = True
+        self.last_picked_card = None
+        self.eliminated_players = []
+
+    def is_game_over(self):
+        """
+        Returns:
+        - bool: True if all players except one (or all players) are eliminated.
+        """
+        return self.turn_scheduler.number_of_active_seats <= 1
+
+    def active_players(self):
+        """
+        Returns:
+        - list: The players not eliminated, in turn order (the current player first).
+        """
+        return [self.players_list[seat] for seat in self.turn_scheduler.seats_from(self.turn_scheduler.current_seat)]
+
+    def current_player(self):
+        """
+        Returns:
+        - Player: The player who has to play.
+        """
+        return self.players_list[self.turn_scheduler.current_seat]
+
+    def next_player(self):
+        """
+        Returns:
+        - Player: The player who plays after the current player.
+        """
+        return self.players_list[self.turn_scheduler.next_to_act()]
+
+    def sync_player_hands(self):
+        """
+        Convert the hands of the players to sorted pydealer stacks (player.hand), for the user interface.
+        """
+        for player in self.players_list:
+            player.hand = stack_from_mask(player.hand_mask)
+
+    def players_from(self, player):
+        """
+        Return the players list rotated so that the given player is the first one.
+
+        Parameters:
+        - player (Player): The player to put first.
+
+        Returns:
+        - list: The rotated list of Player objects.
+        """
+        seat = self.seats[player.name]
+        return self.players_list[seat:] + self.players_list[:seat]
+
+    def turn_order(self):
+        """
+        Returns:
+        - list: All the Player objects, eliminated ones included, in order of play from the current player.
+        """
+        return self.players_from(self.current_player())
+
+    def start_round(self):
+        """
+        Start a new round: rotate the order of play, create the deck with jokers, deal the hands and the pile.
+        The players start the rounds in turn, one seat after the other whoever ended the previous round, like the
+        original game rotated its players list once per round.
+        """
+        if self.round_number > 0:
+            # Reset finish round to False and switch players order for next round
+            reset_finish_round_for_each_player(self.players_list)
+            self.round_start_seat = (self.round_start_seat + 1) % len(self.players_list)
+        # The first player still in game from the seat of the round starts it
+        self.turn_scheduler.current_seat = self.round_start_seat
+        if not self.turn_scheduler.is_active(self.round_start_seat):
+            self.turn_scheduler.advance()
+
+        self.round_number += 1
+        self.deck = new_shuffled_deck(self.rng)
+        # Deal from the first player of the round, so that a seed always gives the same hands (see replay)
+        draw_cards_to_players(self.turn_order(), self.deck)
+        self.pile = draw_card_to_pile(self.deck)
+        self.last_picked_card = None
+        self.eliminated_players = []
+        self.round_over = False
+        self.change_tracker.changed('table')
+
+    def can_end_round(self, player):
+        """
+        Returns:
+        - bool: True if the player is allowed to end the round.
+        """
+        return hand_value(player.hand_mask) <= self.number_to_end_round
+
+    def can_pass(self, player):
+        """
+        Returns:
+        - bool: True if the player is still allowed to pass its turn.
+        """
+        return player.number_of_pass < MAXIMUM_NUMBER_OF_PASS
+
+    def apply_move(self, move):
+        """
+        Apply the move of the current player and give the turn to the next player.
+
+        Parameters:
+        - move (Move): The decision of the current player.
+        """
+        self._apply_move(move)
+        self.change_tracker.changed('table')
+        if self.replay_log is not None:
+            self.replay_log.record(move)
+
+    def _apply_move(self, move):
+        """
+        Apply a move, raise IllegalMoveError if the rules do not allow it.
+        """
+        if self.round_over:
+            raise IllegalMoveError("The round is over, start a new round first")
+
+        player = self.current_player()
+
+        if move.end_round:
+            if not self.can_end_round(player):
+                raise IllegalMoveError(f"{player.name} cannot end the round with "
+                                       f"{hand_value(player.hand_mask)} in hand")
+            # Finish the round and update player status
+            score_round(self.players_list, player)
+            self.eliminated_players = eliminate_players(self.turn_order(), self.elimination_score_threshold)
+            for eliminated_player in self.eliminated_players:
+                self.turn_scheduler.remove(self.seats[eliminated_player.name])
+            self.round_over = True
+            return
+
+        if move.is_pass:
+            if not self.can_pass(player):
+                raise IllegalMoveError(f"{player.name} has already passed")
+            player.pass_turn()
+            self.turn_scheduler.advance()
+            return
+
+        cards_mask = mask_from_ids(move.cards_played)
+        if cards_mask & ~player.hand_mask or len(move.cards_played) != cards_mask.bit_count() \
+                or not is_valid_play(cards_mask):
+            raise IllegalMoveError(f"{player.name} cannot play {move}")
+
+        # Pick a card from the deck or from the pile, the pile card is the one under the cards played
+        if move.pick == PICK_DECK:
+            self.last_picked_card = self.deck.pop()
+        elif move.pick == PICK_PILE:
+            self.last_picked_card = self.pile.pop()
+        else:
+            raise IllegalMoveError(f"{player.name} must pick a card from the deck or the pile")
+
+        # Add the cards played to the top of the pile, and update the player's hand
+        self.pile.extend(move.cards_played)
+        player.hand_mask = (player.hand_mask & ~cards_mask) | (1 << self.last_picked_card)
+
+        # Move cards from pile to deck if the deck is empty and shuffle them, the top card stays on the pile
+        if not self.deck:
+            recycle_pile(self.deck, self.pile, self.rng)
+
+        self.turn_scheduler.advance()
+
+    def play_round(self, providers):
+        """
+        Play a full round, asking each move to the decision providers.
+
+        Parameters:
+        - providers: A DecisionProvider for all players, or a dict of DecisionProvider by player name.
+
+        Returns:
+        - Player: The player who ended the round.
+        """
+        self.start_round()
+        for provider in distinct_providers(providers):
+            provider.round_started(self)
+
+        while not self.round_over:
+            player = self.current_player()
+            move = provider_for(providers, player).choose_move(self, player)
+            self.apply_move(move)
+            for provider in distinct_providers(providers):
+                provider.move_applied(self, player, move)
+
+        for provider in distinct_providers(providers):
+            provider.round_finished(self, player)
+        return player
+
+    def play_game(self, providers):
+        """
+        Play rounds until all players except one are eliminated.
+
+        Parameters:
+        - providers: A DecisionProvider for all players, or a dict of DecisionProvider by player name.
+        """
+        while not self.is_game_over():
+            self.play_round(providers)
+
+        for provider in distinct_providers(providers):
+            provider.game_finished(self)
@@ -0,0 +1,234 @@
+import argparse
+import asyncio
+
+import socketio
+
+from bots import BOTS
+from card_encoding import NUMBER_OF_CARDS
+from end_round_oracle import load_end_round_table
+from game_engine import IllegalMoveError, Move, PICK_DECK, PICK_PILE
+from lobby import TableManager
+
+
+def move_from_data(data):
+    """
+    Build a Move from the data sent by a client:
+    {'cards': [card ids], 'pick': 'deck' or 'pile'}, {'pass': True} or {'end_round': True}.
+
+    Parameters:
+    - data (dict): The data of the 'move' event.
+
+    Returns:
+    - Move: The move.
+    """
+    if not isinstance(data, dict):
+        raise IllegalMoveError("A move must be a dict")
+    if data.get('end_round'):
+        return Move(end_round=True)
+    if data.get('pass'):
+        return Move(is_pass=True)
+    if data.get('pick') not in (PICK_DECK, PICK_PILE):
+        raise IllegalMoveError("pick must be 'deck' or 'pile'")
+    cards_played = data.get('cards', [])
+    if not isinstance(cards_played, list):
+        raise IllegalMoveError("cards must be a list of card ids")
+    # bool is an int, True would be the card 1
+    if not all(type(card_id) is int and 0 <= card_id < NUMBER_OF_CARDS for card_id in cards_played):
+        raise IllegalMoveError("Unknown card")
+    return Move(cards_played, pick=data['pick'])
+
+
+def text_from_data(data, key, default=None):
+    """
+    Read a text of the data sent by a client, raise ValueError if the data is not a dict or the text is missing.
+
+    Parameters:
+    - data (dict): The data of the event.
+    - key (str): The key of the text.
+    - default (str): The text if the key is missing, None if it is required.
+
+    Returns:
+    - str: The text.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("The data must be a dict")
+    value = data.get(key, default)
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"{key} must be a text")
+    return value
+
+
+class GameServer:
+    def __init__(self, sio=None, table_manager=None):
+        """
+        Initialize a GameServer object: an asyncio socket.io server hosting many tables.
+
+        The tables are run by a TableManager, each game is a coroutine waiting for the moves of its remote players,
+        so a table never blocks the other ones. Clients only send their moves and receive the changes of the state
+        ('state' events with the changed keys, 'hand' events with their own hand when it changes).
+
+        Parameters:
+        - sio (socketio.AsyncServer): The socket.io server, created if not given.
+        - table_manager (TableManager): The tables hosted, created if not given.
+        """
+        # Load the END ROUND table before the event loop runs, not when the first GreedyBot is seated
+        load_end_round_table()
+        self.sio = sio or socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*')
+        self.table_manager = table_manager or TableManager()
+        self.table_manager.listener = self.on_table_event
+        self.sessions = {}
+        self.sids = {}
+        self.eviction_task = None
+
+        for event in ('connect', 'disconnect', 'create_table', 'join_table', 'add_bot', 'start_game', 'move'):
+            self.sio.on(event, getattr(self, f'on_{event}'))
+
+    def asgi_app(self):
+        """
+        Returns:
+        - socketio.ASGIApp: The ASGI application serving the socket.io server.
+        """
+        return socketio.ASGIApp(self.sio)
+
+    async def on_connect(self, sid, environ, auth=None):
+        # Start the eviction of the idle tables with the first connection, once the event loop is running
+        if self.eviction_task is None:
+            self.eviction_task = asyncio.get_running_loop().create_task(self.table_manager.run_eviction())
+
+    async def on_disconnect(self, sid, reason=None):
+        session = self.sessions.pop(sid, None)
+        if session is not None:
+            self.sids.pop(session, None)
+
+    async def on_create_table(self, sid, data):
+        """
+        Create a table: {'number_of_players': n}. The answer gives the table_id to share with the other players.
+        """
+        if not isinstance(data, dict):
+            return {'error': "The data must be a dict"}
+        try:
+            table_id = text_from_data(data, 'table_id') if 'table_id' in data else None
+            table = self.table_manager.create_table(int(data.get('number_of_players', 2)), table_id)
+        except (TypeError, ValueError) as error:
+            return {'error': str(error)}
+        return {'table_id': table.table_id}
+
+    async def on_join_table(self, sid, data):
+        """
+        Take a seat at a table: {'table_id': ..., 'name': ...}.
+        """
+        try:
+            table_id, name = text_from_data(data, 'table_id'), text_from_data(data, 'name')
+        except ValueError as error:
+            return {'error': str(error)}
+        table = self.table_manager.get_table(table_id)
+        if table is None:
+            return {'error': "Unknown table"}
+        try:
+            table.add_player(name)
+        except ValueError as error:
+            return {'error': str(error)}
+        self.sessions[sid] = (table.table_id, name)
+        self.sids[(table.table_id, name)] = sid
+        await self.sio.enter_room(sid, table.table_id)
+        await self.sio.emit('players', [player.name for player in table.players_list], room=table.table_id)
+        return {'ok': True}
+
+    async def on_add_bot(self, sid, data):
+        """
+        Seat a bot at a table: {'table_id': ..., 'name': ..., 'bot': 'random'}.
+        """
+        try:
+            table_id, name = text_from_data(data, 'table_id'), text_from_data(data, 'name')
+            bot_name = text_from_data(data, 'bot', 'random')
+        except ValueError as error:
+            return {'error': str(error)}
+        table = self.table_manager.get_table(table_id)
+        if table is None:
+            return {'error': "Unknown table"}
+        if bot_name not in BOTS:
+            return {'error': f"Unknown bot {bot_name}"}
+        try:
+            table.add_player(name, bot=BOTS[bot_name]())
+        except ValueError as error:
+            return {'error': str(error)}
+        await self.sio.emit('players', [player.name for player in table.players_list], room=table.table_id)
+        return {'ok': True}
+
+    async def on_start_game(self, sid, data):
+        """
+        Start the game of a full table: {'table_id': ...}.
+        """
+        try:
+            table_id = text_from_data(data, 'table_id')
+        except ValueError as error:
+            return {'error': str(error)}
+        if self.table_manager.get_table(table_id) is None:
+            return {'error': "Unknown table"}
+        try:
+            self.table_manager.start_table(table_id)
+        except ValueError as error:
+            return {'error': str(error)}
+        return {'ok': True}
+
+    async def on_move(self, sid, data):
+        """
+        Play the move of the player of this session, see move_from_data.
+        """
+        if sid not in self.sessions:
+            return {'error': "You are not seated at a table"}
+        table_id, name = self.sessions[sid]
+        table = self.table_manager.get_table(table_id)
+        if table is None:
+            return {'error': "The table has been closed"}
+        try:
+            await table.submit_move(name, move_from_data(data))
+        except IllegalMoveError as error:
+            return {'error': str(error)}
+        return {'ok': True}
+
+    async def on_table_event(self, table, event, data):
+        """
+        Send an event of a table to its players.
+
+        Parameters:
+        - table (LobbyTable): The table.
+        - event (str): 'state', 'round_finished' or 'game_finished'.
+        - data (dict): The data of the event, None for 'state' which sends the state changes.
+        """
+        if event == 'state':
+            await self.broadcast(table)
+        else:
+            await self.sio.emit(event, data, room=table.table_id)
+
+    async def broadcast(self, table):
+        """
+        Send the state changes of a table to its players, and their hand to the players whose hand changed.
+
+        Parameters:
+        - table (LobbyTable): The table.
+        """
+        diff = table.public_diff()
+        if diff:
+            await self.sio.emit('state', diff, room=table.table_id)
+        for name, hand in table.hand_changes().items():
+            sid = self.sids.get((table.table_id, name))
+            if sid is not None:
+                await self.sio.emit('hand', hand, to=sid)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nine-Game multiplayer server.")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5000)
+    arguments = parser.parse_args()
+
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("The server needs an ASGI server: pip install uvicorn")
+    uvicorn.run(GameServer().asgi_app(), host=arguments.host, port=arguments.port)
+
+
+if __name__ == "__main__":
+    main()
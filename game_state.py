@@ -0,0 +1,195 @@
+import os
+from typing import Optional
+
+import msgspec
+
+from game_engine import GameEngine
+from player_class import Player
+from turn_scheduler import TurnScheduler
+
+
+GAME_STATE_FORMAT_VERSION = 3
+
+
+class PlayerState(msgspec.Struct, frozen=True, array_like=True):
+    """
+    The state of a player: its hand is a bitmask (see card_encoding), so the whole state is immutable.
+    """
+    name: str
+    hand_mask: int
+    score: int = 0
+    score_round: int = 0
+    number_of_pass: int = 0
+    is_eliminate: bool = False
+    ranking: int = 0
+    finish_round: bool = False
+
+
+class GameState(msgspec.Struct, frozen=True, array_like=True):
+    """
+    Everything needed to continue a game: the players in the order of their seats with the seat of the current
+    player, the deck and pile, the random generator of the shuffles, the house rules and the score history.
+
+    A GameState is immutable and only made of integers, strings and tuples, so taking a snapshot copies the
+    state of each player and the (at most 54) card ids, never any card object, and the snapshots can be shared.
+    """
+    version: int
+    seed: int
+    rng_state: tuple[int, tuple[int, ...], Optional[float]]
+    elimination_score_threshold: int
+    number_to_end_round: int
+    round_number: int
+    round_over: bool
+    players: tuple[PlayerState, ...]
+    # Seat of the current player in players
+    current_seat: int
+    # Seat of the round in the rotation of the players (see GameEngine.start_round)
+    round_start_seat: int
+    deck: tuple[int, ...]
+    pile: tuple[int, ...]
+    last_picked_card: Optional[int] = None
+    eliminated_players: tuple[str, ...] = ()
+    score_names: tuple[str, ...] = ()
+    score_rounds: tuple[tuple[int, tuple[Optional[int], ...]], ...] = ()
+
+
+class GameStateHeader(msgspec.Struct, frozen=True, array_like=True):
+    """
+    The first field of an encoded GameState, decoded alone to check the format before the whole snapshot.
+    """
+    version: int
+
+
+GAME_STATE_ENCODER = msgspec.msgpack.Encoder()
+GAME_STATE_DECODER = msgspec.msgpack.Decoder(GameState)
+GAME_STATE_HEADER_DECODER = msgspec.msgpack.Decoder(GameStateHeader)
+
+
+def check_game_state_version(version):
+    """
+    Raise ValueError if a snapshot was written in another format than GAME_STATE_FORMAT_VERSION.
+    """
+    if version != GAME_STATE_FORMAT_VERSION:
+        raise ValueError(f"Snapshot format {version} is not supported, only format {GAME_STATE_FORMAT_VERSION} "
+                         f"can be restored")
+
+
+def snapshot_game(engine, score_ledger=None):
+    """
+    Take a snapshot of a game.
+
+    Parameters:
+    - engine (GameEngine): The game.
+    - score_ledger (ScoreLedger): The score history displayed by the board, not saved if None.
+
+    Returns:
+    - GameState: The state of the game.
+    """
+    players = tuple(PlayerState(player.name, player.hand_mask, player.score, player.score_round,
+                                player.number_of_pass, player.is_eliminate, player.ranking, player.finish_round)
+                    for player in engine.players_list)
+    score_names = score_rounds = ()
+    if score_ledger is not None:
+        score_names = tuple(score_ledger.player_names)
+        score_rounds = tuple(score_ledger.rounds)
+    return GameState(GAME_STATE_FORMAT_VERSION, engine.seed, engine.rng.getstate(),
+                     engine.elimination_score_threshold, engine.number_to_end_round, engine.round_number,
+                     engine.round_over, players, engine.turn_scheduler.current_seat, engine.round_start_seat,
+                     tuple(engine.deck or ()),
+                     tuple(engine.pile or ()), engine.last_picked_card,
+                     tuple(player.name for player in engine.eliminated_players), score_names, score_rounds)
+
+
+def restore_game(state):
+    """
+    Create a game engine from a snapshot, with new Player objects. Raise ValueError if the snapshot has another
+    format.
+
+    Parameters:
+    - state (GameState): The snapshot.
+
+    Returns:
+    - GameEngine: The game, ready to continue.
+    """
+    check_game_state_version(state.version)
+    players_list = []
+    for player_state in state.players:
+        player = Player(player_state.name)
+        player.restore(player_state.hand_mask, player_state.score, player_state.score_round,
+                       player_state.number_of_pass, player_state.is_eliminate, player_state.ranking,
+                       player_state.finish_round)
+        players_list.append(player)
+
+    engine = GameEngine(players_list, state.elimination_score_threshold, state.number_to_end_round, seed=state.seed)
+    # The players keep their seats, the order of play continues from the current seat
+    engine.turn_scheduler = TurnScheduler([not player.is_eliminate for player in players_list], state.current_seat)
+    engine.round_start_seat = state.round_start_seat
+    engine.rng.setstate(state.rng_state)
+    engine.round_number = state.round_number
+    engine.round_over = state.round_over
+    if state.round_number > 0:
+        engine.deck = list(state.deck)
+        engine.pile = list(state.pile)
+    engine.last_picked_card = state.last_picked_card
+    engine.eliminated_players = [player for player in players_list if player.name in state.eliminated_players]
+    return engine
+
+
+def restore_score_ledger(state, score_ledger):
+    """
+    Load the score history of a snapshot in a ScoreLedger.
+
+    Parameters:
+    - state (GameState): The snapshot.
+    - score_ledger (ScoreLedger): The ledger to fill.
+    """
+    if state.score_names:
+        score_ledger.load_rounds(state.score_names, state.score_rounds)
+
+
+def clone_game(engine):
+    """
+    Returns:
+    - GameEngine: An independent copy of a game, for the bots which try moves before playing.
+    """
+    return restore_game(snapshot_game(engine))
+
+
+def encode_game_state(state):
+    """
+    Returns:
+    - bytes: The snapshot encoded with msgpack.
+    """
+    return GAME_STATE_ENCODER.encode(state)
+
+
+def decode_game_state(data):
+    """
+    Returns:
+    - GameState: The snapshot decoded from msgpack bytes, ValueError is raised if it has another format.
+    """
+    # The fields of another format may not decode, so check the version first
+    check_game_state_version(GAME_STATE_HEADER_DECODER.decode(data).version)
+    return GAME_STATE_DECODER.decode(data)
+
+
+def save_game_state(state, path):
+    """
+    Write a snapshot to a file. The file is replaced at once, so a crash while saving keeps the previous snapshot.
+
+    Parameters:
+    - state (GameState): The snapshot.
+    - path (str): Path of the save file.
+    """
+    temporary_path = f'{path}.tmp'
+    with open(temporary_path, 'wb') as state_file:
+        state_file.write(encode_game_state(state))
+    os.replace(temporary_path, path)
+
+
+def load_game_state(path):
+    """
+    Read a snapshot from a file.
+    """
+    with open(path, 'rb') as state_file:
+        return decode_game_state(state_file.read())
@@ -1,12 +1,15 @@
 import tkinter as tk
-from PIL import Image, ImageTk
 import player_class
+from card_images import card_image_cache, get_card_image, BACK_NAME, GAME_BOARD_NAME
 from tkinter import ttk
 import random
 from tabulate import tabulate
 import sys
 from tkinter import messagebox
 import locale
+from notifications import toast_layer
+from board_layout import calculate_card_positions
+from change_tracker import versions_of
 
 
 
@@ -14,6 +17,10 @@ NUMBER_TO_END_ROUND = 9
 
 ELIMINATION_SCORE_THRESHOLD = 150
 
+WRONG_CARDS_MESSAGE = ("ERROR: You cannot play those cards, you can play cards with same values, "
+                       "or suits with at least 3 cards.")
+NO_CARD_PLAYED_MESSAGE = "You must play a card before picking a card from the deck or pile"
+
 
 def close_window(root):
     """
@@ -43,16 +50,13 @@ def display_button_pile(card_images_tk, pile, root, pile_chose, display_type, im
     """
 
     card_pile = pile.cards[int(len(pile.cards)) - 1]
-    card_image_path = f"./images/{card_pile}.png"
-    card_image = Image.open(card_image_path)
-    card_image = card_image.resize((100, 125))
     center_x = image_width // 2
     center_y = image_height // 2
     y_decalage = 100
     x_decalage = 80
 
-    # Convert the card image to a Tkinter PhotoImage and store the reference
-    card_image_tk = ImageTk.PhotoImage(card_image)
+    # Get the shared Tkinter PhotoImage of the card and store the reference
+    card_image_tk = get_card_image(str(card_pile), root)
     card_images_tk.append(card_image_tk)
 
     if display_type == 'temp':
@@ -96,16 +100,16 @@ def click_to_pick_pile(root, pile_chose, card_pile, minimum_cards_to_make_list,
             pile_chose.append(card_pile)
         else:
             # Display an error message if no cards are played
-            display_no_card_played_message(image_width, image_height)
+            display_no_card_played_message(root)
     else:
         # Minimum cards condition is not met
 
         if len(cards_played) == 0:
             # Display an error message if no cards are played
-            display_no_card_played_message(image_width, image_height)
+            display_no_card_played_message(root)
         else:
             # Display an error message if the wrong card combination is played
-            display_wrong_card_message(image_width, image_height)
+            display_wrong_card_message(root)
 
 
 def display_button_deck(card_images_tk, deck, root, deck_chose, display_type, image_width, image_height,
@@ -126,15 +130,12 @@ def display_button_deck(card_images_tk, deck, root, deck_chose, display_type, im
     """
 
     card_deck = deck.cards[int(len(deck.cards) - 1)]
-    card_image_path = f"./images/Back.png"
-    card_image = Image.open(card_image_path)
-    card_image = card_image.resize((100, 125))
     center_x = image_width // 2
     center_y = image_height // 2
     y_decalage = 100
     x_decalage = 40
 
-    card_image_tk = ImageTk.PhotoImage(card_image)
+    card_image_tk = get_card_image(BACK_NAME, root)
     card_images_tk.append(card_image_tk)
 
     if display_type == 'temp':
@@ -179,29 +180,28 @@ def click_to_pick_deck(root, deck_chose, card_deck, minimum_cards_to_make_list,
             deck_chose.append(card_deck)
         else:
             # Display an error message if no cards are played
-            display_no_card_played_message(image_width, image_height)
+            display_no_card_played_message(root)
     else:
         # Minimum cards condition is not met
 
         if len(cards_played) == 0:
             # Display an error message if no cards are played
-            display_no_card_played_message(image_width, image_height)
+            display_no_card_played_message(root)
         else:
             # Display an error message if the wrong card combination is played
-            display_wrong_card_message(image_width, image_height)
+            display_wrong_card_message(root)
 
 
-def display_finish_button(root, player, players_list, display_type, left_panel, round_number):
+def display_finish_button(root, player, display_type, left_panel, player_finish):
     """
     Displays a "FINISH" button for a player if they have fewer cards than a specified minimum.
 
     Parameters:
     - root: The Tkinter root window.
     - player: The current player.
-    - players_list: List of players in the game.
     - display_type: Type of display ('normal' for regular display).
     - left_panel: Tkinter frame where the button is displayed.
-    - round_number: Current round number.
+    - player_finish: List to store information about the player ending the round.
     """
 
     style = ttk.Style()
@@ -213,30 +213,26 @@ def display_finish_button(root, player, players_list, display_type, left_panel,
         if display_type == 'normal':
             # Display the "FINISH" button
             button_finish = ttk.Button(left_panel, text="END ROUND",
-                                       command=lambda: click_to_finish(player, players_list, root, round_number),
+                                       command=lambda: click_to_finish(root, player_finish),
                                        style='TButton')
             button_finish.pack(pady=10)
 
 
-def click_to_finish(player, players_list, root, round_number):
+def click_to_finish(root, player_finish):
     """
     Handles the logic when a player clicks to finish their turn.
+    The scores are updated by the game engine once the window is closed.
 
     Parameters:
-    - player: The current player.
-    - players_list: List of players in the game.
     - root: The Tkinter root window.
-    - round_number: Current round number.
+    - player_finish: List to store information about the player ending the round.
     """
 
     # Close the current window
     close_window(root)
 
-    # Finish the player's round and update the scores
-    player_class.Player.finish_round(player, players_list)
-
-    # Display the end-of-round scores
-    display_end_of_round_window(players_list, round_number)
+    # Append finish information to the list
+    player_finish.append(True)
 
 
 def display_pass_button(root, player, display_type, player_pass, left_panel):
@@ -279,12 +275,9 @@ def click_to_pass(player, root, player_pass, text):
     # Close the current window
     close_window(root)
 
-    # Append pass information to the list
+    # Append pass information to the list, the game engine updates the player's pass count
     player_pass.append(text)
 
-    # Update player's pass count
-    player_class.Player.pass_turn(player)
-
 
 def display_score_button(root, left_panel, message):
     """
@@ -365,28 +358,20 @@ def display_players_score_left_panel(players_list, left_panel):
     - left_panel: Tkinter frame where the table is displayed.
     """
 
-    # Create a table with player names and scores
-    table = []
-    for player in players_list:
-        player_table = [player.name, player.score]
-        table.append(player_table)
-
-    # Sort the table based on scores in descending order
-    sorted_table = sorted(table, key=lambda x: x[1], reverse=True)
-    col_names = ["Player", "Score"]
-
     # Display the table in the left panel
-    label = ttk.Label(left_panel, text=tabulate(sorted_table, headers=col_names), justify='left', font=('Arial', 13))
+    label = ttk.Label(left_panel, text=table_players_score_end_of_round_and_game(players_list), justify='left',
+                      font=('Arial', 13))
     label.pack(side='bottom', pady=100)
 
 
-def display_end_of_round_window(players_list, round_number):
+def display_end_of_round_window(players_list, round_number, eliminated_players=()):
     """
     Displays a window at the end of the round showing scores and relevant information.
 
     Parameters:
-    - players_list: List of players in the game.
+    - players_list: List of players in the game, the one who ended the round first.
     - round_number: Current round number.
+    - eliminated_players: Players eliminated at the end of this round.
     """
 
     # Create the Tkinter root window
@@ -397,6 +382,23 @@ def display_end_of_round_window(players_list, round_number):
     frame = ttk.Frame(root)
     frame.pack()
 
+    display_end_of_round_frame(frame, players_list, round_number, eliminated_players)
+
+    # Start the main loop to display the window
+    root.mainloop()
+
+
+def display_end_of_round_frame(frame, players_list, round_number, eliminated_players=()):
+    """
+    Fills a frame with the end of round information: hands of the players, eliminations and scores.
+
+    Parameters:
+    - frame: Tkinter frame where the information is displayed.
+    - players_list: List of players in the game, the one who ended the round first.
+    - round_number: Current round number.
+    - eliminated_players: Players eliminated at the end of this round.
+    """
+
     # Create a label for displaying the round number
     message = ttk.Label(frame, text=f"END OF ROUND {round_number}\n")
     message.pack(pady=10)
@@ -407,15 +409,14 @@ def display_end_of_round_window(players_list, round_number):
 
     # Display information about each player's hand
     for player in players_list:
-        if not player.is_eliminate:
-            player.count_hand()
+        if not player.is_eliminate or player in eliminated_players:
             text = f'{player.name} has {player.count_hand()}'
             additional_text = ttk.Label(frame, text=text)
             additional_text.pack()
 
     # Display elimination information for players with scores above the threshold
     for each_player in players_list:
-        if each_player.score >= ELIMINATION_SCORE_THRESHOLD and not each_player.is_eliminate:
+        if each_player in eliminated_players:
             text = f'{each_player.name} has {each_player.score} and is eliminated'
             additional_text = ttk.Label(frame, text=text)
             additional_text.pack()
@@ -425,9 +426,6 @@ def display_end_of_round_window(players_list, round_number):
     table_label = ttk.Label(frame, text=table)
     table_label.pack()
 
-    # Start the main loop to display the window
-    root.mainloop()
-
 
 def display_end_of_game_window(players_list):
     """
@@ -445,6 +443,21 @@ def display_end_of_game_window(players_list):
     frame = ttk.Frame(root)
     frame.pack()
 
+    display_end_of_game_frame(frame, players_list)
+
+    # Start the main loop to display the window
+    root.mainloop()
+
+
+def display_end_of_game_frame(frame, players_list):
+    """
+    Fills a frame with the final player scores and rankings.
+
+    Parameters:
+    - frame: Tkinter frame where the information is displayed.
+    - players_list: List of players in the game.
+    """
+
     # Create a label for displaying the end-of-game message
     message = ttk.Label(frame, text="END OF GAME: Player Scores")
     message.pack(pady=10)
@@ -470,13 +483,28 @@ def display_end_of_game_window(players_list):
 
         additional_text.pack()
 
-    # Start the main loop to display the window
-    root.mainloop()
-
 
 def table_players_score_end_of_round_and_game(players_list):
     """
-    Creates and formats a table of player names and scores.
+    Creates and formats a table of player names and scores. The table is formatted again only when a score has
+    changed since the last call with the same players (see change_tracker).
+
+    Parameters:
+    - players_list: List of players in the game.
+
+    Returns:
+    A formatted table of player names and scores.
+    """
+    if not players_list:
+        return tabulate([], headers=["Player", "Score"])
+    return players_list[0].tracker.memoize(('score_table', tuple(player.name for player in players_list)),
+                                           versions_of(players_list, 'score'),
+                                           lambda: format_players_score_table(players_list))
+
+
+def format_players_score_table(players_list):
+    """
+    Formats the table of player names and scores, sorted by score.
 
     Parameters:
     - players_list: List of players in the game.
@@ -534,45 +562,8 @@ def display_button_to_switch_players(root, display_type):
         root.bind("<Button-1>", lambda event: button.invoke())
 
 
-def calculate_card_positions(num_players, img_width, img_height):
-    """
-    Calculate the initial positions for players' cards based on the number of players.
-
-    Parameters:
-    - num_players: Number of players in the game.
-    - img_width: Width of the board game image.
-    - img_height: Height of the board game image.
-
-    Returns:
-    A list of tuples representing the initial positions for players' cards.
-    """
-    decalage = 40  # Adjustment for spacing between positions
-
-    if num_players == 2:
-        return [(img_width // 2, img_height // 4), (img_width // 2, 3 * img_height // 4)]
-    elif num_players == 3:
-        return [(img_width // 2, img_height // 4), (img_width // 4, (img_height // 2) + 180),
-                (3 * img_width // 4, (img_height // 2) + 180)]
-    elif num_players == 4:
-        return [(img_width // 4, img_height // 4), (3 * img_width // 4, img_height // 4),
-                (img_width // 4, 3 * img_height // 4), (3 * img_width // 4, 3 * img_height // 4)]
-    elif num_players == 5:
-        return [(img_width // 2, img_height // 4 - decalage),
-                (3 * img_width // 4, img_height // 2 - decalage),
-                (img_width // 4, 3 * img_height // 4 - decalage),
-                (3 * img_width // 4, 3 * img_height // 4 - decalage),
-                (img_width // 4, (img_height // 2) - decalage)]
-    elif num_players == 6:
-        return [(img_width // 4, img_height // 4), (img_width // 2, img_height // 4),
-                (3 * img_width // 4, img_height // 4),
-                (img_width // 4, 3 * img_height // 4), (img_width // 2, 3 * img_height // 4),
-                (3 * img_width // 4, 3 * img_height // 4)]
-    else:
-        return []
-
-
 def display_player_environment(root, player, position, card_images_tk, players_list, cards_played, display_type,
-                               player_pass, left_panel, index_player, round_number, pile_chose, deck_chose,
+                               player_pass, player_finish, left_panel, index_player, pile_chose, deck_chose,
                                cards_played_for_check_multiple_cards, minimum_cards_to_make_list, image_width,
                                image_height):
     """
@@ -587,9 +578,9 @@ def display_player_environment(root, player, position, card_images_tk, players_l
     - cards_played: List of cards played in the current round.
     - display_type: Type of display mode ('temp' for temporary).
     - player_pass: List to track player pass actions.
+    - player_finish: List to track player end of round actions.
     - left_panel: Tkinter frame for displaying player-related information.
     - index_player: Index of the current player in the players_list.
-    - round_number: Current round number.
     - pile_chose: List to track pile choices.
     - deck_chose: List to track deck choices.
     - cards_played_for_check_multiple_cards: List to track played cards for checking multiple cards.
@@ -602,13 +593,8 @@ def display_player_environment(root, player, position, card_images_tk, players_l
     for index, card in enumerate(player.hand):
         # We show the cards in visible side for the player which plays (index = 0)
         if index_player == 0:
-            # Load card image
-            card_image_path = f"./images/{card}.png"
-            card_image = Image.open(card_image_path)
-            card_image = card_image.resize((100, 125))
-
-            # Convert the card image to a Tkinter PhotoImage and store the reference
-            card_image_tk = ImageTk.PhotoImage(card_image)
+            # Get the shared Tkinter PhotoImage of the card and store the reference
+            card_image_tk = get_card_image(str(card), root)
             card_images_tk.append(card_image_tk)
             # We display the first card of the hand and the buttons finish and pass only one time (for the first card
             # of the hand)
@@ -616,7 +602,7 @@ def display_player_environment(root, player, position, card_images_tk, players_l
                 x = display_player_cards(root, card_image_tk, card, x, y, cards_played, display_type, pile_chose,
                                          deck_chose, cards_played_for_check_multiple_cards, minimum_cards_to_make_list,
                                          image_width, image_height, player)
-                display_finish_button(root, player, players_list, display_type, left_panel, round_number)
+                display_finish_button(root, player, display_type, left_panel, player_finish)
                 display_pass_button(root, player, display_type, player_pass, left_panel)
 
                 display_player_name_adapt_to_number_of_cards(root, player, x, y)
@@ -629,13 +615,8 @@ def display_player_environment(root, player, position, card_images_tk, players_l
         else:
             # We show the cards in hidden side for the other players
             if counter == 1:
-                # Load card image
-                card_image_path = f"./images/back.png"
-                card_image = Image.open(card_image_path)
-                card_image = card_image.resize((100, 125))
-
-                # Convert the card image to a Tkinter PhotoImage and store the reference
-                card_image_tk = ImageTk.PhotoImage(card_image)
+                # Get the shared Tkinter PhotoImage of the back of the cards
+                card_image_tk = get_card_image(BACK_NAME, root)
                 card_images_tk.append(card_image_tk)
                 display_type = 'temp'
                 x = display_player_cards(root, card_image_tk, card, x, y, cards_played, display_type, pile_chose,
@@ -647,13 +628,8 @@ def display_player_environment(root, player, position, card_images_tk, players_l
                 counter += 1
 
             else:
-                # Load card image
-                card_image_path = f"./images/back.png"
-                card_image = Image.open(card_image_path)
-                card_image = card_image.resize((100, 125))
-
-                # Convert the card image to a Tkinter PhotoImage and store the reference
-                card_image_tk = ImageTk.PhotoImage(card_image)
+                # Get the shared Tkinter PhotoImage of the back of the cards
+                card_image_tk = get_card_image(BACK_NAME, root)
                 card_images_tk.append(card_image_tk)
                 display_type = 'temp'
                 x = display_player_cards(root, card_image_tk, card, x, y, cards_played, display_type, pile_chose,
@@ -875,7 +851,7 @@ def click_to_play_cards(card, cards_played, button_card, clicked_flag,
                     # Invalid sequence, display error message
                     cards_played.pop(-1)
                     cards_played_for_check_multiple_cards.pop(-1)
-                    display_wrong_card_message(image_width, image_height)
+                    display_wrong_card_message(button_card)
                     if len(cards_played) == 1:
                         minimum_cards_to_make_list[0] = True
                     else:
@@ -894,7 +870,7 @@ def click_to_play_cards(card, cards_played, button_card, clicked_flag,
                     # Invalid sequence, display error message
                     cards_played.pop(-1)
                     cards_played_for_check_multiple_cards.pop(-1)
-                    display_wrong_card_message(image_width, image_height)
+                    display_wrong_card_message(button_card)
                     minimum_cards_to_make_list[0] = assign_minimum_cards_to_make_list_for_playing_card(cards_played,
                                                                                                        cards_played_for_check_multiple_cards,
                                                                                                        minimum_cards_to_make_list,
@@ -903,7 +879,7 @@ def click_to_play_cards(card, cards_played, button_card, clicked_flag,
                 # Invalid combination, display error message
                 cards_played.pop(-1)
                 cards_played_for_check_multiple_cards.pop(-1)
-                display_wrong_card_message(image_width, image_height)
+                display_wrong_card_message(button_card)
                 minimum_cards_to_make_list[0] = assign_minimum_cards_to_make_list_for_playing_card(cards_played,
                                                                                                    cards_played_for_check_multiple_cards,
                                                                                                    minimum_cards_to_make_list,
@@ -931,7 +907,7 @@ def click_to_play_cards(card, cards_played, button_card, clicked_flag,
                                                                                             cards_played_for_check_multiple_cards,
                                                                                             minimum_cards_to_make_list,
                                                                                             new_ranks_for_suit,
-                                                                                            image_width, image_height)
+                                                                                            button_card)
 
 
 def assign_minimum_cards_to_make_list_for_playing_card(cards_played, cards_played_for_check_multiple_cards,
@@ -986,8 +962,7 @@ def assign_minimum_cards_to_make_list_for_playing_card(cards_played, cards_playe
 
 
 def assign_minimum_cards_to_make_list_for_removing_card(cards_played, cards_played_for_check_multiple_cards,
-                                                        minimum_cards_to_make_list, new_ranks_for_suit, image_width,
-                                                        image_height):
+                                                        minimum_cards_to_make_list, new_ranks_for_suit, widget):
     """
     Determines the minimum number of cards required to form a valid play when removing a card.
 
@@ -996,8 +971,7 @@ def assign_minimum_cards_to_make_list_for_removing_card(cards_played, cards_play
     - cards_played_for_check_multiple_cards: List of cards played, used for checking multiple card plays.
     - minimum_cards_to_make_list: A list containing a single boolean flag indicating the minimum cards to form a list.
     - new_ranks_for_suit: Dictionary mapping card ranks to numerical values for comparison.
-    - image_width: Width of the board game image.
-    - image_height: Height of the board game image.
+    - widget: Any widget of the board window, where the error message is shown.
 
     Returns:
     - bool: The updated value of the minimum_cards_to_make_list flag.
@@ -1034,7 +1008,7 @@ def assign_minimum_cards_to_make_list_for_removing_card(cards_played, cards_play
                 return minimum_cards_to_make_list[0]
         else:
             # Invalid combination, display error message
-            display_wrong_card_message(image_width, image_height)
+            display_wrong_card_message(widget)
     elif len(cards_played) == 1:
         # One card left after removal
         minimum_cards_to_make_list[0] = True
@@ -1045,69 +1019,32 @@ def assign_minimum_cards_to_make_list_for_removing_card(cards_played, cards_play
         return minimum_cards_to_make_list[0]
 
 
-def display_wrong_card_message(image_width, image_height):
+def display_wrong_card_message(widget):
     """
-    Display a Tkinter window with an error message indicating that the played cards are invalid.
+    Display a message over the board indicating that the played cards are invalid. The message is shown in the
+    window of the board and hides itself, no window is opened.
 
     Parameters:
-    - image_width: Width of the board game image.
-    - image_height: Height of the board game image.
+    - widget: Any widget of the board window.
 
     Returns:
     None.
     """
-    root = tk.Tk()
-    root.title("WRONG CARDS PLAYED ERROR")
+    toast_layer(widget).show(WRONG_CARDS_MESSAGE)
 
-    # Create a frame to hold the table
-    frame = ttk.Frame(root)
-    frame.pack()
-
-    # Create a label or any other widget for displaying a message if needed
-    message = ttk.Label(frame, text="ERROR: You cannot play those cards, you can play cards with same values, "
-                                    "or suits with at least 3 cards.")
-    message.pack(pady=10)
-
-    x = (image_width - root.winfo_reqwidth()) / 2
-    y = (image_height - root.winfo_reqheight()) / 2
 
-    # Set the window position
-    root.geometry("+%d+%d" % (x - 40, y))
-    # Start the main loop to display the window
-    root.mainloop()
-
-
-def display_no_card_played_message(image_width, image_height):
+def display_no_card_played_message(widget):
     """
-    Display a Tkinter window with an error message indicating that no card has been played before attempting
-    to pick a card from the deck or pile.
+    Display a message over the board indicating that no card has been played before attempting to pick a card from
+    the deck or pile. The message is shown in the window of the board and hides itself, no window is opened.
 
     Parameters:
-    - image_width: Width of the board game image.
-    - image_height: Height of the board game image.
+    - widget: Any widget of the board window.
 
     Returns:
     None.
     """
-    root = tk.Tk()
-    root.title("NO CARDS PLAYED ERROR")
-
-    # Create a frame to hold the table
-    frame = ttk.Frame(root)
-    frame.pack()
-
-    # Create a label or any other widget for displaying a message if needed
-    message = ttk.Label(frame, text="You must play a card before picking a card from the deck or pile")
-    message.pack(pady=10)
-
-    x = (image_width - root.winfo_reqwidth()) / 2
-    y = (image_height - root.winfo_reqheight()) / 2
-
-    # Set the window position
-    root.geometry("+%d+%d" % (x + 50, y))
-
-    # Start the main loop to display the window
-    root.mainloop()
+    toast_layer(widget).show(NO_CARD_PLAYED_MESSAGE)
 
 
 def display_game_board(players_list, pile, deck, round_number, display_type, pile_chose, deck_chose,
@@ -1126,11 +1063,13 @@ def display_game_board(players_list, pile, deck, round_number, display_type, pil
     - message_for_score_button: Message to display on the score button.
 
     Returns:
-    Tuple containing lists of cards played, chosen pile cards, chosen deck cards, and player pass status.
+    Tuple containing lists of cards played, chosen pile cards, chosen deck cards, player pass status and player
+    end of round status.
     """
     cards_played = []
     cards_played_for_check_multiple_cards = []
     player_pass = []
+    player_finish = []
     minimum_cards_to_make_list = [True]
 
     # setup board game
@@ -1140,9 +1079,8 @@ def display_game_board(players_list, pile, deck, round_number, display_type, pil
     left_panel = tk.Frame(root, width=200, height=500, bg="lightgray")  # Adjust dimensions as needed
     left_panel.pack(side="left", fill="y")
 
-    # Load the game board image
-    game_board_path = "./images/Game_Board_Image.png"  # Replace with the actual path to your game board image
-    game_board_image = Image.open(game_board_path)
+    # Load the game board image, decoded only once for the whole game
+    game_board_image = card_image_cache.image(GAME_BOARD_NAME)
 
     # Create a list to store PhotoImage objects
     card_images_tk = []
@@ -1153,7 +1091,7 @@ def display_game_board(players_list, pile, deck, round_number, display_type, pil
                                               image_width, image_height)
 
     # Convert the final image to a Tkinter PhotoImage
-    game_board_image_tk = ImageTk.PhotoImage(game_board_image)
+    game_board_image_tk = get_card_image(GAME_BOARD_NAME, root)
 
     # Display the final image
     game_board_label = tk.Label(root, image=game_board_image_tk)
@@ -1166,7 +1104,7 @@ def display_game_board(players_list, pile, deck, round_number, display_type, pil
     for index_player, player in enumerate([player for player in players_list if not player.is_eliminate]):
         position = card_positions[index_player]
         display_player_environment(root, player, position, card_images_tk, players_list, cards_played,
-                                   display_type, player_pass, left_panel, index_player, round_number, pile_chose,
+                                   display_type, player_pass, player_finish, left_panel, index_player, pile_chose,
                                    deck_chose, cards_played_for_check_multiple_cards, minimum_cards_to_make_list,
                                    image_width, image_height)
 
@@ -1188,4 +1126,4 @@ def display_game_board(players_list, pile, deck, round_number, display_type, pil
     if len(player_pass) == 0:
         player_pass.append('False')
 
-    return cards_played, pile_chose, deck_chose, player_pass
+    return cards_played, pile_chose, deck_chose, player_pass, player_finish
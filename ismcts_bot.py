@@ -0,0 +1,326 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from card_encoding import FULL_DECK_MASK, VALUE_FOR_COUNT_HAND, hand_value, ids_from_mask, mask_from_ids
+from game_engine import DecisionProvider, Move, PICK_DECK, PICK_PILE
+from game_state import restore_game, snapshot_game
+from legal_plays import legal_plays
+
+
+# Time spent searching for each move, below the 200 ms a human accepts to wait for a computer player
+DEFAULT_TIME_BUDGET = 0.12
+# Time kept for sending the searches to the worker processes and merging their trees
+WORKER_TIME_MARGIN = 0.02
+EXPLORATION = 0.7
+# Points of a round corresponding to a reward of 1
+REWARD_SCALE = 50
+MAXIMUM_ROLLOUT_MOVES = 200
+# In the rollouts, a player ends the round as soon as its hand is lower or equal to this value
+ROLLOUT_END_ROUND_VALUE = 4
+ROLLOUT_END_ROUND_PROBABILITY = 0.5
+# In the rollouts, a player picks the pile card if its value is lower or equal to this value
+ROLLOUT_PILE_PICK_VALUE = 3
+ROLLOUT_RANDOM_PLAY_PROBABILITY = 0.2
+
+END_ROUND_ACTION = 'end_round'
+PASS_ACTION = 'pass'
+
+
+def legal_actions(engine):
+    """
+    Return the actions allowed to the current player: END ROUND, PASS, and every legal play with both picks.
+
+    Parameters:
+    - engine (GameEngine): The game.
+
+    Returns:
+    - list: The actions, END_ROUND_ACTION, PASS_ACTION or (bitmask of the cards played, pick).
+    """
+    player = engine.current_player()
+    actions = []
+    if engine.can_end_round(player):
+        actions.append(END_ROUND_ACTION)
+    if engine.can_pass(player):
+        actions.append(PASS_ACTION)
+    for play in legal_plays(player.hand_mask):
+        actions.append((play, PICK_DECK))
+        actions.append((play, PICK_PILE))
+    return actions
+
+
+def move_from_action(action):
+    """
+    Returns:
+    - Move: The move of an action returned by legal_actions.
+    """
+    if action == END_ROUND_ACTION:
+        return Move(end_round=True)
+    if action == PASS_ACTION:
+        return Move(is_pass=True)
+    play, pick = action
+    return Move(ids_from_mask(play), pick=pick)
+
+
+def determinize(engine, observer_name, known_cards, rng):
+    """
+    Replace what the observer cannot see by a random guess consistent with what it knows: the cards of the
+    opponents which are not known, the order of the deck and the shuffles of the pile when it is recycled. The
+    known cards are the observer's hand, the cards of the pile and the cards the opponents picked from the pile.
+
+    Parameters:
+    - engine (GameEngine): A copy of the game, modified in place.
+    - observer_name (str): Name of the player of the bot.
+    - known_cards (dict): Bitmask of the cards known to be in each player's hand, by name.
+    - rng (random.Random): The random generator.
+    """
+    hidden_mask = FULL_DECK_MASK & ~mask_from_ids(engine.pile)
+    known_masks = {}
+    for player in engine.players_list:
+        if player.name == observer_name:
+            known_masks[player.name] = player.hand_mask
+        else:
+            known_masks[player.name] = known_cards.get(player.name, 0) & hidden_mask
+        hidden_mask &= ~known_masks[player.name]
+
+    hidden_cards = ids_from_mask(hidden_mask)
+    rng.shuffle(hidden_cards)
+    for player in engine.players_list:
+        if player.name != observer_name and player.hand_mask:
+            number_of_hidden_cards = player.hand_mask.bit_count() - known_masks[player.name].bit_count()
+            player.hand_mask = known_masks[player.name] | mask_from_ids(hidden_cards[:number_of_hidden_cards])
+            del hidden_cards[:number_of_hidden_cards]
+    engine.deck = hidden_cards
+    # The engine restored from the snapshot has the random generator of the real game, which would reveal its
+    # future shuffles
+    engine.rng.seed(rng.getrandbits(64))
+
+
+def rollout_move(engine, player, rng):
+    """
+    Return the move of a player in a rollout: a fast policy which ends the round with a low hand, plays the cards
+    removing the most points and picks the pile card when it is low.
+
+    Parameters:
+    - engine (GameEngine): The game.
+    - player (Player): The current player.
+    - rng (random.Random): The random generator.
+
+    Returns:
+    - Move: The move.
+    """
+    value = hand_value(player.hand_mask)
+    if value <= engine.number_to_end_round and (value <= ROLLOUT_END_ROUND_VALUE
+                                                or rng.random() < ROLLOUT_END_ROUND_PROBABILITY):
+        return Move(end_round=True)
+    plays = legal_plays(player.hand_mask)
+    if rng.random() < ROLLOUT_RANDOM_PLAY_PROBABILITY:
+        play = rng.choice(plays)
+    else:
+        play = max(plays, key=hand_value)
+    pick = PICK_PILE if VALUE_FOR_COUNT_HAND[engine.pile[-1]] <= ROLLOUT_PILE_PICK_VALUE else PICK_DECK
+    return Move(ids_from_mask(play), pick=pick)
+
+
+class Node:
+    def __init__(self, parent=None, action=None, player_name=None):
+        """
+        Initialize a Node object of the search tree, the information set reached by an action.
+
+        Parameters:
+        - parent (Node): The parent node.
+        - action: The action leading to this node.
+        - player_name (str): Name of the player who chose the action.
+        """
+        self.parent = parent
+        self.action = action
+        self.player_name = player_name
+        self.children = {}
+        self.visits = 0
+        # Number of times the action was allowed when the parent was visited
+        self.availability = 0
+        self.total_reward = 0.0
+
+    def upper_confidence_bound(self):
+        return (self.total_reward / self.visits
+                + EXPLORATION * math.sqrt(math.log(self.availability) / self.visits))
+
+
+def search(state, observer_name, known_cards, time_budget=DEFAULT_TIME_BUDGET, max_iterations=None, seed=None):
+    """
+    Run an information set Monte Carlo tree search (single observer) until the end of the round: each iteration
+    plays a new determinization of the hidden cards, so the tree only depends on what the observer knows.
+
+    Parameters:
+    - state (GameState): Snapshot of the game, the observer has to play.
+    - observer_name (str): Name of the player of the bot.
+    - known_cards (dict): Bitmask of the cards known to be in each player's hand, by name.
+    - time_budget (float): Number of seconds of search.
+    - max_iterations (int): Maximum number of iterations, no maximum if None.
+    - seed: Seed of the random generator of the search.
+
+    Returns:
+    - dict: (visits, total reward) of each action of the observer.
+    """
+    rng = random.Random(seed)
+    root = Node()
+    deadline = time.perf_counter() + time_budget
+    iteration = 0
+    while time.perf_counter() < deadline and (max_iterations is None or iteration < max_iterations):
+        iteration += 1
+        engine = restore_game(state)
+        determinize(engine, observer_name, known_cards, rng)
+        scores_before = {player.name: player.score for player in engine.players_list}
+
+        # Selection, among the actions allowed in this determinization
+        node = root
+        untried_actions = []
+        while not engine.round_over:
+            actions = legal_actions(engine)
+            untried_actions = [action for action in actions if action not in node.children]
+            if untried_actions:
+                break
+            for action in actions:
+                node.children[action].availability += 1
+            node = max((node.children[action] for action in actions), key=Node.upper_confidence_bound)
+            engine.apply_move(move_from_action(node.action))
+
+        # Expansion
+        if not engine.round_over:
+            for action in actions:
+                if action in node.children:
+                    node.children[action].availability += 1
+            action = rng.choice(untried_actions)
+            child = Node(node, action, engine.current_player().name)
+            child.availability = 1
+            node.children[action] = child
+            engine.apply_move(move_from_action(action))
+            node = child
+
+        # Simulation until the end of the round
+        number_of_moves = 0
+        while not engine.round_over and number_of_moves < MAXIMUM_ROLLOUT_MOVES:
+            player = engine.current_player()
+            engine.apply_move(rollout_move(engine, player, rng))
+            number_of_moves += 1
+        if engine.round_over:
+            rewards = {player.name: (scores_before[player.name] - player.score) / REWARD_SCALE
+                       for player in engine.players_list}
+        else:
+            rewards = {player.name: -hand_value(player.hand_mask) / REWARD_SCALE for player in engine.players_list}
+
+        # Backpropagation, each node gets the reward of the player who chose its action
+        while node is not root:
+            node.visits += 1
+            node.total_reward += rewards[node.player_name]
+            node = node.parent
+        root.visits += 1
+
+    return {action: (child.visits, child.total_reward) for action, child in root.children.items()}
+
+
+def search_worker(arguments):
+    """
+    Run a search in a worker process.
+
+    Parameters:
+    - arguments (tuple): The arguments of search.
+
+    Returns:
+    - dict: The statistics of the actions of the observer.
+    """
+    return search(*arguments)
+
+
+def merge_statistics(statistics_list):
+    """
+    Merge the root statistics of independent searches.
+
+    Parameters:
+    - statistics_list (list): The results of search.
+
+    Returns:
+    - dict: (visits, total reward) of each action, summed over the searches.
+    """
+    merged = {}
+    for statistics in statistics_list:
+        for action, (visits, total_reward) in statistics.items():
+            merged_visits, merged_reward = merged.get(action, (0, 0.0))
+            merged[action] = (merged_visits + visits, merged_reward + total_reward)
+    return merged
+
+
+class ISMCTSBot(DecisionProvider):
+    def __init__(self, seed=None, time_budget=DEFAULT_TIME_BUDGET, processes=1, max_iterations=None):
+        """
+        Initialize an ISMCTSBot object: a computer player which searches its moves with information set Monte Carlo
+        tree search, guessing the hidden cards from the pile and the cards the opponents picked from it.
+
+        Parameters:
+        - seed: Seed of the random generator of the bot.
+        - time_budget (float): Number of seconds of search for each move.
+        - processes (int): Number of independent searches run in parallel, their trees are merged.
+        - max_iterations (int): Maximum number of iterations of each search (for reproducible games), None for
+          no maximum.
+        """
+        self.rng = random.Random(seed)
+        self.time_budget = time_budget
+        self.processes = processes
+        self.max_iterations = max_iterations
+        self.executor = ProcessPoolExecutor(processes - 1) if processes > 1 else None
+        self.known_cards = {}
+
+    def round_started(self, engine):
+        """
+        Forget the cards known in the previous round.
+        """
+        self.known_cards = {player.name: 0 for player in engine.players_list}
+
+    def move_applied(self, engine, player, move):
+        """
+        Remember the cards picked from the pile, which every player has seen, until they are played.
+        """
+        known_mask = self.known_cards.get(player.name, 0) & ~mask_from_ids(move.cards_played)
+        if move.pick == PICK_PILE:
+            known_mask |= 1 << engine.last_picked_card
+        self.known_cards[player.name] = known_mask
+
+    def choose_move(self, engine, player):
+        """
+        Return the Move played by the bot.
+
+        Parameters:
+        - engine (GameEngine): The game being played.
+        - player (Player): The player played by the bot.
+
+        Returns:
+        - Move: The decision of the bot.
+        """
+        actions = legal_actions(engine)
+        if len(actions) == 1:
+            return move_from_action(actions[0])
+
+        state = snapshot_game(engine)
+        futures = []
+        if self.executor is not None:
+            worker_time_budget = max(self.time_budget - WORKER_TIME_MARGIN, 0)
+            futures = [self.executor.submit(search_worker, (state, player.name, self.known_cards, worker_time_budget,
+                                                            self.max_iterations, self.rng.getrandbits(64)))
+                       for _ in range(self.processes - 1)]
+        statistics_list = [search(state, player.name, self.known_cards, self.time_budget, self.max_iterations,
+                                  self.rng.getrandbits(64))]
+        statistics_list.extend(future.result() for future in futures)
+
+        statistics = merge_statistics(statistics_list)
+        if not statistics:
+            return move_from_action(self.rng.choice(actions))
+        # The most visited action is the most robust choice
+        return move_from_action(max(statistics, key=lambda action: statistics[action][0]))
+
+    def close(self):
+        """
+        Stop the worker processes.
+        """
+        if self.executor is not None:
+            self.executor.shutdown()
@@ -0,0 +1,74 @@
+from functools import lru_cache
+
+from card_encoding import JOKERS_MASK, NUMBER_OF_RANKS, RANK_MASKS, SUIT_MASKS, ids_from_mask
+
+
+LEGAL_PLAYS_CACHE_SIZE = 1 << 16
+# Cards which can be played together because they have the same value
+SAME_VALUE_MASKS = RANK_MASKS + [JOKERS_MASK]
+
+
+def _subsets(mask, minimum_number_of_cards):
+    """
+    Yield the subsets of a bitmask with at least the given number of cards.
+    """
+    subset = mask
+    while subset:
+        if subset.bit_count() >= minimum_number_of_cards:
+            yield subset
+        subset = (subset - 1) & mask
+
+
+@lru_cache(maxsize=LEGAL_PLAYS_CACHE_SIZE)
+def legal_plays(hand_mask):
+    """
+    Enumerate every set of cards that can be played from a hand: each card alone, groups of cards with the same
+    value (the two jokers together), and runs of at least 3 cards of the same suit (Ace, 2, 3 up to Queen, King).
+    The result is memoized by hand bitmask.
+
+    Parameters:
+    - hand_mask (int): The hand bitmask (see card_encoding).
+
+    Returns:
+    - tuple: Bitmasks of the legal plays: single cards first, then same value groups, then runs.
+    """
+    plays = [1 << card_id for card_id in ids_from_mask(hand_mask)]
+
+    # Cards with the same value
+    for rank_mask in SAME_VALUE_MASKS:
+        group = hand_mask & rank_mask
+        if group & (group - 1):
+            plays.extend(_subsets(group, 2))
+
+    # Runs of at least 3 cards of the same suit, starting from the cards followed by 2 cards of the same suit
+    for suit_index, suit_mask in enumerate(SUIT_MASKS):
+        suit_cards = (hand_mask & suit_mask) >> (suit_index * NUMBER_OF_RANKS)
+        run_starts = suit_cards & (suit_cards >> 1) & (suit_cards >> 2)
+        while run_starts:
+            first_rank = (run_starts & -run_starts).bit_length() - 1
+            run_starts &= run_starts - 1
+            run = 0b111 << first_rank
+            while suit_cards & run == run:
+                plays.append(run << (suit_index * NUMBER_OF_RANKS))
+                run |= run << 1
+
+    return tuple(plays)
+
+
+@lru_cache(maxsize=LEGAL_PLAYS_CACHE_SIZE)
+def playable_cards(hand_mask, selected_mask=0):
+    """
+    Return the cards of a hand which can be added to the cards already selected, to highlight them on the board.
+
+    Parameters:
+    - hand_mask (int): The hand bitmask.
+    - selected_mask (int): Bitmask of the cards already selected.
+
+    Returns:
+    - int: Bitmask of the cards which belong to a legal play containing all the selected cards.
+    """
+    playable_mask = 0
+    for play in legal_plays(hand_mask):
+        if play & selected_mask == selected_mask:
+            playable_mask |= play
+    return playable_mask & ~selected_mask
@@ -0,0 +1,419 @@
+import asyncio
+import sys
+import time
+import uuid
+
+from card_encoding import sorted_hand_ids
+from game_engine import GameEngine, IllegalMoveError, distinct_providers
+from player_class import Player
+
+
+MAXIMUM_NUMBER_OF_PLAYERS = 6
+IDLE_TIMEOUT_SECONDS = 30 * 60
+EVICTION_INTERVAL_SECONDS = 60
+
+TABLE_WAITING = 'waiting'
+TABLE_PLAYING = 'playing'
+TABLE_FINISHED = 'finished'
+
+# Keys of the public state made of one value per player: (tracked attribute, value sent for a player)
+PUBLIC_PLAYER_STATE = {
+    'hand_sizes': ('hand_mask', lambda player: player.hand_mask.bit_count()),
+    'scores': ('score', lambda player: player.score),
+    'passes': ('number_of_pass', lambda player: player.number_of_pass),
+    'eliminated': ('is_eliminate', lambda player: player.is_eliminate),
+}
+
+
+def state_diff(old_state, new_state):
+    """
+    Return the part of a state which has changed, nested dictionaries are compared key by key.
+
+    Parameters:
+    - old_state (dict): The state previously sent to the clients.
+    - new_state (dict): The current state.
+
+    Returns:
+    - dict: The keys of new_state whose value has changed, with their new value.
+    """
+    diff = {}
+    for key, value in new_state.items():
+        old_value = old_state.get(key)
+        if isinstance(value, dict) and isinstance(old_value, dict):
+            nested_diff = state_diff(old_value, value)
+            if nested_diff:
+                diff[key] = nested_diff
+        elif value != old_value:
+            diff[key] = value
+    return diff
+
+
+def deep_size_of(obj, seen=None):
+    """
+    Return the memory used by an object and everything it references (except classes, functions and modules).
+
+    Parameters:
+    - obj: The object to measure.
+    - seen (set): Ids of the objects already counted.
+
+    Returns:
+    - int: The size in bytes.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, (type, type(deep_size_of), type(sys))):
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size_of(key, seen) + deep_size_of(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_size_of(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_size_of(vars(obj), seen)
+    if not isinstance(obj, (dict, list, tuple, set, frozenset)):
+        # Attributes of the objects with __slots__ (Player)
+        for cls in type(obj).__mro__:
+            for slot in getattr(cls, '__slots__', ()):
+                if slot != '__dict__' and hasattr(obj, slot):
+                    size += deep_size_of(getattr(obj, slot), seen)
+    return size
+
+
+class LobbyTable:
+    def __init__(self, table_id, number_of_seats, listener=None):
+        """
+        Initialize a LobbyTable object: one game hosted by the TableManager.
+
+        The game runs in a coroutine (run) which waits for the moves of the remote players instead of blocking,
+        so hundreds of tables can share one event loop.
+
+        Parameters:
+        - table_id (str): Identifier of the table.
+        - number_of_seats (int): Number of players of the game.
+        - listener: Coroutine function (table, event, data) called for 'state', 'round_finished' and
+          'game_finished' events.
+        """
+        self.table_id = table_id
+        self.number_of_seats = number_of_seats
+        self.listener = listener
+        self.status = TABLE_WAITING
+        self.players_list = []
+        self.remote_players = set()
+        self.bots = {}
+        self.engine = None
+        self.pending_move = None
+        self.last_activity = time.monotonic()
+        self.last_public_state = {}
+        self.last_hands = {}
+        # Version of the game (see change_tracker) when the public state and the hands were last sent
+        self.last_public_version = 0
+        self.last_hands_version = 0
+
+    def is_full(self):
+        """
+        Returns:
+        - bool: True if all the seats are taken.
+        """
+        return len(self.players_list) == self.number_of_seats
+
+    def add_player(self, name, bot=None):
+        """
+        Seat a remote player or a bot at the table.
+
+        Parameters:
+        - name (str): Name of the player.
+        - bot (DecisionProvider): The bot playing this seat, None for a remote player.
+        """
+        if self.status != TABLE_WAITING:
+            raise ValueError("The game has already started")
+        if self.is_full():
+            raise ValueError("The table is full")
+        if any(player.name == name for player in self.players_list):
+            raise ValueError(f"{name} already exists and 2 players cannot have the same name")
+        self.players_list.append(Player(name))
+        if bot is None:
+            self.remote_players.add(name)
+        else:
+            self.bots[name] = bot
+        self.last_activity = time.monotonic()
+
+    async def run(self):
+        """
+        Play the game: the same loop as GameEngine.play_game, waiting for the moves of the remote players.
+        """
+        self.status = TABLE_PLAYING
+        self.engine = engine = GameEngine(self.players_list)
+
+        while not engine.is_game_over():
+            engine.start_round()
+            for bot in distinct_providers(self.bots):
+                bot.round_started(engine)
+            await self.notify('state', None)
+
+            while not engine.round_over:
+                player = engine.current_player()
+                if player.name in self.bots:
+                    # A bot can search for a long time (ismcts): it decides in a worker thread, so that the other
+                    # tables and the sockets keep running. Nothing else changes the engine while it decides.
+                    move = await asyncio.to_thread(self.bots[player.name].choose_move, engine, player)
+                    engine.apply_move(move)
+                else:
+                    move = await self.wait_for_move(player)
+                self.last_activity = time.monotonic()
+                for bot in distinct_providers(self.bots):
+                    bot.move_applied(engine, player, move)
+                await self.notify('state', None)
+
+            for bot in distinct_providers(self.bots):
+                bot.round_finished(engine, player)
+            await self.notify('round_finished', {
+                'player': player.name,
+                'score_round': {each_player.name: each_player.score_round for each_player in engine.players_list},
+                'eliminated': [each_player.name for each_player in engine.eliminated_players],
+            })
+
+        self.status = TABLE_FINISHED
+        await self.notify('game_finished', {
+            'scores': {player.name: player.score for player in engine.players_list},
+            'rankings': {player.name: player.ranking or 1 for player in engine.players_list},
+        })
+
+    async def wait_for_move(self, player):
+        """
+        Wait until the remote player submits a legal move, and apply it.
+
+        Parameters:
+        - player (Player): The player who has to play.
+
+        Returns:
+        - Move: The move applied.
+        """
+        while True:
+            self.pending_move = asyncio.get_running_loop().create_future()
+            move, reply = await self.pending_move
+            self.pending_move = None
+            try:
+                self.engine.apply_move(move)
+            except IllegalMoveError as error:
+                reply.set_exception(error)
+            except Exception as error:
+                # Do not leave the player waiting if the table stops
+                reply.set_exception(error)
+                raise
+            else:
+                reply.set_result(True)
+                return move
+
+    async def submit_move(self, name, move):
+        """
+        Submit the move of a remote player, raise IllegalMoveError if it is not allowed.
+
+        Parameters:
+        - name (str): Name of the player.
+        - move (Move): The move.
+        """
+        if self.status != TABLE_PLAYING or self.pending_move is None or self.pending_move.done() \
+                or self.engine.current_player().name != name:
+            raise IllegalMoveError("It is not your turn")
+        self.last_activity = time.monotonic()
+        reply = asyncio.get_running_loop().create_future()
+        self.pending_move.set_result((move, reply))
+        await reply
+
+    async def notify(self, event, data):
+        """
+        Send an event of the table to the listener.
+        """
+        if self.listener is not None:
+            await self.listener(self, event, data)
+
+    def public_state(self):
+        """
+        Return what all the players of the table can see.
+
+        Returns:
+        - dict: The public state of the game.
+        """
+        state = self.public_table_state()
+        for key, (_, value_of) in PUBLIC_PLAYER_STATE.items():
+            state[key] = {player.name: value_of(player) for player in self.engine.players_list}
+        return state
+
+    def public_table_state(self):
+        """
+        Return the part of the public state which is not about one player.
+
+        Returns:
+        - dict: The round, the turn, the pile and the deck.
+        """
+        engine = self.engine
+        return {
+            'round_number': engine.round_number,
+            'current_player': engine.current_player().name,
+            'pile_top': engine.pile[-1],
+            'deck_size': len(engine.deck),
+            'round_over': engine.round_over,
+            'game_over': engine.is_game_over(),
+        }
+
+    def public_diff(self):
+        """
+        Return the public state changes since the last call. Only the players whose attributes have a newer version
+        than the last call are compared.
+
+        Returns:
+        - dict: The changed part of the public state.
+        """
+        change_tracker = self.engine.change_tracker
+        if not self.last_public_state:
+            self.last_public_state = self.public_state()
+            self.last_public_version = change_tracker.version
+            return dict(self.last_public_state)
+        if change_tracker.version == self.last_public_version:
+            return {}
+
+        diff = {}
+        if change_tracker.attribute_versions.get('table', 0) > self.last_public_version:
+            table_state = self.public_table_state()
+            diff = state_diff(self.last_public_state, table_state)
+            self.last_public_state.update(table_state)
+        for key, (attribute, value_of) in PUBLIC_PLAYER_STATE.items():
+            if change_tracker.attribute_versions.get(attribute, 0) <= self.last_public_version:
+                continue
+            sent_values = self.last_public_state[key]
+            for player in self.engine.players_list:
+                if player.versions.get(attribute, 0) > self.last_public_version:
+                    value = value_of(player)
+                    # A hand can change and keep its size
+                    if sent_values.get(player.name) != value:
+                        sent_values[player.name] = diff.setdefault(key, {})[player.name] = value
+        self.last_public_version = change_tracker.version
+        return diff
+
+    def hand_changes(self):
+        """
+        Return the hands of the remote players which changed since the last call.
+
+        Returns:
+        - dict: Sorted card ids of the hand by player name.
+        """
+        changes = {}
+        for player in self.players_list:
+            if player.name in self.remote_players and player.version_of('hand_mask') > self.last_hands_version \
+                    and self.last_hands.get(player.name) != player.hand_mask:
+                self.last_hands[player.name] = player.hand_mask
+                changes[player.name] = sorted_hand_ids(player.hand_mask)
+        self.last_hands_version = self.engine.change_tracker.version
+        return changes
+
+    def memory_usage(self):
+        """
+        Returns:
+        - int: Memory used by the state of the table, in bytes.
+        """
+        return deep_size_of([self.players_list, self.remote_players, self.bots, self.engine, self.last_public_state,
+                             self.last_hands])
+
+
+class TableManager:
+    def __init__(self, listener=None, idle_timeout=IDLE_TIMEOUT_SECONDS):
+        """
+        Initialize a TableManager object, which hosts many independent tables on the running event loop.
+
+        Parameters:
+        - listener: Coroutine function (table, event, data) given to every table.
+        - idle_timeout (float): Number of seconds without activity after which a table is closed.
+        """
+        self.listener = listener
+        self.idle_timeout = idle_timeout
+        self.tables = {}
+        self.tasks = {}
+
+    def create_table(self, number_of_seats, table_id=None):
+        """
+        Create a table waiting for its players.
+
+        Parameters:
+        - number_of_seats (int): Number of players of the game.
+        - table_id (str): Identifier of the table, generated if not given.
+
+        Returns:
+        - LobbyTable: The new table.
+        """
+        if not 2 <= number_of_seats <= MAXIMUM_NUMBER_OF_PLAYERS:
+            raise ValueError(f"Number of players must be between 2 and {MAXIMUM_NUMBER_OF_PLAYERS}")
+        table_id = table_id or uuid.uuid4().hex[:8]
+        if table_id in self.tables:
+            raise ValueError(f"Table {table_id} already exists")
+        table = LobbyTable(table_id, number_of_seats, self.listener)
+        self.tables[table_id] = table
+        return table
+
+    def get_table(self, table_id):
+        """
+        Returns:
+        - LobbyTable: The table, None if it does not exist.
+        """
+        return self.tables.get(table_id)
+
+    def start_table(self, table_id):
+        """
+        Start the game of a full table in its own task.
+
+        Parameters:
+        - table_id (str): Identifier of the table.
+        """
+        table = self.tables[table_id]
+        if not table.is_full():
+            raise ValueError("The table is not full")
+        if table_id not in self.tasks:
+            self.tasks[table_id] = asyncio.get_running_loop().create_task(table.run())
+
+    async def close_table(self, table_id):
+        """
+        Stop the game of a table and remove it.
+
+        Parameters:
+        - table_id (str): Identifier of the table.
+        """
+        self.tables.pop(table_id, None)
+        task = self.tasks.pop(table_id, None)
+        if task is not None and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def evict_idle_tables(self):
+        """
+        Close the tables without activity for more than idle_timeout seconds.
+
+        Returns:
+        - list: Identifiers of the tables closed.
+        """
+        now = time.monotonic()
+        idle_tables = [table_id for table_id, table in self.tables.items()
+                       if now - table.last_activity > self.idle_timeout]
+        for table_id in idle_tables:
+            await self.close_table(table_id)
+        return idle_tables
+
+    async def run_eviction(self, interval=EVICTION_INTERVAL_SECONDS):
+        """
+        Evict the idle tables periodically, until cancelled.
+
+        Parameters:
+        - interval (float): Number of seconds between two evictions.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await self.evict_idle_tables()
+
+    def memory_usage(self):
+        """
+        Returns:
+        - dict: Memory used by each table, in bytes.
+        """
+        return {table_id: table.memory_usage() for table_id, table in self.tables.items()}
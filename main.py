@@ -1,50 +1,34 @@
-import pydealer
-from interface_function import display_game_board, display_end_of_game_window
+import importlib
+import os
+import sys
+import threading
+from card_encoding import CARD_IDS, id_to_card, stack_from_ids
+from game_engine import GameEngine, DecisionProvider, Move, PICK_DECK, PICK_PILE
 from player_class import Player
-import pandas as pd
+from score_ledger import ScoreLedger
 
 
-ELIMINATION_SCORE_THRESHOLD = 150
 MAXIMUM_NUMBER_OF_PLAYERS = 6
+# Modules of the board (Tkinter, PIL, tabulate), imported while the players type their names
+GUI_MODULES = ['tkinter', 'PIL.Image', 'PIL.ImageTk', 'tabulate', 'card_images', 'interface_function',
+               'board_controller']
+NUMBER_OF_MODULES_TO_PROFILE = 20
 
 
-def calculate_players_score(data_score, players_list, round_number):
+def calculate_players_score(score_ledger, players_list, round_number):
     """
-    Calculate and display the scores of players for each round.
+    Record the scores of the previous round and return the scores of players for each round.
 
     Parameters:
-    - data (list): A list containing data for each player, round, and score.
+    - score_ledger (ScoreLedger): The score history of the game.
     - players_list (list): A list of Player objects, each representing a player in the game.
-    - round_number (int): The current round number for which the scores are calculated.
+    - round_number (int): The current round number, the scores of the previous round are recorded.
 
     Returns:
     - str: A formatted string representing the scores of players for each round.
     """
-
-    # Iterate through each player in the provided list
-    for player in players_list:
-        # Create a row for each player containing round_number - 1, player name, and player score for the previous round
-        player_row = [player.name, int(round_number - 1), int(player.score_round)]
-        data_score.append(player_row)
-
-    # Create a DataFrame with the data
-    df = pd.DataFrame(data_score, columns=["Player", "Round", "Score"])
-
-    # Pivot the DataFrame to arrange data by rounds and players
-    df_pivoted = df.pivot(index='Round', columns='Player', values='Score')
-
-    # Fill missing values with an empty string
-    df_pivoted.fillna('', inplace=True)
-
-    # Calculate the total score for each player and append a row to the DataFrame
-    df_pivoted.loc[''] = df_pivoted.sum()
-
-    # Reset the index to make rounds a regular column
-    df_pivoted.reset_index(inplace=True)
-
-    # Display the DataFrame as a formatted string
-    message_for_score_button = df_pivoted.to_string(index=False)
-    return message_for_score_button
+    score_ledger.record_round(players_list, round_number - 1)
+    return score_ledger.message()
 
 
 def check_duplicates_players(player_name, players_list):
@@ -97,193 +81,234 @@ def init_players():
             print("Invalid input. Please enter a valid number.")
 
 
-def init_jokers(deck):
-    """
-        Initialize and add Joker cards to the deck.
+class TkinterDecisionProvider(DecisionProvider):
+    def __init__(self):
+        """
+        Initialize the decision provider of the Tkinter board, used for all players sitting at the computer.
+        """
+        # Initialization of the ledger to keep track of scores for each_round
+        self.score_ledger = ScoreLedger()
+        self.message_for_score_button = ''
 
-        Parameters:
-        - The deck to which Jokers will have been added.
+    def round_started(self, engine):
         """
-    jokers = {}
-    count = 1
-    for i in range(1, 3):
-        jokers[f'joker{i}'] = pydealer.Card('Joker', 'Hearts')
-    for cards in jokers:
-        cards = jokers[cards]
-        cards.name = f'Joker{count}'
-        cards.abbrev = f'J{count}'
-        deck.add(cards)
-        count += 1
-
-
-def draw_cards_to_players(players_list, deck):
-    """
-        Draw cards from the deck and assign them to players still on game.
+        Create the message used to display score for each round.
 
         Parameters:
-        - players_list (list): List of Player objects.
-        - deck (pydealer.Deck): The deck from which cards are drawn.
+        - engine (GameEngine): The game being played.
         """
-    deck.shuffle()
-    for player in players_list:
-        if not player.is_eliminate:
-            player.hand = deck.deal(5)
-            player.hand.sort()
-
+        if engine.round_number > 1:
+            # If round_number is greater than 1, create a message_for_score_button
+            self.message_for_score_button = calculate_players_score(self.score_ledger, engine.players_list,
+                                                                    engine.round_number)
+        else:
+            self.message_for_score_button = ''
 
-def draw_card_to_pile(deck):
-    """
-        Draw cards from the deck and form a pile.
+    def choose_move(self, engine, player):
+        """
+        Display the game board until the player has played, passed or ended the round.
 
         Parameters:
-        - deck (pydealer.Deck): The deck from which cards are drawn.
+        - engine (GameEngine): The game being played.
+        - player (Player): The player who has to play.
 
         Returns:
-        - pydealer.Stack: The pile of cards drawn.
+        - Move: The decision of the player.
+        """
+        from interface_function import display_game_board
+
+        # while the player has not played, we repeat this
+        while True:
+            display_type = 'normal'
+
+            # Display the game board and get player's move: cards played, pile or deck chose, player pass
+            engine.sync_player_hands()
+            cards_played, pile_chose, deck_chose, player_pass, player_finish = display_game_board(
+                engine.players_from(player), stack_from_ids(engine.pile), stack_from_ids(engine.deck),
+                engine.round_number, display_type, [], [], self.message_for_score_button)
+            cards_played = [CARD_IDS[card] for card in cards_played]
+
+            if player_finish:
+                return Move(end_round=True)
+            if player_pass[0] == 'True':
+                return Move(is_pass=True)
+            if len(pile_chose) == 1:
+                return Move(cards_played, pick=PICK_PILE)
+            if len(deck_chose) == 1:
+                return Move(cards_played, pick=PICK_DECK)
+
+    def move_applied(self, engine, player, move):
+        """
+        Display a light board game (no buttons on it) to see which card the player has picked.
+
+        Parameters:
+        - engine (GameEngine): The game being played.
+        - player (Player): The player who has played.
+        - move (Move): The move of the player.
         """
-    pile = pydealer.Stack()
-    pile = deck.deal(1)
-    return pile
+        if move.pick is None:
+            return
 
+        from interface_function import display_game_board
 
-def reset_finish_round_for_each_player(players_list):
-    """
-        Reset finish_round for all players to False after each round
+        display_type = 'temp'
+        picked_card = id_to_card(engine.last_picked_card)
+        pile_chose = [picked_card] if move.pick == PICK_PILE else []
+        deck_chose = [picked_card] if move.pick == PICK_DECK else []
+        engine.sync_player_hands()
+        display_game_board(engine.players_from(player), stack_from_ids(engine.pile), stack_from_ids(engine.deck),
+                           engine.round_number, display_type, pile_chose, deck_chose, self.message_for_score_button)
+
+    def round_finished(self, engine, player):
+        """
+        Display the end-of-round scores.
 
         Parameters:
-        - players_list (list): List of Player objects.
-    """
-    for player in players_list:
-        player.finish_round = False
+        - engine (GameEngine): The game being played.
+        - player (Player): The player who ended the round.
+        """
+        engine.sync_player_hands()
+        from interface_function import display_end_of_round_window
 
+        display_end_of_round_window(engine.players_from(player), engine.round_number, engine.eliminated_players)
 
-def action(deck, pile, players_list, round_number, message_for_score_button):
-    """
-    Execute the game actions for each player in a round.
+    def game_finished(self, engine):
+        """
+        When the game is finished we display the final score table.
 
-    Parameters:
-    - deck (Deck): The deck of cards used in the game.
-    - pile (Pile): The pile of cards discarded by players.
-    - players_list (list): A list of Player objects, each representing a player in the game.
-    - round_number (int): The current round number.
-    - message_for_score_button (str): A formatted string representing the scores of players for each round.
+        Parameters:
+        - engine (GameEngine): The game being played.
+        """
+        from interface_function import display_end_of_game_window
 
-    Returns:
-    None
+        display_end_of_game_window(engine.players_list)
+
+
+def load_gui():
     """
+    Import the modules of the board, decode the card images and load the END ROUND table.
+    """
+    for module_name in GUI_MODULES:
+        importlib.import_module(module_name)
 
-    # Continue the game until one player has finished the round
-    while all(not player.finish_round for player in players_list):
-        for player in players_list:
-            player_have_play = False
-
-            # Check if the player is eliminated
-            if not player.is_eliminate:
-                # while the player has not played, we repeat this
-                while not player_have_play:
-                    pile_chose = []
-                    deck_chose = []
-                    display_type = 'normal'
-
-                    # Display the game board and get player's move: cards played, pile or deck chose, player pass
-                    cards_played, pile_chose, deck_chose, player_pass = display_game_board(players_list, pile, deck,
-                                                                                           round_number, display_type,
-                                                                                           pile_chose, deck_chose,
-                                                                                           message_for_score_button)
-                    # We check if the player has not decided to end the round
-                    if not player.finish_round:
-                        # We check if the player has not passed
-                        if player_pass[0] == 'False':
-                            # Execute the player's move
-                            player.play(deck, pile, cards_played, pile_chose, deck_chose)
-                            # Sort the updated hand of the player
-                            player.hand.sort()
-                            # Set the display type to temp, means that a light board game (no buttons on it)
-                            # will be display to see which card the player has picked.
-                            display_type = 'temp'
-
-                            # Move cards from pile to deck if the deck is empty
-                            if len(deck) == 0:
-                                for cards in reversed(pile[:-1]):
-                                    print(cards)
-                                    deck.add(cards)
-                                    pile.get(str(cards))
-
-                            # Display the updated game board to see the card the player has picked from deck or pile
-                            display_game_board(players_list, pile, deck, round_number, display_type, pile_chose,
-                                               deck_chose, message_for_score_button)
-
-                            # Rotate the player order
-                            players_list = [players_list[(i + 1) % len(players_list)] for i in
-                                            range(len(players_list))]
-
-                            player_have_play = True
+    from card_images import card_image_cache
 
-                        else:
-                            # Skip player's turn if they pass
-                            players_list = [players_list[(i + 1) % len(players_list)] for i in range(len(players_list))]
-                            player_have_play = True
-                    else:
-                        # Finish the round and update player status
-                        player_have_play = True
-                        for each_player in players_list:
-                            if each_player.score >= ELIMINATION_SCORE_THRESHOLD and not each_player.is_eliminate:
-                                each_player.is_eliminate = True
+    # Decode and resize all the card images once, before the first board is displayed
+    card_image_cache.load()
 
-                            # Update player rankings
-                            eliminated_count = sum(1 for player in players_list if player.is_eliminate)
-                            if each_player.ranking == 0 and each_player.is_eliminate:
-                                each_player.ranking = (len(players_list) - eliminated_count) + 1
+    from end_round_oracle import load_end_round_table
 
-                        # Reset the round number for the next round
-                        round_number = 1
+    # Build the END ROUND table now rather than on the Tkinter thread, when END ROUND is first available
+    load_end_round_table()
 
-                break
 
+def start_loading_gui():
+    """
+    Load the board in a background thread, so that the players can type their names without waiting for it.
 
-def play_game(players_list):
+    Returns:
+    - threading.Thread: The thread loading the board.
+    """
+    thread = threading.Thread(target=load_gui, name='load_gui', daemon=True)
+    thread.start()
+    return thread
+
+
+def profile_startup(number_of_modules=NUMBER_OF_MODULES_TO_PROFILE):
+    """
+    Print the import time of the modules, measured by python -X importtime in new interpreters: the modules
+    imported before the "Enter number of players" prompt, then the ones loaded in the background.
+
+    Parameters:
+    - number_of_modules (int): Number of modules to print for each step, the slowest first.
+    """
+    import subprocess
+
+    def import_times(code):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        times = {}
+        for line in result.stderr.splitlines():
+            # Lines "import time: self [us] | cumulative | imported package", after the header line
+            if line.startswith('import time:') and 'cumulative' not in line:
+                self_time, cumulative_time, module_name = line[len('import time:'):].split('|')
+                times[module_name.strip()] = (int(self_time), int(cumulative_time))
+        return times
+
+    before_prompt = import_times('import main')
+    with_gui = import_times('import main; main.load_gui()')
+    background = {name: times for name, times in with_gui.items() if name not in before_prompt}
+
+    for title, times in (("Before the prompt", before_prompt), ("In the background", background)):
+        total = sum(self_time for self_time, _ in times.values())
+        print(f"{title}: {len(times)} modules, {total / 1000:.1f} ms")
+        print(f"{'self (ms)':>10} {'cumulative (ms)':>16}  module")
+        for name, (self_time, cumulative_time) in sorted(times.items(), key=lambda item: -item[1][1])[
+                :number_of_modules]:
+            print(f"{self_time / 1000:>10.1f} {cumulative_time / 1000:>16.1f}  {name}")
+        print()
+
+
+def play_game(players_list, classic_board=False, gui_loader=None, replay_path=None, save_path=None, game_state=None):
     """
         Main function to play the card game.
 
         Parameters:
         - players_list (list): List of Player objects.
+        - classic_board (bool): True to open a new board window for each turn instead of a single window.
+        - gui_loader (threading.Thread): The thread started by start_loading_gui, the board is loaded now if None.
+        - replay_path (str): File where the replay of the game is written (see replay.py), not recorded if None.
+        - save_path (str): File where the game is saved after every move, to resume it after a crash.
+        - game_state (GameState): A saved game to continue, players_list is not used in that case.
         """
-
-    # Initialization of round number count
-    round_number = 1
-    # Initialization of the list to keep track of scores for each_round
-    data_score = []
-    # We do those actions until all players excecpt one are eliminated (means until end of the game)
-    while sum(player.is_eliminate for player in players_list) < len(players_list) - 1:
-        # Deck, pile, joker and player's hand initialization
-        deck = pydealer.Deck()
-        init_jokers(deck)
-        draw_cards_to_players(players_list, deck)
-        pile = draw_card_to_pile(deck)
-
-        # Creation of the message used to display score for each round
-        if round_number > 1:
-            # If round_number is greater than 1, create a message_for_score_button
-            message_for_score_button = calculate_players_score(data_score, players_list, round_number)
-        # If round_number is not greater than 1, assign an empty string to message_for_score_button
+    if gui_loader is None:
+        load_gui()
+    else:
+        gui_loader.join()
+
+    from board_controller import BoardController
+
+    if game_state is None:
+        engine = GameEngine(players_list)
+    else:
+        from game_state import restore_game
+
+        engine = restore_game(game_state)
+    if replay_path is not None:
+        from replay import ReplayRecorder
+
+        replay_recorder = ReplayRecorder(engine)
+    try:
+        if classic_board:
+            engine.play_game(TkinterDecisionProvider())
         else:
-            message_for_score_button = ''
-
-        # Perform action of all the players for one round
-        action(deck, pile, players_list, round_number, message_for_score_button)
-
-        # Reset finish round to False
-        reset_finish_round_for_each_player(players_list)
+            board_controller = BoardController(engine, save_path=save_path)
+            if game_state is not None:
+                from game_state import restore_score_ledger
 
-        # Switch players order for next round
-        players_list = [players_list[(i + 1) % len(players_list)] for i in range(len(players_list))]
-
-        round_number += 1
-
-    # When the game is finished we display the final score table
-    display_end_of_game_window(players)
+                restore_score_ledger(game_state, board_controller.score_ledger)
+            board_controller.run()
+    finally:
+        # The replay is also written if the game stops on an error, to reproduce it
+        if replay_path is not None:
+            replay_recorder.save(replay_path)
 
 
 if __name__ == "__main__":
-    players = init_players()
-    play_game(players)
\ No newline at end of file
+    if '--profile-startup' in sys.argv:
+        profile_startup()
+    else:
+        gui_loader = start_loading_gui()
+        replay_path = sys.argv[sys.argv.index('--replay-log') + 1] if '--replay-log' in sys.argv else None
+        save_path = sys.argv[sys.argv.index('--save-game') + 1] if '--save-game' in sys.argv else None
+        if '--resume' in sys.argv:
+            from game_state import load_game_state
+
+            # A resumed game is played on the persistent board, and keeps being saved in the same file
+            resume_path = sys.argv[sys.argv.index('--resume') + 1]
+            play_game(None, gui_loader=gui_loader, save_path=save_path or resume_path,
+                      game_state=load_game_state(resume_path))
+        else:
+            players = init_players()
+            play_game(players, classic_board='--classic-board' in sys.argv, gui_loader=gui_loader,
+                      replay_path=replay_path, save_path=save_path)
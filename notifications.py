@@ -0,0 +1,84 @@
+import tkinter as tk
+
+
+TOAST_DURATION_MS = 2500
+TOAST_WRAP_LENGTH = 420
+# Position of the top center of the toast in the window, relative to its size
+TOAST_RELATIVE_X = 0.5
+TOAST_RELATIVE_Y = 0.05
+
+
+class ToastLayer:
+    def __init__(self, root, duration_ms=TOAST_DURATION_MS):
+        """
+        Initialize a ToastLayer object: a message shown over a window, which hides itself after a delay.
+
+        The layer is a single label of the window, created once and reused for every message, so showing a message
+        never opens a window nor runs another Tkinter main loop, and the board keeps receiving the clicks.
+
+        Parameters:
+        - root (Tk): The window where the messages are shown.
+        - duration_ms (int): Number of milliseconds a message stays visible.
+        """
+        self.root = root
+        self.duration_ms = duration_ms
+        self.label = tk.Label(root, wraplength=TOAST_WRAP_LENGTH, justify='center', fg="white", bg="firebrick",
+                              font=("Arial", 12), padx=12, pady=8)
+        # A click on the message hides it at once
+        self.label.bind("<Button-1>", lambda event: self.hide())
+        self.message = None
+        self.hide_callback = None
+
+    def show(self, message, duration_ms=None):
+        """
+        Show a message, replacing the one displayed. Showing a message again only restarts its delay.
+
+        Parameters:
+        - message (str): The message.
+        - duration_ms (int): Number of milliseconds the message stays visible, duration_ms of the layer if None.
+        """
+        if message != self.message:
+            self.message = message
+            self.label.configure(text=message)
+            self.label.place(relx=TOAST_RELATIVE_X, rely=TOAST_RELATIVE_Y, anchor='n')
+        self.label.lift()
+        self._cancel_hide()
+        self.hide_callback = self.root.after(self.duration_ms if duration_ms is None else duration_ms, self.hide)
+
+    def hide(self):
+        """
+        Hide the message, if one is displayed.
+        """
+        self._cancel_hide()
+        if self.message is not None:
+            self.message = None
+            self.label.place_forget()
+
+    def lift(self):
+        """
+        Put the message back above the widgets, after the board has lifted its cards.
+        """
+        if self.message is not None:
+            self.label.lift()
+
+    def _cancel_hide(self):
+        if self.hide_callback is not None:
+            self.root.after_cancel(self.hide_callback)
+            self.hide_callback = None
+
+
+def toast_layer(widget):
+    """
+    Return the ToastLayer of the window of a widget, created the first time.
+
+    Parameters:
+    - widget: Any widget of the window.
+
+    Returns:
+    - ToastLayer: The layer of the window.
+    """
+    root = widget.winfo_toplevel()
+    layer = getattr(root, 'toast_layer', None)
+    if layer is None:
+        layer = root.toast_layer = ToastLayer(root)
+    return layer
@@ -1,5 +1,9 @@
+from operator import attrgetter
+
 from pydealer.const import TOP
 
+from change_tracker import ChangeTracker
+
 new_ranks_for_count_hand = {
     "values": {
         "Ace": 1,
@@ -20,23 +24,92 @@ new_ranks_for_count_hand = {
 }
 
 
+# Attributes whose changes are recorded by the ChangeTracker of the game
+TRACKED_ATTRIBUTES = ('hand_mask', 'score', 'number_of_pass', 'is_eliminate', 'ranking')
+
+
+def tracked_attribute(attribute):
+    """
+    Create the property of a tracked attribute of Player: its value is kept in the slot '_' + attribute, and a
+    change of the value is recorded in the tracker of the player.
+
+    Parameters:
+    - attribute (str): Name of the attribute.
+
+    Returns:
+    - property: The property, read in C (attrgetter) since the attributes are read much more often than changed.
+    """
+    slot = '_' + attribute
+    get_value = attrgetter(slot)
+
+    def set_value(player, value):
+        if get_value(player) != value:
+            player.versions[attribute] = player.tracker.changed(attribute)
+        setattr(player, slot, value)
+
+    return property(get_value, set_value, doc=f"{attribute}, its changes are tracked")
+
+
 class Player:
+    __slots__ = ('tracker', 'versions', 'hand', 'name', 'finish_round', 'score_round',
+                 *('_' + attribute for attribute in TRACKED_ATTRIBUTES))
+
+    hand_mask = tracked_attribute('hand_mask')
+    score = tracked_attribute('score')
+    number_of_pass = tracked_attribute('number_of_pass')
+    is_eliminate = tracked_attribute('is_eliminate')
+    ranking = tracked_attribute('ranking')
+
     def __init__(self, name):
         """
         Initialize a Player object.
 
+        The player has no __dict__, and each change of a tracked attribute (TRACKED_ATTRIBUTES) is recorded with the
+        version of the game in versions, see change_tracker. The player has its own tracker until the game engine
+        attaches it to the tracker of the game.
+
         Parameters:
         - name (str): The name of the player.
         """
+        self.tracker = ChangeTracker()
+        # Version of the last change of each tracked attribute, by attribute name
+        self.versions = {}
         self.hand = None
         self.name = name
-        self.score = 0
-        self.number_of_pass = 0
-        self.is_eliminate = False
-        self.ranking = 0
+        # The first values of the tracked attributes are not changes, they are set in their slots
+        self._hand_mask = 0
+        self._score = 0
+        self._number_of_pass = 0
+        self._is_eliminate = False
+        self._ranking = 0
         self.finish_round = False
         self.score_round = 0
 
+    def restore(self, hand_mask, score, score_round, number_of_pass, is_eliminate, ranking, finish_round):
+        """
+        Set the attributes of a player restored from a snapshot (see game_state). Like the first values given by
+        __init__, they are not changes.
+        """
+        self._hand_mask = hand_mask
+        self._score = score
+        self.score_round = score_round
+        self._number_of_pass = number_of_pass
+        self._is_eliminate = is_eliminate
+        self._ranking = ranking
+        self.finish_round = finish_round
+
+    def version_of(self, *attributes):
+        """
+        Return the version of the last change of some tracked attributes.
+
+        Parameters:
+        - attributes (str): Names of tracked attributes.
+
+        Returns:
+        - int: The most recent version, 0 if none of them has changed.
+        """
+        return max(self.versions.get(attribute, 0) for attribute in attributes)
+
     def count_hand(self):
         """
         Calculate the total value of cards in the player's hand.
@@ -55,9 +128,9 @@ class Player:
         """
         self.number_of_pass += 1
 
-    def finish_round(self, players_list):
+    def end_round(self, players_list):
         """
-        Finish the current round and calculate scores.
+        Finish the current round and calculate scores (the flag finish_round records that the player did it).
 
         Parameters:
         - players_list (list): List of Player objects.
@@ -125,10 +198,12 @@ class Player:
         - list_cards_to_play (list): List of cards to play.
         """
         for card_to_play in cards_played:
-            for card in self.hand:
+            for index, card in enumerate(self.hand.cards):
                 if str(card) == card_to_play:
-                    self.hand.get(str(card))
+                    # Remove the card by its position, the two jokers have the same name
+                    del self.hand.cards[index]
                     pile.add(card, end=TOP)
+                    break
 
     def play(self, deck, pile, cards_played, pile_chose, deck_chose):
         """
@@ -162,12 +237,13 @@ class Player:
 
         # If a card is chosen from the deck
         if len(deck_chose) == 1:
-            # Get the last card from the deck and add it to the player's hand
-            cards = deck.get(f'{deck.cards[int(len(deck.cards) - 1)]}')
-            self.hand.add(cards)
+            # Take the top card of the deck (the end of the cards) and add it to the player's hand
+            self.hand.add(deck.cards.pop())
 
         # If a card is chosen from the pile
         elif len(pile_chose) == 1:
-            # Get the last card from the pile and add it to the player's hand
-            cards = pile.get(f'{pile.cards[int(len(pile.cards) - len(set(cards_played))) - 1]}')
-            self.hand.add(cards)
+            # Take the card under the cards played, by its position from the top of the pile
+            index = len(pile.cards) - len(set(cards_played)) - 1
+            card = pile.cards[index]
+            del pile.cards[index]
+            self.hand.add(card)
@@ -0,0 +1,205 @@
+import argparse
+import time
+
+import msgspec
+
+from game_engine import (ELIMINATION_SCORE_THRESHOLD, NUMBER_TO_END_ROUND, PICK_DECK, PICK_PILE, GameEngine,
+                         IllegalMoveError, Move)
+from player_class import Player
+
+
+REPLAY_FORMAT_VERSION = 1
+
+ACTION_PLAY = 0
+ACTION_PASS = 1
+ACTION_END_ROUND = 2
+
+# Picks are stored as small integers, 0 when the player did not play cards
+PICKS = [None, PICK_DECK, PICK_PILE]
+
+
+class ReplayMove(msgspec.Struct, array_like=True):
+    """
+    One turn of a game: [action, pick, card ids played].
+    """
+    action: int
+    pick: int = 0
+    cards: list[int] = []
+
+
+class Replay(msgspec.Struct, array_like=True):
+    """
+    Everything needed to play a game again: the seed of the shuffles, the players and house rules, and every move.
+    The final scores are stored to check the replay.
+    """
+    version: int
+    seed: int
+    player_names: list[str]
+    elimination_score_threshold: int = ELIMINATION_SCORE_THRESHOLD
+    number_to_end_round: int = NUMBER_TO_END_ROUND
+    moves: list[ReplayMove] = []
+    scores: list[int] = []
+
+
+REPLAY_ENCODER = msgspec.msgpack.Encoder()
+REPLAY_DECODER = msgspec.msgpack.Decoder(Replay)
+
+
+def record_from_move(move):
+    """
+    Convert a Move to its compact record.
+
+    Parameters:
+    - move (Move): The move.
+
+    Returns:
+    - ReplayMove: The record of the move.
+    """
+    if move.end_round:
+        return ReplayMove(ACTION_END_ROUND)
+    if move.is_pass:
+        return ReplayMove(ACTION_PASS)
+    return ReplayMove(ACTION_PLAY, PICKS.index(move.pick), list(move.cards_played))
+
+
+def move_from_record(record):
+    """
+    Convert a record back to a Move.
+
+    Parameters:
+    - record (ReplayMove): The record of the move.
+
+    Returns:
+    - Move: The move.
+    """
+    if record.action == ACTION_END_ROUND:
+        return Move(end_round=True)
+    if record.action == ACTION_PASS:
+        return Move(is_pass=True)
+    return Move(record.cards, pick=PICKS[record.pick])
+
+
+class ReplayRecorder:
+    def __init__(self, engine):
+        """
+        Initialize a ReplayRecorder object, which records every move applied by a game engine.
+
+        It must be created before the first round, the final scores are recorded when the game is over.
+
+        Parameters:
+        - engine (GameEngine): The game to record.
+        """
+        self.engine = engine
+        self.replay = Replay(REPLAY_FORMAT_VERSION, engine.seed, [player.name for player in engine.players_list],
+                             engine.elimination_score_threshold, engine.number_to_end_round)
+        self.players_list = list(engine.players_list)
+        engine.replay_log = self
+
+    def record(self, move):
+        """
+        Record a move applied by the engine.
+
+        Parameters:
+        - move (Move): The move.
+        """
+        self.replay.moves.append(record_from_move(move))
+        if move.end_round and self.engine.is_game_over():
+            self.replay.scores = [player.score for player in self.players_list]
+
+    def save(self, path):
+        """
+        Write the replay to a file.
+
+        Parameters:
+        - path (str): Path of the replay file.
+        """
+        save_replay(self.replay, path)
+
+
+def encode_replay(replay):
+    """
+    Returns:
+    - bytes: The replay encoded with msgpack.
+    """
+    return REPLAY_ENCODER.encode(replay)
+
+
+def decode_replay(data):
+    """
+    Returns:
+    - Replay: The replay decoded from msgpack bytes.
+    """
+    return REPLAY_DECODER.decode(data)
+
+
+def save_replay(replay, path):
+    """
+    Write a replay to a file.
+    """
+    with open(path, 'wb') as replay_file:
+        replay_file.write(encode_replay(replay))
+
+
+def load_replay(path):
+    """
+    Read a replay from a file.
+    """
+    with open(path, 'rb') as replay_file:
+        return decode_replay(replay_file.read())
+
+
+def replay_game(replay):
+    """
+    Play a recorded game again, without user interface.
+
+    Parameters:
+    - replay (Replay): The recorded game.
+
+    Returns:
+    - GameEngine: The engine at the end of the replay.
+    """
+    players_list = [Player(name) for name in replay.player_names]
+    engine = GameEngine(players_list, replay.elimination_score_threshold, replay.number_to_end_round,
+                        seed=replay.seed)
+    for record in replay.moves:
+        if engine.round_over:
+            if engine.is_game_over():
+                raise IllegalMoveError("The replay has moves after the end of the game")
+            engine.start_round()
+        engine.apply_move(move_from_record(record))
+    return engine
+
+
+def replay_scores(replay, engine):
+    """
+    Returns:
+    - list: The scores of the players of a replayed game, in the order of replay.player_names.
+    """
+    scores = {player.name: player.score for player in engine.players_list}
+    return [scores[name] for name in replay.player_names]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a recorded Nine-Game again, without user interface.")
+    parser.add_argument('path', help="Replay file written by main.py --replay-log")
+    parser.add_argument('--repeat', type=int, default=1, help="Number of times the game is replayed, for benchmarks")
+    arguments = parser.parse_args()
+
+    replay = load_replay(arguments.path)
+    start_time = time.perf_counter()
+    for _ in range(arguments.repeat):
+        engine = replay_game(replay)
+    elapsed_time = time.perf_counter() - start_time
+
+    scores = replay_scores(replay, engine)
+    print(f"Players: {', '.join(replay.player_names)}")
+    print(f"Rounds: {engine.round_number}, moves: {len(replay.moves)}")
+    print(f"Scores: {scores}")
+    if replay.scores:
+        print("Scores match the recorded game" if scores == replay.scores else
+              f"Scores do not match the recorded game: {replay.scores}")
+    print(f"{arguments.repeat * len(replay.moves) / elapsed_time:.0f} moves/s")
+
+
+if __name__ == "__main__":
+    main()
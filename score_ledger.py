@@ -0,0 +1,116 @@
+ROUND_HEADER = 'Round'
+COLUMN_SEPARATOR = '  '
+
+
+class ScoreLedger:
+    def __init__(self):
+        """
+        Initialize a ScoreLedger object: the append-only history of the round scores, with the running totals.
+
+        Recording a round only updates the totals and appends one row to the rendered table, the totals line is
+        the only line rendered again for each message. The whole table is rendered again only when a column becomes
+        wider.
+        """
+        self.player_names = []
+        self.rounds = []
+        self.totals = {}
+        self.widths = []
+        # The header and the rows already rendered, without the totals line
+        self.rendered_rows = ''
+        self.rendered_message = None
+
+    def record_round(self, players_list, round_number):
+        """
+        Append the score of each player for a round.
+
+        Parameters:
+        - players_list (list): A list of Player objects, with the score of the round in score_round.
+        - round_number (int): The round which has been scored.
+        """
+        if not self.player_names:
+            # Columns sorted by name, like the pandas pivot table
+            self.player_names = sorted(player.name for player in players_list)
+            self.totals = dict.fromkeys(self.player_names, 0)
+            self.widths = [len(ROUND_HEADER)] + [len(name) for name in self.player_names]
+
+        scores_by_name = {player.name: int(player.score_round) for player in players_list}
+        # Rows are immutable, so they can be shared by the game snapshots (see game_state)
+        scores = tuple(scores_by_name.get(name) for name in self.player_names)
+        for name, score in zip(self.player_names, scores):
+            if score is not None:
+                self.totals[name] += score
+        self.rounds.append((int(round_number), scores))
+
+        cells = self._row_cells(round_number, scores)
+        total_cells = self._total_cells()
+        widths = [max(width, len(cell), len(total_cell))
+                  for width, cell, total_cell in zip(self.widths, cells, total_cells)]
+        if widths != self.widths or len(self.rounds) == 1:
+            # First round or a column is wider: render the header and the rows with the new widths
+            self.widths = widths
+            self._render_rows()
+        else:
+            self.rendered_rows += '\n' + self._render(cells)
+        self.rendered_message = None
+
+    def load_rounds(self, player_names, rounds):
+        """
+        Replace the history with saved rounds, when a game is restored.
+
+        Parameters:
+        - player_names (list): Names of the players, sorted like the columns.
+        - rounds (list): (round number, scores of the players) of each round.
+        """
+        self.player_names = list(player_names)
+        self.rounds = [(round_number, tuple(scores)) for round_number, scores in rounds]
+        self.totals = {name: sum(scores[index] or 0 for _, scores in self.rounds)
+                       for index, name in enumerate(self.player_names)}
+        self.widths = [len(ROUND_HEADER)] + [len(name) for name in self.player_names]
+        for each_round in self.rounds:
+            self.widths = [max(width, len(cell)) for width, cell in zip(self.widths, self._row_cells(*each_round))]
+        self.widths = [max(width, len(cell)) for width, cell in zip(self.widths, self._total_cells())]
+        self._render_rows()
+        self.rendered_message = None
+
+    def _render_rows(self):
+        """
+        Render the header and all the rows with the current widths.
+        """
+        self.rendered_rows = '\n'.join([self._render([ROUND_HEADER] + self.player_names)]
+                                        + [self._render(self._row_cells(*each_round)) for each_round in self.rounds])
+
+    def _row_cells(self, round_number, scores):
+        return [str(round_number)] + ['' if score is None else str(score) for score in scores]
+
+    def _total_cells(self):
+        return [''] + [str(self.totals[name]) for name in self.player_names]
+
+    def _render(self, cells):
+        return COLUMN_SEPARATOR.join(cell.rjust(width) for cell, width in zip(cells, self.widths))
+
+    def message(self):
+        """
+        Return the score table: one row per round and the total score of each player.
+
+        Returns:
+        - str: A formatted string representing the scores of players for each round, '' before the first round.
+        """
+        if not self.rounds:
+            return ''
+        if self.rendered_message is None:
+            self.rendered_message = self.rendered_rows + '\n' + self._render(self._total_cells())
+        return self.rendered_message
+
+    def to_dataframe(self):
+        """
+        Export the score history as a pandas DataFrame (pandas is only needed for this export).
+
+        Returns:
+        - pd.DataFrame: One row per round and one column per player, with a last row for the totals.
+        """
+        import pandas as pd
+
+        df = pd.DataFrame([scores for _, scores in self.rounds], columns=self.player_names,
+                          index=pd.Index([round_number for round_number, _ in self.rounds], name=ROUND_HEADER))
+        df.loc[''] = [self.totals[name] for name in self.player_names]
+        return df
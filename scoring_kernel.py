@@ -0,0 +1,94 @@
+import numpy as np
+
+from card_encoding import NUMBER_OF_CARDS, VALUE_FOR_COUNT_HAND
+from game_engine import ELIMINATION_SCORE_THRESHOLD
+
+
+# Value of each card id when counting a hand
+CARD_VALUES = np.array(VALUE_FOR_COUNT_HAND, dtype=np.int32)
+CARD_BITS = np.arange(NUMBER_OF_CARDS, dtype=np.uint64)
+PENALTY_FOR_ENDING_THE_ROUND = 25
+
+
+def hands_from_masks(hand_masks):
+    """
+    Convert hand bitmasks (Player.hand_mask) to a matrix of hands.
+
+    Parameters:
+    - hand_masks: Array of hand bitmasks of shape (games, players).
+
+    Returns:
+    - np.ndarray: Boolean array of shape (games, players, 54), True if the card is in the hand.
+    """
+    hand_masks = np.asarray(hand_masks, dtype=np.uint64)
+    return ((hand_masks[..., None] >> CARD_BITS) & np.uint64(1)).astype(bool)
+
+
+def hands_from_ids(card_ids):
+    """
+    Convert hands given as card ids to a matrix of hands.
+
+    Parameters:
+    - card_ids: Integer array of shape (games, players, cards), padded with -1 for the hands with fewer cards.
+
+    Returns:
+    - np.ndarray: Boolean array of shape (games, players, 54), True if the card is in the hand.
+    """
+    card_ids = np.asarray(card_ids)
+    hands = np.zeros(card_ids.shape[:-1] + (NUMBER_OF_CARDS + 1,), dtype=bool)
+    # The padding -1 goes to the last column, removed afterwards
+    np.put_along_axis(hands, np.where(card_ids < 0, NUMBER_OF_CARDS, card_ids), True, axis=-1)
+    return hands[..., :NUMBER_OF_CARDS]
+
+
+def hand_values(hands):
+    """
+    Calculate the value of every hand, like Player.count_hand.
+
+    Parameters:
+    - hands: Boolean array of shape (games, players, 54).
+
+    Returns:
+    - np.ndarray: Integer array of shape (games, players).
+    """
+    return np.asarray(hands, dtype=np.int32) @ CARD_VALUES
+
+
+def score_rounds(hands, player_who_ends, active, scores, elimination_score_threshold=ELIMINATION_SCORE_THRESHOLD):
+    """
+    Score many finished rounds at once, with the rules of Player.end_round (see game_engine.score_round):
+    - an opponent with a hand lower or equal to the player who ends the round gives this player 25 points,
+      and gets its hand only if it is negative,
+    - otherwise the opponent gets the value of its hand,
+    - the player who ends the round gets the value of its hand if it is negative.
+
+    Parameters:
+    - hands: Boolean array of shape (games, players, 54).
+    - player_who_ends: Integer array of shape (games,), index of the player who ended each round.
+    - active: Boolean array of shape (games, players), False for the players already eliminated.
+    - scores: Integer array of shape (games, players), the scores before the round.
+    - elimination_score_threshold (int): Score from which a player is eliminated.
+
+    Returns:
+    - tuple: Hand values (games, players), round score deltas (games, players), new scores (games, players),
+      and players eliminated by this round (games, players).
+    """
+    active = np.asarray(active, dtype=bool)
+    scores = np.asarray(scores)
+    player_who_ends = np.asarray(player_who_ends)
+    values = hand_values(hands)
+    games = np.arange(values.shape[0])
+
+    is_player_who_ends = np.zeros(values.shape, dtype=bool)
+    is_player_who_ends[games, player_who_ends] = True
+    opponents = active & ~is_player_who_ends
+    value_of_player_who_ends = values[games, player_who_ends]
+
+    beaten = opponents & (values <= value_of_player_who_ends[:, None])
+    deltas = np.where(beaten, np.minimum(values, 0), values) * opponents
+    deltas[games, player_who_ends] = (PENALTY_FOR_ENDING_THE_ROUND * beaten.sum(axis=1)
+                                      + np.minimum(value_of_player_who_ends, 0))
+
+    new_scores = scores + deltas
+    eliminated = active & (new_scores >= elimination_score_threshold)
+    return values, deltas, new_scores, eliminated
@@ -0,0 +1,225 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import Counter
+
+from bots import BOTS
+from game_engine import GameEngine, ELIMINATION_SCORE_THRESHOLD, NUMBER_TO_END_ROUND
+from player_class import Player
+
+
+SCORE_BIN_SIZE = 10
+DEFAULT_CHUNK_SIZE = 200
+
+
+def play_simulated_game(policies, seed, elimination_score_threshold=ELIMINATION_SCORE_THRESHOLD,
+                        number_to_end_round=NUMBER_TO_END_ROUND, replay_directory=None):
+    """
+    Play a complete game between bots, without user interface.
+
+    Parameters:
+    - policies (list): Name of the bot of each seat (keys of bots.BOTS), the first seat starts the game.
+    - seed: Seed of the game, the bots get their own seeds derived from it.
+    - elimination_score_threshold (int): Score from which a player is eliminated.
+    - number_to_end_round (int): Maximum value of a hand to be allowed to end the round.
+    - replay_directory (str): Directory where the replay of the game is written (see replay.py), None to not record.
+
+    Returns:
+    - tuple: Index of the winning seat (None if all the players are eliminated), number of rounds played,
+      and final score of each seat.
+    """
+    rng = random.Random(seed)
+
+    players_list = [Player(f'Seat{index + 1}') for index in range(len(policies))]
+    providers = {player.name: BOTS[policy](seed=rng.getrandbits(64)) for player, policy in zip(players_list, policies)}
+    engine = GameEngine(players_list, elimination_score_threshold, number_to_end_round, seed=rng.getrandbits(64))
+    if replay_directory is not None:
+        from replay import ReplayRecorder
+
+        replay_recorder = ReplayRecorder(engine)
+    engine.play_game(providers)
+    if replay_directory is not None:
+        replay_recorder.save(os.path.join(replay_directory, f'{engine.seed:016x}.nine'))
+
+    winner = None
+    for index, player in enumerate(players_list):
+        if not player.is_eliminate:
+            winner = index
+    return winner, engine.round_number, [player.score for player in players_list]
+
+
+def new_results(policies):
+    """
+    Create empty aggregated results of simulations.
+
+    Parameters:
+    - policies (list): Name of the bot of each seat.
+
+    Returns:
+    - dict: The empty results.
+    """
+    return {
+        'policies': list(policies),
+        'games': 0,
+        'rounds': 0,
+        'no_winner': 0,
+        'wins': [0] * len(policies),
+        'score_distribution': [Counter() for _ in policies],
+    }
+
+
+def merge_results(results, other_results):
+    """
+    Add the results of a chunk of games to the aggregated results.
+
+    Parameters:
+    - results (dict): The aggregated results, updated in place.
+    - other_results (dict): The results to add.
+    """
+    results['games'] += other_results['games']
+    results['rounds'] += other_results['rounds']
+    results['no_winner'] += other_results['no_winner']
+    for index in range(len(results['wins'])):
+        results['wins'][index] += other_results['wins'][index]
+        results['score_distribution'][index].update(other_results['score_distribution'][index])
+
+
+def summarize_results(results):
+    """
+    Compute win rates, average rounds per game and score distributions from aggregated results.
+
+    Parameters:
+    - results (dict): The aggregated results.
+
+    Returns:
+    - dict: The summary, which can be written as JSON.
+    """
+    games = max(results['games'], 1)
+    return {
+        'policies': results['policies'],
+        'games': results['games'],
+        'average_rounds_per_game': results['rounds'] / games,
+        'win_rates': [wins / games for wins in results['wins']],
+        'no_winner_rate': results['no_winner'] / games,
+        'score_distribution': [
+            {f'{score_bin}-{score_bin + SCORE_BIN_SIZE - 1}': count for score_bin, count in sorted(distribution.items())}
+            for distribution in results['score_distribution']
+        ],
+    }
+
+
+def simulate_chunk(arguments):
+    """
+    Play a chunk of games in a worker process.
+
+    Parameters:
+    - arguments (tuple): Policies, seed of the chunk, number of games, elimination threshold, number to end round,
+      replay directory.
+
+    Returns:
+    - dict: The results of the chunk.
+    """
+    policies, chunk_seed, number_of_games, elimination_score_threshold, number_to_end_round, replay_directory = arguments
+    rng = random.Random(chunk_seed)
+    results = new_results(policies)
+    for _ in range(number_of_games):
+        winner, rounds, scores = play_simulated_game(policies, rng.getrandbits(64), elimination_score_threshold,
+                                                     number_to_end_round, replay_directory)
+        results['games'] += 1
+        results['rounds'] += rounds
+        if winner is None:
+            results['no_winner'] += 1
+        else:
+            results['wins'][winner] += 1
+        for index, score in enumerate(scores):
+            results['score_distribution'][index][score // SCORE_BIN_SIZE * SCORE_BIN_SIZE] += 1
+    return results
+
+
+def iter_simulate(number_of_games, policies, seed=0, processes=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                  elimination_score_threshold=ELIMINATION_SCORE_THRESHOLD, number_to_end_round=NUMBER_TO_END_ROUND,
+                  replay_directory=None):
+    """
+    Play games between bots on a pool of processes, and yield the aggregated results each time a chunk of games
+    is finished.
+
+    Each chunk has its own seed derived from the seed of the simulation, so the results do not depend on the
+    number of processes.
+
+    Parameters:
+    - number_of_games (int): Number of games to play.
+    - policies (list): Name of the bot of each seat (keys of bots.BOTS).
+    - seed: Seed of the simulation.
+    - processes (int): Number of worker processes, the number of CPUs by default.
+    - chunk_size (int): Number of games played by a worker before sending its results.
+    - elimination_score_threshold (int): Score from which a player is eliminated.
+    - number_to_end_round (int): Maximum value of a hand to be allowed to end the round.
+    - replay_directory (str): Directory where the replays of the games are written, None to not record them.
+
+    Yields:
+    - dict: The aggregated results so far (see summarize_results).
+    """
+    chunks = []
+    for chunk_index, first_game in enumerate(range(0, number_of_games, chunk_size)):
+        chunks.append((list(policies), f'{seed}-{chunk_index}', min(chunk_size, number_of_games - first_game),
+                       elimination_score_threshold, number_to_end_round, replay_directory))
+
+    results = new_results(policies)
+    with multiprocessing.Pool(processes) as pool:
+        for chunk_results in pool.imap_unordered(simulate_chunk, chunks):
+            merge_results(results, chunk_results)
+            yield results
+
+
+def simulate(number_of_games, policies, seed=0, processes=None, chunk_size=DEFAULT_CHUNK_SIZE,
+             elimination_score_threshold=ELIMINATION_SCORE_THRESHOLD, number_to_end_round=NUMBER_TO_END_ROUND,
+             replay_directory=None):
+    """
+    Play games between bots on a pool of processes and return the summary of the results.
+
+    Parameters: see iter_simulate.
+
+    Returns:
+    - dict: Win rates, average rounds per game and score distributions.
+    """
+    results = new_results(policies)
+    for results in iter_simulate(number_of_games, policies, seed, processes, chunk_size,
+                                 elimination_score_threshold, number_to_end_round, replay_directory):
+        pass
+    return summarize_results(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate Nine-Game games between bots.")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--policies', nargs='+', default=['random', 'random', 'random', 'random'],
+                        choices=sorted(BOTS), help="bot of each seat")
+    parser.add_argument('--seed', default=0, help="seed of the simulation")
+    parser.add_argument('--processes', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="games per worker task")
+    parser.add_argument('--elimination-score-threshold', type=int, default=ELIMINATION_SCORE_THRESHOLD)
+    parser.add_argument('--number-to-end-round', type=int, default=NUMBER_TO_END_ROUND)
+    parser.add_argument('--replay-directory', default=None, help="directory where the replays of the games are written")
+    arguments = parser.parse_args()
+    if arguments.replay_directory is not None:
+        os.makedirs(arguments.replay_directory, exist_ok=True)
+
+    start = time.perf_counter()
+    results = new_results(arguments.policies)
+    for results in iter_simulate(arguments.games, arguments.policies, arguments.seed, arguments.processes,
+                                 arguments.chunk_size, arguments.elimination_score_threshold,
+                                 arguments.number_to_end_round, arguments.replay_directory):
+        elapsed = time.perf_counter() - start
+        summary = summarize_results(results)
+        win_rates = ' '.join(f'{win_rate:.3f}' for win_rate in summary['win_rates'])
+        print(f"{results['games']} games ({results['games'] / elapsed:.0f} games/s) win rates: {win_rates} "
+              f"rounds/game: {summary['average_rounds_per_game']:.2f}", flush=True)
+
+    print(json.dumps(summarize_results(results), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import pytest
+
+from bots import GreedyBot, RandomBot
+from card_encoding import sorted_hand_ids
+from change_tracker import versions_of
+from game_engine import GameEngine
+from interface_function import format_players_score_table, table_players_score_end_of_round_and_game
+from lobby import LobbyTable, state_diff
+from player_class import Player
+
+
+NUMBER_OF_GAMES = 200
+NUMBER_OF_SEATS = 4
+REMOTE_PLAYERS = {'Player1', 'Player3'}
+
+
+class FullStateReference:
+    def __init__(self, table):
+        """
+        Initialize a FullStateReference object: what the table should send, found by comparing the whole public
+        state and all the hands after each change, without the versions.
+        """
+        self.table = table
+        self.public_state = {}
+        self.hands = {}
+
+    def public_diff(self):
+        public_state = self.table.public_state()
+        diff = state_diff(self.public_state, public_state)
+        self.public_state = public_state
+        return diff
+
+    def hand_changes(self):
+        changes = {}
+        for player in self.table.players_list:
+            if player.name in REMOTE_PLAYERS and self.hands.get(player.name) != player.hand_mask:
+                self.hands[player.name] = player.hand_mask
+                changes[player.name] = sorted_hand_ids(player.hand_mask)
+        return changes
+
+
+@pytest.mark.parametrize('first_seed', range(0, NUMBER_OF_GAMES, NUMBER_OF_GAMES // 4))
+def test_versions_find_every_change(first_seed):
+    """
+    Play seeded games with bots: the changes found with the versions (public_diff, hand_changes and the memoized
+    score table) must be the changes found by comparing the whole state after every move.
+    """
+    for seed in range(first_seed, first_seed + NUMBER_OF_GAMES // 4):
+        table = LobbyTable('table', NUMBER_OF_SEATS)
+        for index in range(NUMBER_OF_SEATS):
+            table.add_player(f'Player{index + 1}')
+        table.remote_players = set(REMOTE_PLAYERS)
+        engine = table.engine = GameEngine(table.players_list, seed=seed)
+        bots = {player.name: RandomBot(seed * NUMBER_OF_SEATS + index) if index % 2 else GreedyBot()
+                for index, player in enumerate(table.players_list)}
+        reference = FullStateReference(table)
+
+        def check():
+            assert table.public_diff() == reference.public_diff(), seed
+            assert table.hand_changes() == reference.hand_changes(), seed
+            assert table_players_score_end_of_round_and_game(engine.players_list) == \
+                format_players_score_table(engine.players_list), seed
+
+        while not engine.is_game_over():
+            engine.start_round()
+            check()
+            while not engine.round_over:
+                player = engine.current_player()
+                engine.apply_move(bots[player.name].choose_move(engine, player))
+                check()
+
+
+def test_only_real_changes_are_recorded():
+    players_list = [Player('Player1'), Player('Player2')]
+    engine = GameEngine(players_list, seed=0)
+    version = engine.change_tracker.version
+    score_versions = versions_of(players_list, 'score')
+
+    players_list[0].score += 0
+    assert engine.change_tracker.version == version
+    players_list[0].score += 3
+    assert engine.change_tracker.version == version + 1
+    assert versions_of(players_list, 'score') == (version + 1, score_versions[1])
+    assert players_list[0].version_of('score', 'hand_mask') == version + 1
+
+
+def test_memoize_renders_again_only_for_a_new_version():
+    change_tracker = GameEngine([Player('Player1'), Player('Player2')], seed=0).change_tracker
+    renders = []
+
+    def render():
+        renders.append(len(renders))
+        return len(renders)
+
+    assert change_tracker.memoize('key', 1, render) == 1
+    assert change_tracker.memoize('key', 1, render) == 1
+    assert change_tracker.memoize('key', 2, render) == 2
+    assert renders == [0, 1]
+
+
+def test_players_have_no_other_attributes():
+    with pytest.raises(AttributeError):
+        Player('Player1').unknown_attribute = 1
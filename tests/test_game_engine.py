@@ -0,0 +1,41 @@
+import pytest
+
+from bots import RandomBot
+from game_engine import GameEngine
+from player_class import Player
+
+
+def original_round_starter(players_list, round_number):
+    """
+    The player who starts a round in the original game: main.play_game rotated its players list by one seat after
+    every round, and the first player of the list still in game played first.
+    """
+    rotation = (round_number - 1) % len(players_list)
+    rotated_players = players_list[rotation:] + players_list[:rotation]
+    return next(player for player in rotated_players if not player.is_eliminate)
+
+
+@pytest.mark.parametrize('number_of_players', [2, 3, 4, 6])
+def test_rounds_are_started_by_each_seat_in_turn(number_of_players):
+    for seed in range(30):
+        players_list = [Player(f'Player{index + 1}') for index in range(number_of_players)]
+        engine = GameEngine(players_list, elimination_score_threshold=60, seed=seed)
+        bot = RandomBot(seed)
+        while not engine.is_game_over():
+            engine.start_round()
+            assert engine.current_player() is original_round_starter(players_list, engine.round_number), seed
+            while not engine.round_over:
+                engine.apply_move(bot.choose_move(engine, engine.current_player()))
+
+
+def test_starters_do_not_depend_on_who_ends_the_round():
+    players_list = [Player(name) for name in 'ABCD']
+    engine = GameEngine(players_list, seed=3)
+    bot = RandomBot(3)
+    starters = []
+    for _ in range(6):
+        engine.start_round()
+        starters.append(engine.current_player().name)
+        while not engine.round_over:
+            engine.apply_move(bot.choose_move(engine, engine.current_player()))
+    assert starters == ['A', 'B', 'C', 'D', 'A', 'B']
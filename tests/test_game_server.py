@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+from game_engine import IllegalMoveError, PICK_DECK
+from game_server import GameServer, move_from_data
+
+
+@pytest.mark.parametrize('data', [
+    None,
+    ['cards'],
+    {'cards': 'abc', 'pick': PICK_DECK},
+    {'cards': {'3': 3}, 'pick': PICK_DECK},
+    {'cards': ['x'], 'pick': PICK_DECK},
+    {'cards': [None], 'pick': PICK_DECK},
+    {'cards': [1.5], 'pick': PICK_DECK},
+    {'cards': [True], 'pick': PICK_DECK},
+    {'cards': [-1], 'pick': PICK_DECK},
+    {'cards': [3]},
+    {'cards': [3], 'pick': ['deck']},
+])
+def test_malformed_moves_are_illegal(data):
+    with pytest.raises(IllegalMoveError):
+        move_from_data(data)
+
+
+def test_well_formed_move():
+    move = move_from_data({'cards': [3, 16], 'pick': PICK_DECK})
+    assert (list(move.cards_played), move.pick) == ([3, 16], PICK_DECK)
+
+
+@pytest.mark.parametrize('data', [
+    None,
+    'table',
+    {},
+    {'table_id': 'table'},
+    {'table_id': 'table', 'name': None},
+    {'table_id': 'table', 'name': ['Player1']},
+    {'table_id': ['table'], 'name': 'Player1'},
+])
+def test_malformed_seats_are_answered_with_an_error(data):
+    async def seat():
+        server = GameServer()
+        server.table_manager.create_table(2, 'table')
+        return (await server.on_join_table('sid', data), await server.on_add_bot('sid', data),
+                await server.on_start_game('sid', data))
+
+    for answer in asyncio.run(seat()):
+        assert 'error' in answer
+
+
+def test_unknown_bot_is_answered_with_an_error():
+    async def seat():
+        server = GameServer()
+        server.table_manager.create_table(2, 'table')
+        return await server.on_add_bot('sid', {'table_id': 'table', 'name': 'Bot1', 'bot': {'random': 1}})
+
+    assert 'error' in asyncio.run(seat())
@@ -0,0 +1,40 @@
+import msgspec
+import pytest
+
+from bots import RandomBot
+from game_engine import GameEngine
+from game_state import (GAME_STATE_FORMAT_VERSION, decode_game_state, encode_game_state, restore_game,
+                        snapshot_game)
+from player_class import Player
+
+
+def test_restored_game_keeps_the_seats_and_the_cards():
+    """
+    Snapshot seeded games before every move: the restored game keeps the seats, the turn, the order of play and
+    the cards.
+    """
+    for seed in range(20):
+        engine = GameEngine([Player(f'Player{index + 1}') for index in range(4)], elimination_score_threshold=60,
+                            seed=seed)
+        bot = RandomBot(seed)
+        while not engine.is_game_over():
+            if engine.round_over:
+                engine.start_round()
+            restored = restore_game(decode_game_state(encode_game_state(snapshot_game(engine))))
+            assert [player.name for player in restored.players_list] == \
+                [player.name for player in engine.players_list]
+            assert restored.current_player().name == engine.current_player().name
+            assert [player.name for player in restored.active_players()] == \
+                [player.name for player in engine.active_players()]
+            assert (restored.deck, restored.pile) == (engine.deck, engine.pile)
+            engine.apply_move(bot.choose_move(engine, engine.current_player()))
+
+
+def test_other_formats_are_rejected():
+    engine = GameEngine([Player('Player1'), Player('Player2')], seed=0)
+    engine.start_round()
+    state = snapshot_game(engine)
+    with pytest.raises(ValueError):
+        restore_game(msgspec.structs.replace(state, version=GAME_STATE_FORMAT_VERSION - 1))
+    with pytest.raises(ValueError):
+        decode_game_state(msgspec.msgpack.encode([GAME_STATE_FORMAT_VERSION + 1, 'another format']))
@@ -0,0 +1,78 @@
+import random
+
+import pytest
+
+from card_encoding import JOKER1, NUMBER_OF_RANKS, is_valid_play, mask_from_ids
+from legal_plays import legal_plays, playable_cards
+
+
+def reference_is_valid_play(card_ids):
+    """
+    The rules of the original board, from the ranks and suits of the cards: one card, cards with the same value
+    (the two jokers together), or at least 3 cards of the same suit following each other.
+    """
+    if len(card_ids) == 1:
+        return True
+    values = {'Joker' if card_id >= JOKER1 else card_id % NUMBER_OF_RANKS for card_id in card_ids}
+    if len(values) == 1:
+        return True
+    if 'Joker' in values or len({card_id // NUMBER_OF_RANKS for card_id in card_ids}) != 1:
+        return False
+    return len(card_ids) >= 3 and max(values) - min(values) == len(card_ids) - 1
+
+
+def brute_force_plays(hand_ids):
+    """
+    Returns:
+    - set: Bitmask of every subset of the hand allowed by reference_is_valid_play.
+    """
+    plays = set()
+    for subset in range(1, 1 << len(hand_ids)):
+        card_ids = [card_id for index, card_id in enumerate(hand_ids) if subset >> index & 1]
+        if reference_is_valid_play(card_ids):
+            plays.add(mask_from_ids(card_ids))
+    return plays
+
+
+def random_hands(seed, number_of_hands):
+    rng = random.Random(seed)
+    for _ in range(number_of_hands):
+        if rng.random() < 0.3:
+            # Hands with many cards of one suit, to have long runs
+            suit = rng.randrange(4)
+            yield [suit * NUMBER_OF_RANKS + rank for rank in rng.sample(range(NUMBER_OF_RANKS), rng.randint(1, 9))]
+        else:
+            yield rng.sample(range(JOKER1 + 2), rng.choice([1, 2, 3, 4, 5, 5, 5, 8, 10]))
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_legal_plays_match_brute_force(seed):
+    for hand_ids in random_hands(seed, 2000):
+        plays = legal_plays(mask_from_ids(hand_ids))
+        assert len(plays) == len(set(plays))
+        assert set(plays) == brute_force_plays(hand_ids), hand_ids
+
+
+def test_legal_plays_match_is_valid_play():
+    for hand_ids in random_hands(10, 2000):
+        hand_mask = mask_from_ids(hand_ids)
+        subset = hand_mask
+        valid_plays = set()
+        while subset:
+            if is_valid_play(subset):
+                valid_plays.add(subset)
+            subset = (subset - 1) & hand_mask
+        assert set(legal_plays(hand_mask)) == valid_plays, hand_ids
+
+
+def test_playable_cards_match_brute_force():
+    rng = random.Random(20)
+    for hand_ids in random_hands(20, 1000):
+        hand_mask = mask_from_ids(hand_ids)
+        selected_ids = rng.sample(hand_ids, rng.randint(0, min(len(hand_ids), 3)))
+        selected_mask = mask_from_ids(selected_ids)
+        expected = 0
+        for play in brute_force_plays(hand_ids):
+            if play & selected_mask == selected_mask:
+                expected |= play
+        assert playable_cards(hand_mask, selected_mask) == expected & ~selected_mask, (hand_ids, selected_ids)
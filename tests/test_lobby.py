@@ -0,0 +1,32 @@
+import asyncio
+import time
+
+from bots import RandomBot
+from lobby import TableManager
+
+
+def test_a_table_of_bots_is_not_idle():
+    """
+    The moves of the bots count as activity: a table playing without remote players is not evicted.
+    """
+    async def play():
+        states = []
+
+        async def listener(table, event, data):
+            if event == 'state':
+                states.append(event)
+
+        manager = TableManager(listener=listener, idle_timeout=60)
+        table = manager.create_table(4)
+        for index in range(4):
+            table.add_player(f'Bot{index + 1}', bot=RandomBot(seed=index))
+        manager.start_table(table.table_id)
+        table.last_activity = time.monotonic() - 120
+        # The first state is the start of the round, the next ones follow the moves
+        while len(states) < 3:
+            await asyncio.sleep(0)
+        evicted = await manager.evict_idle_tables()
+        await manager.close_table(table.table_id)
+        return evicted
+
+    assert asyncio.run(play()) == []
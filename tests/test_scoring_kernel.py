@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+from card_encoding import NUMBER_OF_CARDS, hand_value, mask_from_ids
+from game_engine import ELIMINATION_SCORE_THRESHOLD, eliminate_players, score_round
+from player_class import Player
+from scoring_kernel import hands_from_ids, hands_from_masks, score_rounds
+
+
+NUMBER_OF_ROUNDS = 2000
+
+
+def random_rounds(seed, number_of_players):
+    """
+    Deal random finished rounds: hands of 1 to 5 cards, scores below the threshold, some players eliminated.
+
+    Returns:
+    - tuple: Hand card ids (rounds, players, 5) padded with -1, index of the player who ends each round, active
+      players (rounds, players) and scores (rounds, players).
+    """
+    rng = random.Random(seed)
+    card_ids = -np.ones((NUMBER_OF_ROUNDS, number_of_players, 5), dtype=int)
+    active = np.ones((NUMBER_OF_ROUNDS, number_of_players), dtype=bool)
+    player_who_ends = np.zeros(NUMBER_OF_ROUNDS, dtype=int)
+    scores = np.zeros((NUMBER_OF_ROUNDS, number_of_players), dtype=int)
+    for game in range(NUMBER_OF_ROUNDS):
+        deck = rng.sample(range(NUMBER_OF_CARDS), NUMBER_OF_CARDS)
+        for player in range(number_of_players):
+            number_of_cards = rng.randint(1, 5)
+            card_ids[game, player, :number_of_cards] = deck[:number_of_cards]
+            del deck[:number_of_cards]
+            scores[game, player] = rng.randrange(ELIMINATION_SCORE_THRESHOLD)
+            active[game, player] = rng.random() > 0.2
+        if not active[game].any():
+            active[game, 0] = True
+        player_who_ends[game] = rng.choice(np.flatnonzero(active[game]).tolist())
+    return card_ids, player_who_ends, active, scores
+
+
+@pytest.mark.parametrize('number_of_players', [2, 3, 4, 6])
+def test_score_rounds_matches_score_round(number_of_players):
+    card_ids, player_who_ends, active, scores = random_rounds(number_of_players, number_of_players)
+    hands = hands_from_ids(card_ids)
+    values, deltas, new_scores, eliminated = score_rounds(hands, player_who_ends, active, scores)
+
+    for game in range(NUMBER_OF_ROUNDS):
+        players_list = []
+        for index in range(number_of_players):
+            player = Player(f'Player{index + 1}')
+            player.hand_mask = mask_from_ids(card_id for card_id in card_ids[game, index] if card_id >= 0)
+            player.score = int(scores[game, index])
+            player.is_eliminate = not active[game, index]
+            players_list.append(player)
+        score_round(players_list, players_list[player_who_ends[game]])
+        eliminated_players = eliminate_players(players_list)
+
+        assert values[game].tolist() == [hand_value(player.hand_mask) for player in players_list]
+        assert new_scores[game].tolist() == [player.score for player in players_list]
+        # The players already eliminated do not play the round
+        assert deltas[game].tolist() == [player.score_round if is_active else 0
+                                         for player, is_active in zip(players_list, active[game])]
+        assert eliminated[game].tolist() == [player in eliminated_players for player in players_list]
+
+
+def test_hands_from_masks_matches_hands_from_ids():
+    card_ids, _, _, _ = random_rounds(0, 4)
+    hand_masks = np.array([[mask_from_ids(card_id for card_id in hand if card_id >= 0) for hand in game]
+                           for game in card_ids], dtype=np.uint64)
+    assert (hands_from_masks(hand_masks) == hands_from_ids(card_ids)).all()
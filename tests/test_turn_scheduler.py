@@ -0,0 +1,28 @@
+import pytest
+
+from turn_scheduler import TurnScheduler
+
+
+def test_advance_skips_the_removed_seats():
+    turn_scheduler = TurnScheduler([True, True, True, True])
+    turn_scheduler.remove(1)
+    assert [turn_scheduler.advance() for _ in range(4)] == [2, 3, 0, 2]
+    assert turn_scheduler.seats_from(1) == [2, 3, 0]
+
+
+def test_turn_goes_on_from_a_removed_current_seat():
+    turn_scheduler = TurnScheduler([True, True, True, True], current_seat=2)
+    # The player who ends the round is eliminated, then the player after it
+    turn_scheduler.remove(2)
+    turn_scheduler.remove(3)
+    assert turn_scheduler.next_to_act() == 0
+    assert turn_scheduler.seats_from(2) == [0, 1]
+
+
+def test_next_to_act_without_active_seat_raises():
+    turn_scheduler = TurnScheduler([True, True, True])
+    for seat in range(3):
+        turn_scheduler.remove(seat)
+    with pytest.raises(ValueError):
+        turn_scheduler.next_to_act()
+    assert turn_scheduler.seats_from(0) == []
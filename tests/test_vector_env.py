@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+
+from card_encoding import NUMBER_OF_CARDS, mask_from_ids
+from game_engine import GameEngine, IllegalMoveError
+from legal_plays import legal_plays
+from player_class import Player
+from turn_scheduler import TurnScheduler
+from vector_env import (END_ROUND_ACTION, NUMBER_OF_ACTIONS, NUMBER_OF_PLAYS, PASS_ACTION, PLAYS, VectorGameEnv,
+                        action_from_move, move_from_action, random_legal_actions)
+
+
+NUMBER_OF_GAMES = 16
+NUMBER_OF_STEPS = 600
+
+
+def mirror_engine(env, game):
+    """
+    Returns:
+    - GameEngine: A GameEngine in the state of a game of the environment, during a round.
+    """
+    players_list = [Player(f'Seat{seat}') for seat in range(env.number_of_players)]
+    for seat, player in enumerate(players_list):
+        player.restore(int(env.hands[game, seat]), int(env.scores[game, seat]), 0, int(env.passes[game, seat]),
+                       not env.active[game, seat], 0, False)
+    engine = GameEngine(players_list, env.elimination_score_threshold, env.number_to_end_round)
+    engine.turn_scheduler = TurnScheduler(env.active[game].tolist(), int(env.current_seat[game]))
+    engine.deck = env.deck[game, :env.deck_size[game]].tolist()
+    engine.pile = env.pile[game, :env.pile_size[game]].tolist()
+    engine.round_number = int(env.round_number[game])
+    engine.round_start_seat = int(env.round_start_seat[game])
+    engine.round_over = False
+    return engine
+
+
+def check_action_mask(engine, action_mask):
+    player = engine.current_player()
+    plays = {PLAYS[action] for action in np.flatnonzero(action_mask[:NUMBER_OF_PLAYS])}
+    assert plays == set(legal_plays(player.hand_mask))
+    # Every play can pick from the deck or from the pile
+    assert (action_mask[:NUMBER_OF_PLAYS] == action_mask[NUMBER_OF_PLAYS:2 * NUMBER_OF_PLAYS]).all()
+    assert action_mask[PASS_ACTION] == engine.can_pass(player)
+    assert action_mask[END_ROUND_ACTION] == engine.can_end_round(player)
+
+
+@pytest.mark.parametrize('number_of_players', [2, 3, 4, 6])
+def test_vector_env_matches_game_engine(number_of_players):
+    """
+    Play seeded random games and apply every move to a GameEngine in the same state: the hands, the deck, the
+    pile, the turn, the scores, the passes, the eliminations and the legal actions must be the same.
+    """
+    env = VectorGameEnv(NUMBER_OF_GAMES, number_of_players)
+    observations, info = env.reset(number_of_players)
+    rng = np.random.default_rng(number_of_players)
+    number_of_rounds = 0
+
+    for _ in range(NUMBER_OF_STEPS):
+        engines = [None if env.game_over[game] else mirror_engine(env, game) for game in range(NUMBER_OF_GAMES)]
+        for game, engine in enumerate(engines):
+            if engine is not None:
+                check_action_mask(engine, info['action_mask'][game])
+                player = engine.current_player()
+                assert observations[game, :NUMBER_OF_CARDS].sum() == player.hand_mask.bit_count()
+                assert observations[game, NUMBER_OF_CARDS + engine.pile[-1]] == 1
+
+        deck_sizes = env.deck_size.copy()
+        actions = random_legal_actions(info['action_mask'], rng)
+        # End half of the rounds as soon as possible, to play many rounds and eliminations
+        end_rounds = info['action_mask'][:, END_ROUND_ACTION] & (rng.random(NUMBER_OF_GAMES) < 0.5)
+        actions[end_rounds] = END_ROUND_ACTION
+        observations, rewards, terminated, truncated, info = env.step(actions)
+
+        for game, engine in enumerate(engines):
+            if engine is None:
+                assert info['reset'][game] and env.round_number[game] == 1
+                continue
+            scores_before = [player.score for player in engine.players_list]
+            engine.apply_move(move_from_action(actions[game]))
+            assert env.scores[game].tolist() == [player.score for player in engine.players_list]
+            assert (-rewards[game]).tolist() == [player.score - score
+                                                 for player, score in zip(engine.players_list, scores_before)]
+            assert env.active[game].tolist() == [not player.is_eliminate for player in engine.players_list]
+            assert env.passes[game].tolist() == [player.number_of_pass for player in engine.players_list]
+
+            if engine.round_over:
+                number_of_rounds += 1
+                assert info['round_over'][game]
+                assert terminated[game] == engine.is_game_over()
+                if not engine.is_game_over():
+                    # The next round starts with the next player, the deck is dealt to the active players
+                    engine.start_round()
+                    assert env.current_seat[game] == engine.turn_scheduler.current_seat
+                    assert (env.hands[game] != 0).sum() == engine.turn_scheduler.number_of_active_seats
+                    assert env.deck_size[game] == len(engine.deck) and env.pile_size[game] == 1
+                continue
+
+            assert env.hands[game].tolist() == [player.hand_mask for player in engine.players_list]
+            assert env.current_seat[game] == engine.turn_scheduler.current_seat
+            assert int(env.pile_masks[game]) == mask_from_ids(engine.pile)
+            if deck_sizes[game] == 1 and actions[game] < NUMBER_OF_PLAYS:
+                # The pile was recycled, shuffled by a different random generator
+                assert env.pile[game, :env.pile_size[game]].tolist() == engine.pile
+                assert sorted(env.deck[game, :env.deck_size[game]].tolist()) == sorted(engine.deck)
+            else:
+                assert env.pile[game, :env.pile_size[game]].tolist() == engine.pile
+                assert env.deck[game, :env.deck_size[game]].tolist() == engine.deck
+
+    assert number_of_rounds > NUMBER_OF_GAMES
+
+
+def test_reset_with_the_same_seed_gives_the_same_games():
+    results = []
+    for _ in range(2):
+        env = VectorGameEnv(NUMBER_OF_GAMES, 4)
+        observations, info = env.reset(7)
+        rng = np.random.default_rng(7)
+        for _ in range(100):
+            observations, rewards, _, _, info = env.step(random_legal_actions(info['action_mask'], rng))
+        results.append((observations, env.scores.copy(), env.hands.copy()))
+    for first, second in zip(*results):
+        assert (first == second).all()
+
+
+def test_actions_and_moves_round_trip():
+    for action in range(NUMBER_OF_ACTIONS):
+        assert action_from_move(move_from_action(action)) == action
+
+
+def test_illegal_action_is_rejected():
+    env = VectorGameEnv(2, 3)
+    _, info = env.reset(0)
+    actions = random_legal_actions(info['action_mask'], np.random.default_rng(0))
+    illegal_actions = np.flatnonzero(~info['action_mask'][1])
+    actions[1] = illegal_actions[0]
+    with pytest.raises(IllegalMoveError):
+        env.step(actions)
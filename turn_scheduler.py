@@ -0,0 +1,107 @@
+class TurnScheduler:
+    def __init__(self, active_seats, current_seat=0):
+        """
+        Initialize a TurnScheduler object: the order of play of a game, as a ring of the active seats.
+
+        Each seat keeps the number of the next active seat, so giving the turn to the next player and removing an
+        eliminated player only change a few numbers, the list of players is never rebuilt. A removed seat keeps
+        its next seat, so the turn can still go from an eliminated player (the player who ended the round) to the
+        player after it.
+
+        Parameters:
+        - active_seats (list): For each seat, in order of play, True if the player of the seat is not eliminated.
+        - current_seat (int): The seat of the player who has to play, it can be an eliminated seat.
+        """
+        number_of_seats = len(active_seats)
+        self.active = list(active_seats)
+        self.number_of_active_seats = sum(self.active)
+        self.current_seat = current_seat
+        self.next_seat = list(range(number_of_seats))
+        self.previous_seat = list(range(number_of_seats))
+
+        # Link each seat to the next active seat, and each active seat to the previous active seat
+        active_seat_numbers = [seat for seat in range(number_of_seats) if self.active[seat]]
+        if active_seat_numbers:
+            next_active = active_seat_numbers[0]
+            for seat in reversed(range(number_of_seats)):
+                self.next_seat[seat] = next_active
+                if self.active[seat]:
+                    next_active = seat
+            for index, seat in enumerate(active_seat_numbers):
+                self.previous_seat[seat] = active_seat_numbers[index - 1]
+
+    def is_active(self, seat):
+        """
+        Returns:
+        - bool: True if the player of the seat is not eliminated.
+        """
+        return self.active[seat]
+
+    def next_active_seat(self, seat):
+        """
+        Return the first active seat after a seat, raise ValueError if no seat is active.
+
+        Parameters:
+        - seat (int): The seat, active or not.
+
+        Returns:
+        - int: The next active seat, the seat itself if it is the only active seat.
+        """
+        # Only a seat removed after the given seat was removed can be inactive, at most one turn of the ring
+        for _ in range(len(self.active)):
+            seat = self.next_seat[seat]
+            if self.active[seat]:
+                return seat
+        raise ValueError("No seat is active")
+
+    def next_to_act(self):
+        """
+        Returns:
+        - int: The seat of the player who plays after the current player.
+        """
+        return self.next_active_seat(self.current_seat)
+
+    def advance(self):
+        """
+        Give the turn to the next active seat.
+
+        Returns:
+        - int: The new current seat.
+        """
+        self.current_seat = self.next_to_act()
+        return self.current_seat
+
+    def remove(self, seat):
+        """
+        Remove the seat of an eliminated player from the order of play. The current seat does not change.
+
+        Parameters:
+        - seat (int): The seat to remove.
+        """
+        if not self.active[seat]:
+            return
+        previous_seat = self.previous_seat[seat]
+        next_seat = self.next_seat[seat]
+        self.next_seat[previous_seat] = next_seat
+        self.previous_seat[next_seat] = previous_seat
+        self.active[seat] = False
+        self.number_of_active_seats -= 1
+
+    def seats_from(self, seat):
+        """
+        Return the active seats in order of play, starting at a seat (included only if it is active).
+
+        Parameters:
+        - seat (int): The first seat.
+
+        Returns:
+        - list: The seat numbers.
+        """
+        if not self.number_of_active_seats:
+            return []
+        if not self.active[seat]:
+            seat = self.next_active_seat(seat)
+        seats = [seat]
+        for _ in range(self.number_of_active_seats - 1):
+            seats.append(self.next_seat[seats[-1]])
+        return seats
@@ -0,0 +1,210 @@
+import argparse
+import fnmatch
+import multiprocessing
+import os
+import sys
+import time
+
+import msgspec
+
+from card_encoding import id_to_card, stack_from_mask
+from game_engine import PICK_DECK, PICK_PILE, GameEngine, IllegalMoveError
+from player_class import Player
+from replay import load_replay, move_from_record, replay_scores
+
+
+REPLAY_FILE_PATTERN = '*.nine'
+DEFAULT_CHUNK_SIZE = 16
+PROGRESS_INTERVAL = 1000
+# Order of the ranks in a run, as in interface_function.click_to_play_cards (the Ace is low, the jokers have none)
+RUN_RANKS = {"Ace": 1, "2": 2, "3": 3, "4": 4, "5": 5, "6": 6, "7": 7, "8": 8, "9": 9, "10": 10, "Jack": 11,
+             "Queen": 12, "King": 13}
+
+
+def reference_round_scores(engine):
+    """
+    Score the round ended by the current player with the original Player.end_round, on copies of the players.
+
+    Parameters:
+    - engine (GameEngine): The game, before the END ROUND move is applied.
+
+    Returns:
+    - dict: The expected score of each player after the round, by name.
+    """
+    reference_players = []
+    # The player who ends the round first, like the players list of the original game
+    for player in engine.turn_order():
+        reference_player = Player(player.name)
+        reference_player.hand = stack_from_mask(player.hand_mask)
+        reference_player.score = player.score
+        reference_player.is_eliminate = player.is_eliminate
+        reference_players.append(reference_player)
+    reference_players[0].end_round(reference_players)
+    return {reference_player.name: reference_player.score for reference_player in reference_players}
+
+
+def reference_play_error(engine, move):
+    """
+    Check the cards played with the rules of the original board (interface_function.click_to_play_cards), without
+    the checks of the engine: one card, cards with the same value, or at least 3 cards of the same suit following
+    each other, all taken from the hand of the player.
+
+    Parameters:
+    - engine (GameEngine): The game, before the move is applied.
+    - move (Move): A move playing cards.
+
+    Returns:
+    - str: Why the play is not allowed, None if it is.
+    """
+    player = engine.current_player()
+    if not move.cards_played:
+        return "no card played"
+    if len(set(move.cards_played)) != len(move.cards_played):
+        return f"the same card is played twice: {move}"
+    if any(not player.hand_mask >> card_id & 1 for card_id in move.cards_played):
+        return f"{player.name} plays cards which are not in its hand: {move}"
+    if move.pick not in (PICK_DECK, PICK_PILE):
+        return f"the card picked must come from the deck or the pile: {move}"
+
+    cards = [id_to_card(card_id) for card_id in move.cards_played]
+    if len(cards) == 1 or all(card.value == cards[0].value for card in cards):
+        return None
+    if not all(card.suit == cards[0].suit for card in cards):
+        return f"the cards have neither the same value nor the same suit: {move}"
+    ranks = [RUN_RANKS.get(card.value) for card in cards]
+    if None in ranks or max(ranks) - min(ranks) != len(ranks) - 1:
+        return f"the cards of the same suit do not follow each other: {move}"
+    if len(cards) < 3:
+        return f"a run needs at least 3 cards: {move}"
+    return None
+
+
+def validate_replay(replay):
+    """
+    Play a recorded game again and check it: every move must be allowed by the rules, every play must follow the
+    rules of the original board (see reference_play_error), every round must be scored like Player.end_round does,
+    the game must end with the last move and the final scores must be the recorded ones.
+
+    Parameters:
+    - replay (Replay): The recorded game.
+
+    Returns:
+    - str: Description of the first error found, None if the game is valid.
+    """
+    players_list = [Player(name) for name in replay.player_names]
+    engine = GameEngine(players_list, replay.elimination_score_threshold, replay.number_to_end_round,
+                        seed=replay.seed)
+
+    for move_index, record in enumerate(replay.moves):
+        if engine.round_over:
+            if engine.is_game_over():
+                return f"move {move_index}: the game is already over"
+            engine.start_round()
+
+        move = move_from_record(record)
+        if not move.end_round and not move.is_pass:
+            error = reference_play_error(engine, move)
+            if error is not None:
+                return f"move {move_index} (round {engine.round_number}): {error}"
+        if move.end_round:
+            expected_scores = reference_round_scores(engine)
+        try:
+            engine.apply_move(move)
+        except (IllegalMoveError, IndexError) as error:
+            return f"move {move_index} (round {engine.round_number}): {error}"
+
+        if move.end_round:
+            scores = {player.name: player.score for player in engine.players_list}
+            if scores != expected_scores:
+                return f"round {engine.round_number}: scores {scores} instead of {expected_scores}"
+
+    if not engine.is_game_over():
+        return "the game is not finished"
+    scores = replay_scores(replay, engine)
+    if scores != replay.scores:
+        return f"final scores {scores} instead of the recorded {replay.scores}"
+    return None
+
+
+def validate_replay_file(path):
+    """
+    Load and validate a replay file, in a worker process.
+
+    Parameters:
+    - path (str): Path of the replay file.
+
+    Returns:
+    - tuple: The path, the number of moves of the game and the error found (None if the game is valid).
+    """
+    try:
+        replay = load_replay(path)
+    except (OSError, msgspec.DecodeError) as error:
+        return path, 0, f"cannot read the replay: {error}"
+    return path, len(replay.moves), validate_replay(replay)
+
+
+def iter_replay_paths(directory, pattern=REPLAY_FILE_PATTERN):
+    """
+    Yield the paths of the replay files of a directory and its subdirectories, without listing them all first.
+
+    Parameters:
+    - directory (str): The directory of the archive.
+    - pattern (str): Pattern of the names of the replay files.
+
+    Yields:
+    - str: Path of a replay file.
+    """
+    for root, directories, file_names in os.walk(directory):
+        directories.sort()
+        for file_name in sorted(file_names):
+            if fnmatch.fnmatch(file_name, pattern):
+                yield os.path.join(root, file_name)
+
+
+def iter_validate(paths, processes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Validate replay files on a pool of processes.
+
+    Parameters:
+    - paths: Iterable of paths of replay files.
+    - processes (int): Number of worker processes, the number of CPUs by default.
+    - chunk_size (int): Number of files sent to a worker at once.
+
+    Yields:
+    - tuple: The result of validate_replay_file for each file, in the order they are finished.
+    """
+    with multiprocessing.Pool(processes) as pool:
+        yield from pool.imap_unordered(validate_replay_file, paths, chunksize=chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that recorded Nine-Game games follow the rules and scoring.")
+    parser.add_argument('directory', help="directory of replay files, see main.py --replay-log and simulate.py "
+                                          "--replay-directory")
+    parser.add_argument('--pattern', default=REPLAY_FILE_PATTERN, help="pattern of the replay file names")
+    parser.add_argument('--processes', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help="files per worker task")
+    arguments = parser.parse_args()
+
+    start = time.perf_counter()
+    number_of_games = number_of_moves = number_of_errors = 0
+    for path, moves, error in iter_validate(iter_replay_paths(arguments.directory, arguments.pattern),
+                                            arguments.processes, arguments.chunk_size):
+        number_of_games += 1
+        number_of_moves += moves
+        if error is not None:
+            number_of_errors += 1
+            print(f"{path}: {error}", flush=True)
+        if number_of_games % PROGRESS_INTERVAL == 0:
+            elapsed = time.perf_counter() - start
+            print(f"{number_of_games} games ({number_of_games / elapsed:.0f} games/s)", flush=True)
+
+    elapsed = time.perf_counter() - start
+    print(f"{number_of_games} games, {number_of_moves} moves, {number_of_errors} invalid, in {elapsed:.2f}s "
+          f"({number_of_games / elapsed:.0f} games/s, {number_of_moves / elapsed:.0f} moves/s)")
+    if number_of_errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,436 @@
+import argparse
+import time
+
+import numpy as np
+
+from card_encoding import FULL_DECK_MASK, JOKER1, JOKER2, NUMBER_OF_CARDS, SUIT_VALUE_TABLE, ids_from_mask
+from game_engine import (ELIMINATION_SCORE_THRESHOLD, MAXIMUM_NUMBER_OF_PASS, NUMBER_OF_CARDS_PER_HAND,
+                         NUMBER_TO_END_ROUND, PICK_DECK, PICK_PILE, IllegalMoveError, Move)
+from legal_plays import legal_plays
+from scoring_kernel import hands_from_masks, score_rounds
+
+
+# Every set of cards which can be played from a hand of at most 5 cards (a hand never has more), in the order of
+# legal_plays: single cards, same value groups, runs
+PLAYS = tuple(play for play in legal_plays(FULL_DECK_MASK) if play.bit_count() <= NUMBER_OF_CARDS_PER_HAND)
+NUMBER_OF_PLAYS = len(PLAYS)
+# Actions: the plays picking from the deck, the same plays picking from the pile, then pass and end the round
+PASS_ACTION = 2 * NUMBER_OF_PLAYS
+END_ROUND_ACTION = PASS_ACTION + 1
+NUMBER_OF_ACTIONS = END_ROUND_ACTION + 1
+
+PLAY_MASKS = np.array(PLAYS, dtype=np.uint64)
+PLAY_SIZES = np.array([play.bit_count() for play in PLAYS], dtype=np.int16)
+# Card ids of each play in increasing order (the last one ends on top of the pile), padded with -1
+PLAY_CARDS = np.array([ids_from_mask(play) + [-1] * (NUMBER_OF_CARDS_PER_HAND - play.bit_count()) for play in PLAYS],
+                      dtype=np.int8)
+# Bit of each card id, and 0 for the padding -1
+CARD_MASKS = np.append(np.uint64(1) << np.arange(NUMBER_OF_CARDS, dtype=np.uint64), np.uint64(0))
+SUIT_VALUES = np.array(SUIT_VALUE_TABLE, dtype=np.int32)
+SUIT_BITS = np.uint64(0x1FFF)
+JOKER_BITS = (np.uint64(JOKER1), np.uint64(JOKER2))
+
+DEFAULT_NUMBER_OF_GAMES = 4096
+DEFAULT_NUMBER_OF_PLAYERS = 4
+DEFAULT_STEPS = 200
+
+
+def action_from_move(move):
+    """
+    Return the action of a Move, for the moves of a GameEngine.
+
+    Parameters:
+    - move (Move): The move, its cards must be at most 5.
+
+    Returns:
+    - int: The action index.
+    """
+    if move.end_round:
+        return END_ROUND_ACTION
+    if move.is_pass:
+        return PASS_ACTION
+    play = PLAYS.index(sum(1 << card_id for card_id in set(move.cards_played)))
+    return play + NUMBER_OF_PLAYS if move.pick == PICK_PILE else play
+
+
+def move_from_action(action):
+    """
+    Return the Move of an action, to play it with a GameEngine.
+
+    Parameters:
+    - action (int): The action index.
+
+    Returns:
+    - Move: The move, the cards played in increasing order of card id as the environment plays them.
+    """
+    action = int(action)
+    if action == END_ROUND_ACTION:
+        return Move(end_round=True)
+    if action == PASS_ACTION:
+        return Move(is_pass=True)
+    pick = PICK_PILE if action >= NUMBER_OF_PLAYS else PICK_DECK
+    return Move(ids_from_mask(PLAYS[action % NUMBER_OF_PLAYS]), pick=pick)
+
+
+def hand_values_of_masks(hand_masks):
+    """
+    Calculate the value of hand bitmasks, like card_encoding.hand_value, with 4 table lookups per hand.
+
+    Parameters:
+    - hand_masks: Array of hand bitmasks (uint64), of any shape.
+
+    Returns:
+    - np.ndarray: Integer array of the same shape.
+    """
+    values = np.zeros(hand_masks.shape, dtype=np.int32)
+    for suit_index in range(4):
+        values += SUIT_VALUES[(hand_masks >> np.uint64(13 * suit_index)) & SUIT_BITS]
+    for joker_bit in JOKER_BITS:
+        values -= ((hand_masks >> joker_bit) & np.uint64(1)).astype(np.int32)
+    return values
+
+
+def random_legal_actions(action_mask, rng):
+    """
+    Choose a random legal action in each game.
+
+    Parameters:
+    - action_mask: Boolean array of shape (games, NUMBER_OF_ACTIONS), see VectorGameEnv.action_mask.
+    - rng (np.random.Generator): The random generator.
+
+    Returns:
+    - np.ndarray: The action of each game.
+    """
+    # Draw one legal action per game in the flat list of the legal actions, rather than a random number per action
+    legal_actions = np.flatnonzero(action_mask)
+    counts = np.count_nonzero(action_mask, axis=1)
+    starts = np.cumsum(counts) - counts
+    chosen = legal_actions[starts + (rng.random(len(action_mask)) * counts).astype(np.intp)]
+    return chosen - np.arange(len(action_mask)) * action_mask.shape[1]
+
+
+class VectorGameEnv:
+    def __init__(self, number_of_games=DEFAULT_NUMBER_OF_GAMES, number_of_players=DEFAULT_NUMBER_OF_PLAYERS,
+                 elimination_score_threshold=ELIMINATION_SCORE_THRESHOLD, number_to_end_round=NUMBER_TO_END_ROUND):
+        """
+        Initialize a VectorGameEnv object: many games played in lockstep, with the API of a Gym vector environment
+        (reset and step), to train policies.
+
+        The games are stored as arrays of the whole batch (hand bitmasks, deck and pile orders, scores, passes...),
+        and a step plays one move in every game with NumPy operations, never with a loop over the games nor
+        Player objects. The rules are the ones of GameEngine, the scores are computed with scoring_kernel (the rules
+        of Player.end_round), but the shuffles use a NumPy generator: a seed does not give the same game as a
+        GameEngine with this seed.
+
+        An action is an index (see move_from_action): a play picking from the deck, the same play picking from the
+        pile, PASS_ACTION or END_ROUND_ACTION. In each game, the action is played by the current seat.
+
+        Parameters:
+        - number_of_games (int): Number of games of the batch.
+        - number_of_players (int): Number of players of each game.
+        - elimination_score_threshold (int): Score from which a player is eliminated (house rule).
+        - number_to_end_round (int): Maximum value of a hand to be allowed to end the round (house rule).
+        """
+        self.number_of_games = number_of_games
+        self.number_of_players = number_of_players
+        self.elimination_score_threshold = elimination_score_threshold
+        self.number_to_end_round = number_to_end_round
+        self.observation_size = 3 * NUMBER_OF_CARDS + 4 * number_of_players + 1
+        self.rng = np.random.default_rng()
+        self.games = np.arange(number_of_games)
+
+        shape = (number_of_games, number_of_players)
+        self.hands = np.zeros(shape, dtype=np.uint64)
+        self.scores = np.zeros(shape, dtype=np.int32)
+        self.passes = np.zeros(shape, dtype=np.int8)
+        self.active = np.ones(shape, dtype=bool)
+        # The deck of a game is deck[:deck_size], its top card at deck_size - 1, the same for the pile
+        self.deck = np.zeros((number_of_games, NUMBER_OF_CARDS), dtype=np.int8)
+        self.deck_size = np.zeros(number_of_games, dtype=np.int16)
+        self.pile = np.zeros((number_of_games, NUMBER_OF_CARDS), dtype=np.int8)
+        self.pile_size = np.zeros(number_of_games, dtype=np.int16)
+        # Bitmask of the cards of the pile, which all the players have seen
+        self.pile_masks = np.zeros(number_of_games, dtype=np.uint64)
+        self.current_seat = np.zeros(number_of_games, dtype=np.intp)
+        # Seat of the round in the rotation of the players, like GameEngine.round_start_seat
+        self.round_start_seat = np.zeros(number_of_games, dtype=np.intp)
+        self.round_number = np.zeros(number_of_games, dtype=np.int32)
+        self.game_over = np.zeros(number_of_games, dtype=bool)
+
+    def reset(self, seeds=None):
+        """
+        Start new games in the whole batch.
+
+        Parameters:
+        - seeds: Seed of the NumPy generator of the batch, an int or a list of ints (for example one per game),
+          random if None. The same seeds give the same games.
+
+        Returns:
+        - tuple: The observations and the info dict, see step.
+        """
+        self.rng = np.random.default_rng(seeds)
+        self._new_games(self.games)
+        return self.observations(), self._info(np.zeros(self.number_of_games, dtype=bool),
+                                              np.ones(self.number_of_games, dtype=bool))
+
+    def step(self, actions):
+        """
+        Play one action in every game. A game over at the previous step starts again instead, its action is ignored.
+
+        Parameters:
+        - actions: Integer array of shape (games,), the action of the current seat of each game.
+
+        Returns:
+        - tuple:
+          - observations: float32 array of shape (games, observation_size), see observations.
+          - rewards: float32 array of shape (games, players), minus the points each seat got in a round ended by
+            this step (the lower the score, the better), 0 for the other games.
+          - terminated: Boolean array of shape (games,), True for the games over after this step.
+          - truncated: Boolean array of shape (games,), always False.
+          - info: dict with 'action_mask', 'current_seat', 'round_over' (a round ended in this step) and 'reset'
+            (the game started again in this step).
+        """
+        actions = np.asarray(actions, dtype=np.intp)
+        rewards = np.zeros((self.number_of_games, self.number_of_players), dtype=np.float32)
+        reset = self.game_over.copy()
+        if reset.any():
+            self._new_games(np.flatnonzero(reset))
+        games = np.flatnonzero(~reset)
+        actions = actions[games]
+
+        illegal = ~self._is_legal(games, actions)
+        if illegal.any():
+            raise IllegalMoveError(f"Illegal actions in the games {games[illegal][:10].tolist()}")
+
+        is_play = actions < PASS_ACTION
+        self._play(games[is_play], actions[is_play])
+        passing_games = games[actions == PASS_ACTION]
+        self.passes[passing_games, self.current_seat[passing_games]] += 1
+        self._advance(np.concatenate([games[is_play], passing_games]))
+
+        round_over = np.zeros(self.number_of_games, dtype=bool)
+        ending_games = games[actions == END_ROUND_ACTION]
+        if ending_games.size:
+            rewards[ending_games] = -self._end_round(ending_games)
+            round_over[ending_games] = True
+        return self.observations(), rewards, self.game_over.copy(), np.zeros_like(reset), \
+            self._info(round_over, reset)
+
+    def action_mask(self):
+        """
+        Return the legal actions of the current seat of each game. All the actions of a game over are allowed,
+        they are ignored by the next step.
+
+        Returns:
+        - np.ndarray: Boolean array of shape (games, NUMBER_OF_ACTIONS).
+        """
+        hands = self.hands[self.games, self.current_seat]
+        mask = np.empty((self.number_of_games, NUMBER_OF_ACTIONS), dtype=bool)
+        # A play is legal if all its cards are in the hand, the deck and the pile always have a card to pick
+        np.equal(PLAY_MASKS & hands[:, None], PLAY_MASKS, out=mask[:, :NUMBER_OF_PLAYS])
+        mask[:, NUMBER_OF_PLAYS:PASS_ACTION] = mask[:, :NUMBER_OF_PLAYS]
+        mask[:, PASS_ACTION] = self.passes[self.games, self.current_seat] < MAXIMUM_NUMBER_OF_PASS
+        mask[:, END_ROUND_ACTION] = hand_values_of_masks(hands) <= self.number_to_end_round
+        mask[self.game_over] = True
+        return mask
+
+    def observations(self):
+        """
+        Return what the current seat of each game knows, in one float32 row per game:
+        - its hand (54 values, 1 for the cards in the hand),
+        - the top card of the pile (54 values, one-hot), which can be picked,
+        - the cards of the pile (54 values),
+        - the number of cards, the score divided by the elimination threshold, the passes and 1 if not eliminated,
+          of each seat (4 blocks of one value per player), starting with the current seat in order of play,
+        - the number of cards of the deck divided by 54.
+
+        Returns:
+        - np.ndarray: float32 array of shape (games, observation_size).
+        """
+        number_of_games, number_of_players = self.number_of_games, self.number_of_players
+        observations = np.zeros((number_of_games, self.observation_size), dtype=np.float32)
+        observations[:, :NUMBER_OF_CARDS] = hands_from_masks(self.hands[self.games, self.current_seat])
+        pile_top = self.pile[self.games, self.pile_size - 1].astype(np.intp)
+        observations[self.games, NUMBER_OF_CARDS + pile_top] = 1
+        observations[:, 2 * NUMBER_OF_CARDS:3 * NUMBER_OF_CARDS] = hands_from_masks(self.pile_masks)
+
+        # The seats in order of play from the current seat
+        seats = (self.current_seat[:, None] + np.arange(number_of_players)) % number_of_players
+        rows = self.games[:, None]
+        start = 3 * NUMBER_OF_CARDS
+        for values in (np.bitwise_count(self.hands[rows, seats]), self.scores[rows, seats] /
+                       self.elimination_score_threshold, self.passes[rows, seats], self.active[rows, seats]):
+            observations[:, start:start + number_of_players] = values
+            start += number_of_players
+        observations[:, start] = self.deck_size / NUMBER_OF_CARDS
+        return observations
+
+    def _info(self, round_over, reset):
+        return {'action_mask': self.action_mask(), 'current_seat': self.current_seat.copy(), 'round_over': round_over,
+                'reset': reset}
+
+    def _is_legal(self, games, actions):
+        """
+        Returns:
+        - np.ndarray: For each game, True if its action is allowed for its current seat.
+        """
+        hands = self.hands[games, self.current_seat[games]]
+        legal = (PLAY_MASKS[actions % NUMBER_OF_PLAYS] & ~hands) == 0
+        legal &= (actions >= 0) & (actions < NUMBER_OF_ACTIONS)
+        is_pass = actions == PASS_ACTION
+        legal[is_pass] = self.passes[games[is_pass], self.current_seat[games[is_pass]]] < MAXIMUM_NUMBER_OF_PASS
+        is_end_round = actions == END_ROUND_ACTION
+        legal[is_end_round] = hand_values_of_masks(hands[is_end_round]) <= self.number_to_end_round
+        return legal
+
+    def _new_games(self, games):
+        """
+        Start new games: scores and passes at 0, every seat in game, the first seat starts the first round.
+        """
+        self.scores[games] = 0
+        self.passes[games] = 0
+        self.active[games] = True
+        self.current_seat[games] = 0
+        self.round_start_seat[games] = 0
+        self.round_number[games] = 0
+        self.game_over[games] = False
+        self._deal(games)
+
+    def _deal(self, games):
+        """
+        Start a new round: shuffle the 54 cards, deal 5 cards to each seat still in game from the current seat,
+        like the engine pops them from its deck, and put the next card on the pile.
+        """
+        number_of_games, number_of_players = len(games), self.number_of_players
+        rows = np.arange(number_of_games)[:, None]
+        decks = self.rng.random((number_of_games, NUMBER_OF_CARDS)).argsort(axis=1).astype(np.int8)
+
+        # Rank of each seat in the deal, counting only the seats in game
+        seats = (self.current_seat[games, None] + np.arange(number_of_players)) % number_of_players
+        active = self.active[games]
+        deal_ranks = np.empty((number_of_games, number_of_players), dtype=np.intp)
+        deal_ranks[rows, seats] = np.cumsum(active[rows, seats], axis=1) - 1
+        positions = NUMBER_OF_CARDS - 1 - NUMBER_OF_CARDS_PER_HAND * np.maximum(deal_ranks, 0)[..., None] \
+            - np.arange(NUMBER_OF_CARDS_PER_HAND)
+        cards = decks[rows[..., None], positions]
+        hands = np.bitwise_or.reduce(CARD_MASKS[cards], axis=2)
+        self.hands[games] = np.where(active, hands, np.uint64(0))
+
+        deck_sizes = NUMBER_OF_CARDS - NUMBER_OF_CARDS_PER_HAND * active.sum(axis=1) - 1
+        pile_tops = decks[rows[:, 0], deck_sizes]
+        self.deck[games] = decks
+        self.deck_size[games] = deck_sizes
+        self.pile[games, 0] = pile_tops
+        self.pile_size[games] = 1
+        self.pile_masks[games] = CARD_MASKS[pile_tops]
+        self.round_number[games] += 1
+
+    def _play(self, games, actions):
+        """
+        Play cards and pick a card from the deck or from the pile (the card under the cards played).
+        """
+        seats = self.current_seat[games]
+        plays = actions % NUMBER_OF_PLAYS
+        from_pile = actions >= NUMBER_OF_PLAYS
+
+        # Pick the top card of the pile or of the deck
+        pile_tops = self.pile[games, self.pile_size[games] - 1]
+        deck_tops = self.deck[games, self.deck_size[games] - 1]
+        picked_cards = np.where(from_pile, pile_tops, deck_tops)
+        self.pile_size[games] -= from_pile
+        self.deck_size[games] -= ~from_pile
+        self.pile_masks[games] &= ~np.where(from_pile, CARD_MASKS[picked_cards], np.uint64(0))
+
+        # Put the cards played on the pile, the last card on top
+        cards = PLAY_CARDS[plays]
+        is_card = cards >= 0
+        positions = self.pile_size[games, None] + np.arange(NUMBER_OF_CARDS_PER_HAND)
+        self.pile[np.broadcast_to(games[:, None], cards.shape)[is_card], positions[is_card]] = cards[is_card]
+        self.pile_size[games] += PLAY_SIZES[plays]
+        self.pile_masks[games] |= PLAY_MASKS[plays]
+        self.hands[games, seats] = (self.hands[games, seats] & ~PLAY_MASKS[plays]) | CARD_MASKS[picked_cards]
+
+        empty_decks = games[self.deck_size[games] == 0]
+        if empty_decks.size:
+            self._recycle_pile(empty_decks)
+
+    def _recycle_pile(self, games):
+        """
+        Move the cards of the pile under its top card to the empty deck and shuffle them, like recycle_pile.
+        """
+        pile_sizes = self.pile_size[games]
+        # Sort random keys, the positions which are not in the pile (and its top card) go to the end
+        keys = self.rng.random((len(games), NUMBER_OF_CARDS))
+        keys[np.arange(NUMBER_OF_CARDS) >= pile_sizes[:, None] - 1] = 2
+        pile_tops = self.pile[games, pile_sizes - 1]
+        self.deck[games] = np.take_along_axis(self.pile[games], keys.argsort(axis=1), axis=1)
+        self.deck_size[games] = pile_sizes - 1
+        self.pile[games, 0] = pile_tops
+        self.pile_size[games] = 1
+        self.pile_masks[games] = CARD_MASKS[pile_tops]
+
+    def _first_active_seats(self, games, first_seats):
+        """
+        Returns:
+        - np.ndarray: The first seat still in game of each game, from the given seat (included).
+        """
+        seats = (first_seats[:, None] + np.arange(self.number_of_players)) % self.number_of_players
+        active_seats = self.active[games[:, None], seats].argmax(axis=1)
+        return seats[np.arange(len(games)), active_seats]
+
+    def _advance(self, games):
+        """
+        Give the turn to the next seat still in game, like TurnScheduler.advance.
+        """
+        self.current_seat[games] = self._first_active_seats(games, (self.current_seat[games] + 1)
+                                                            % self.number_of_players)
+
+    def _end_round(self, games):
+        """
+        Score the rounds ended by the current seat, eliminate the seats over the threshold and deal the next round
+        of the games which are not over.
+
+        Returns:
+        - np.ndarray: The points of each seat in these rounds, shape (games, players).
+        """
+        _, deltas, scores, eliminated = score_rounds(hands_from_masks(self.hands[games]), self.current_seat[games],
+                                                     self.active[games], self.scores[games],
+                                                     self.elimination_score_threshold)
+        self.scores[games] = scores
+        self.active[games] &= ~eliminated
+        self.game_over[games] = self.active[games].sum(axis=1) <= 1
+
+        # The next seat in the rotation starts the next round, whoever ended this one (see GameEngine.start_round)
+        next_round_games = games[~self.game_over[games]]
+        self.round_start_seat[next_round_games] = (self.round_start_seat[next_round_games] + 1) \
+            % self.number_of_players
+        self.current_seat[next_round_games] = self._first_active_seats(next_round_games,
+                                                                       self.round_start_seat[next_round_games])
+        self._deal(next_round_games)
+        return deltas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play random legal actions in a batch of games and measure the "
+                                                 "number of steps per second.")
+    parser.add_argument('--games', type=int, default=DEFAULT_NUMBER_OF_GAMES, help="number of games of the batch")
+    parser.add_argument('--players', type=int, default=DEFAULT_NUMBER_OF_PLAYERS, help="number of players")
+    parser.add_argument('--steps', type=int, default=DEFAULT_STEPS, help="number of steps")
+    parser.add_argument('--seed', type=int, default=None, help="seed of the games")
+    arguments = parser.parse_args()
+
+    env = VectorGameEnv(arguments.games, arguments.players)
+    _, info = env.reset(arguments.seed)
+    rng = np.random.default_rng(arguments.seed)
+    games_finished = 0
+    start = time.perf_counter()
+    for _ in range(arguments.steps):
+        _, _, terminated, _, info = env.step(random_legal_actions(info['action_mask'], rng))
+        games_finished += int(terminated.sum())
+    elapsed = time.perf_counter() - start
+    print(f"{arguments.steps} steps of {arguments.games} games in {elapsed:.2f}s: "
+          f"{arguments.steps * arguments.games / elapsed:.0f} moves/s, {games_finished} games finished")
+
+
+if __name__ == "__main__":
+    main()